@@ -23,9 +23,11 @@
 from .disease import AgentDisease
 from .movement import AgentMovement
 from .neighbors import AgentNeighbors
+from .scheduler import TransitionScheduler
 
 __all__ = [
     "AgentDisease",
     "AgentMovement",
-    "AgentNeighbors"
+    "AgentNeighbors",
+    "TransitionScheduler"
     ]
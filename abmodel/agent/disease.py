@@ -21,21 +21,34 @@
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
 from datetime import timedelta
+from functools import partial
 from typing import Union, Optional
-from copy import deepcopy
 
 from numpy import where, full, isin, concatenate, setdiff1d, array
-from numpy import isnan, nan, transpose, equal
+from numpy import isnan, nan, ndarray, unique, zeros
+from numpy import lexsort, split, flatnonzero, minimum
+from numpy import nan_to_num, count_nonzero, asarray, nextafter, inf
+from numpy import empty as np_empty, int64
+from numpy import maximum, log1p, exp, diff, add, repeat, cumsum, arange
+from numpy import errstate
 from numpy.random import choice, random_sample
+from scipy.spatial import KDTree
 from pandas.core.frame import DataFrame
 from pandas.core.series import Series
-from pandas import concat
+from pandas import concat, Categorical
 from dask.dataframe import from_pandas
 
 from abmodel.utils import ExecutionModes
 from abmodel.utils import check_field_existance
 from abmodel.utils import exception_burner
 from abmodel.utils import std_str_join_cols
+from abmodel.utils import jit
+from abmodel.utils import ProcessPool
+from abmodel.utils import apply_rows
+from abmodel.utils import partitioned_stage
+from abmodel.utils import group_codes
+from abmodel.models import SimpleDistGroups
+from abmodel.models import ComplexDistGroups
 from abmodel.models import DistTitles
 from abmodel.models import NaturalHistory
 from abmodel.models import DiseaseStates
@@ -49,6 +62,185 @@ from abmodel.models import InterestVariables
 from abmodel.models import MRTStopModes
 from abmodel.models import CyclicMRModes
 from abmodel.models import GlobalCyclicMR
+from abmodel.agent.neighbors import neighbor_pairs
+from abmodel.agent.scheduler import TransitionScheduler
+
+
+# =============================================================================
+def attribute_by_group(
+    labels: Union[ndarray, Categorical],
+    groups: ComplexDistGroups,
+    attribute: str
+) -> ndarray:
+    """
+        Retrieve, for each element of `labels`, the value of `attribute`
+        of the group it belongs to.
+
+        Parameters
+        ----------
+        labels : ndarray or Categorical
+            Group label of each element.
+
+        groups : ComplexDistGroups
+            Groups container whose `items` are indexed by the labels.
+
+        attribute : str
+            Name of the group field to retrieve, e.g. `is_dead`.
+
+        Returns
+        -------
+        values : ndarray
+            Array with the value of `attribute` for each element.
+
+        Notes
+        -----
+        The attribute is looked up once for each distinct label.
+    """
+    if len(labels) == 0:
+        return array([])
+
+    unique_labels, inverse = group_codes(labels)
+
+    return array([
+        getattr(groups.items[label], attribute)
+        for label in unique_labels
+        ])[inverse]
+
+
+def sample_traits(
+    labels: Union[ndarray, Categorical],
+    groups: Union[SimpleDistGroups, ComplexDistGroups],
+    dist_title: str
+) -> ndarray:
+    """
+        Draw one per agent trait for each element of `labels` from the
+        distribution `dist_title` of the group it belongs to.
+
+        Parameters
+        ----------
+        labels : ndarray or Categorical
+            Group label of each element.
+
+        groups : SimpleDistGroups or ComplexDistGroups
+            Groups container whose `items` are indexed by the labels.
+
+        dist_title : str
+            Title of the distribution to sample from.
+
+        Returns
+        -------
+        traits : ndarray
+            Array of floats with the samples. It is `nan` for those elements
+            whose group distribution is not a trait or has `dist_type`
+            None.
+
+        See Also
+        --------
+        SimpleDistGroups.sample_by_group : Samples regardless of the trait
+        mode.
+    """
+    traits = full(len(labels), nan)
+
+    if len(labels) == 0:
+        return traits
+
+    unique_labels, inverse = group_codes(labels)
+
+    for position, label in enumerate(unique_labels):
+        distribution = groups.items[label].dist[dist_title]
+
+        if not distribution.trait or distribution.dist_type is None:
+            continue
+
+        mask = inverse == position
+        traits[mask] = distribution.sample(size=int(mask.sum()))
+
+    return traits
+
+
+def fill_traits(
+    traits: ndarray,
+    labels: Union[ndarray, Categorical],
+    groups: Union[SimpleDistGroups, ComplexDistGroups],
+    dist_title: str
+) -> ndarray:
+    """
+        Complete `traits` with fresh samples of `dist_title` for the
+        elements without a trait.
+
+        Parameters
+        ----------
+        traits : ndarray
+            Per agent trait of each element, `nan` if it has none.
+
+        labels : ndarray or Categorical
+            Group label of each element.
+
+        groups : SimpleDistGroups or ComplexDistGroups
+            Groups container whose `items` are indexed by the labels.
+
+        dist_title : str
+            Title of the distribution to sample from.
+
+        Returns
+        -------
+        samples : ndarray
+            Traits, or samples drawn by `groups.sample_by_group` where there
+            is no trait.
+    """
+    samples = asarray(traits, dtype=float).copy()
+    missing = flatnonzero(isnan(samples))
+
+    if missing.size != 0:
+        samples[missing] = groups.sample_by_group(
+            labels[missing], dist_title
+            )
+
+    return samples
+
+
+def refill_traits(
+    df: DataFrame,
+    trait_column: str,
+    group_column: str,
+    groups: Union[SimpleDistGroups, ComplexDistGroups],
+    dist_title: str
+) -> DataFrame:
+    """
+        Draw the trait `trait_column` of those agents of `df` that do not
+        have it yet, e.g. because their key changed.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Population dataframe.
+
+        trait_column : str
+            Column with the per agent traits.
+
+        group_column : str
+            Column with the group label of each agent.
+
+        groups : SimpleDistGroups or ComplexDistGroups
+            Groups container whose `items` are indexed by the labels.
+
+        dist_title : str
+            Title of the distribution to sample from.
+
+        Returns
+        -------
+        df : DataFrame
+            Dataframe with `trait_column` refilled.
+    """
+    traits = df[trait_column].to_numpy(dtype=float, copy=True)
+    missing = flatnonzero(isnan(traits))
+
+    if missing.size != 0:
+        traits[missing] = sample_traits(
+            df[group_column].array[missing], groups, dist_title
+            )
+
+    return df.assign(**{trait_column: traits})
 
 
 # =============================================================================
@@ -128,7 +320,7 @@ def calculate_max_time_iterative(
     disease_state_max_time: Union[float, None],
     disease_groups: DiseaseStates,
     natural_history: NaturalHistory
-) -> Series([float, float]):
+) -> tuple[float, float]:
     """
         TODO: Add brief explanation
 
@@ -154,55 +346,99 @@ def calculate_max_time_iterative(
     """
     if do_calculate_max_time:
         if disease_groups.items[disease_state].is_dead:
-            return Series([nan, nan])
+            return nan, nan
         else:
-            return Series([0,
-                           natural_history.items[key]
-                           .dist[DistTitles.time.value]
-                           .sample()
-                           ])
+            return (0,
+                    natural_history.items[key]
+                    .dist[DistTitles.time.value]
+                    .sample()
+                    )
     else:
-        return Series([disease_state_time, disease_state_max_time])
+        return disease_state_time, disease_state_max_time
 
 
-# TODO: Reimplement this function in order to also return disease_state_time
 def calculate_max_time_vectorized(
     key: Series,  # str
+    disease_state: Series,  # str
     do_calculate_max_time: Series,  # bool
     disease_state_time: Series,  # float or None
     disease_state_max_time: Series,  # float or None
+    disease_groups: DiseaseStates,
     natural_history: NaturalHistory
-) -> Series:  # Series of float
+) -> DataFrame:
     """
-        TODO: Add brief explanation
+        Vectorized version of `calculate_max_time_iterative`.
 
         Parameters
         ----------
-        TODO
+        key : Series
+            Key (vulnerability group and disease state) of each agent.
+
+        disease_state : Series
+            Disease state of each agent.
+
+        do_calculate_max_time : Series
+            Whether the disease state max time of each agent must be
+            calculated.
+
+        disease_state_time : Series
+            Time each agent has been in its disease state.
+
+        disease_state_max_time : Series
+            Time each agent must remain in its disease state.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        natural_history : NaturalHistory
+            Natural history of the disease.
 
         Returns
         -------
-        TODO
+        max_time_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `disease_state_time` and `disease_state_max_time`.
 
         Notes
         -----
-        TODO: include mathematical description and explanatory image
+        Only agents with `do_calculate_max_time` set are updated. Their
+        `disease_state_time` restarts to zero and `disease_state_max_time`
+        is drawn from `time_dist` in bulk for each key. Both are NaN for
+        agents in a dead disease state.
 
         See Also
         --------
-        calculate_max_time_iterative : TODO complete explanation
-
-        Examples
-        --------
-        TODO: include some examples
+        calculate_max_time_iterative : Max time of a single agent.
     """
-    return list(map(
-        lambda single_key, cond, time_value: natural_history
-        .items[single_key]
-        .dist[DistTitles.time.value]
-        .sample() if cond else time_value,
-        zip(key, do_calculate_max_time, disease_state_max_time)
-    ))
+    disease_state_time = disease_state_time.to_numpy(dtype=float, copy=True)
+    disease_state_max_time = disease_state_max_time.to_numpy(
+        dtype=float, copy=True
+        )
+
+    to_calculate = flatnonzero(do_calculate_max_time.to_numpy(dtype=bool))
+
+    is_dead = attribute_by_group(
+        disease_state.to_numpy()[to_calculate], disease_groups, "is_dead"
+        ).astype(bool)
+
+    dead = to_calculate[is_dead]
+    disease_state_time[dead] = nan
+    disease_state_max_time[dead] = nan
+
+    alive = to_calculate[~is_dead]
+    disease_state_time[alive] = 0.0
+    disease_state_max_time[alive] = natural_history.sample_by_group(
+        key.array[alive],
+        DistTitles.time.value
+        )
+
+    return DataFrame(
+        {
+            "disease_state_time": disease_state_time,
+            "disease_state_max_time": disease_state_max_time
+        },
+        index=key.index
+        )
 
 
 # =============================================================================
@@ -214,7 +450,7 @@ def transition_function(
     key: str,
     disease_groups: DiseaseStates,
     natural_history: NaturalHistory
-) -> Series([str, float, bool, bool, bool]):
+) -> tuple[str, float, bool, bool, bool]:
     """
         TODO: Add brief explanation
 
@@ -242,24 +478,10 @@ def transition_function(
 
     if not isnan(disease_state_max_time):
         if disease_state_time >= disease_state_max_time:
-            # Get the transitions info for the current
-            # key (vulnerability_group, current disease_state)
-            transitions = natural_history.items[key].transitions
-
-            # Get disease_states enabled for the probable transition and
-            # their corresponding probabilities
-            disease_states = list(transitions.keys())
-            probabilities = [
-                transitions[transition].probability
-                for transition in disease_states
-                ]
-
             # disease state must change
-            # Verify: becomes into? ... Throw the dice
-            disease_state = choice(
-                disease_states,
-                p=probabilities
-                )
+            # Verify: becomes into? ... Throw the dice using the sampler of
+            # the current key (vulnerability_group, current disease_state)
+            disease_state = natural_history.transition_sampler(key).sample()
 
             # Set True the flag that forces to calculate
             # disease state max time
@@ -272,261 +494,455 @@ def transition_function(
             # Update is_dead value
             is_dead = disease_groups.items[disease_state].is_dead
 
-    return Series([disease_state, disease_state_time, is_dead,
-                   do_calculate_max_time, do_update_immunization_params])
+    return (disease_state, disease_state_time, is_dead,
+            do_calculate_max_time, do_update_immunization_params)
 
 
-# =============================================================================
-def hospitalization_vectorized(
-    is_hospitalized: Series,
-    is_in_ICU: Series,
-    disease_states: Series,
-    is_dead: Series,
-    reduction_factor: Series,
-    dead_disease_group: str,
-    alpha: float,  # Reduction factor of spread prob due to hospitalization
+def transition_vectorized(
+    disease_state: ndarray,
+    is_dead: ndarray,
+    key: Union[ndarray, Categorical],
+    due: ndarray,
     disease_groups: DiseaseStates,
-    health_system: HealthSystem
+    natural_history: NaturalHistory
 ) -> DataFrame:
     """
-        TODO: Add brief explanation
-        # step 1: no is_hospitalized and disease_state has probability
-        # to be hospitalized
+        Vectorized version of `transition_function`.
 
-        # step 2: is_hospitalized ... No matter if disease states
-        # changes or not ... Throw dice to see if agent still
-        # hospitalized
+        Parameters
+        ----------
+        disease_state : ndarray
+            Current disease state of each agent.
 
-        # step 3: if one agent cannot be hospitalized, see if it dies
-        # because of disease
+        is_dead : ndarray
+            Whether each agent is dead.
+
+        key : ndarray or Categorical
+            Key (vulnerability_group, disease_state) of each agent.
+
+        due : ndarray
+            Positions of the agents whose disease state expired, i.e.
+            `disease_state_time >= disease_state_max_time`.
+
+        disease_groups : DiseaseStates
+
+        natural_history : NaturalHistory
+
+        Returns
+        -------
+        df : DataFrame
+            Columns `disease_state`, `is_dead`, `do_calculate_max_time` and
+            `do_update_immunization_params`.
+
+        Notes
+        -----
+        Only the agents in `due` are touched. The new disease state is drawn
+        with a single batch from the transition sampler of each distinct
+        key.
+
+        See Also
+        --------
+        abmodel.agent.scheduler.TransitionScheduler : TODO complete
+        explanation
+    """
+    new_disease_state = array(disease_state, dtype=object)
+    new_is_dead = array(is_dead, dtype=bool)
+    has_changed = zeros(len(new_disease_state), dtype=bool)
+
+    if len(due) > 0:
+        unique_keys, inverse = group_codes(key[due])
+        due_disease_state = new_disease_state[due]
+
+        for position, label in enumerate(unique_keys):
+            # Throw the dice once for every agent sharing the key
+            mask = inverse == position
+            due_disease_state[mask] = natural_history \
+                .transition_sampler(label).sample(int(mask.sum()))
+
+        new_disease_state[due] = due_disease_state
+        new_is_dead[due] = attribute_by_group(
+            due_disease_state,
+            disease_groups,
+            "is_dead"
+            )
+        has_changed[due] = True
+
+    return DataFrame({
+        "disease_state": new_disease_state,
+        "is_dead": new_is_dead,
+        "do_calculate_max_time": has_changed,
+        "do_update_immunization_params": has_changed.copy()
+        })
+
+
+# =============================================================================
+def capacity_triage(
+    is_admitted: ndarray,
+    first_pool: ndarray,
+    second_pool: ndarray,
+    capacity: int
+) -> ndarray:
+    """
+        Choose the agents that die because the health system got
+        overloaded.
 
         Parameters
         ----------
-        TODO
+        is_admitted : ndarray
+            Whether each agent is going to take a place.
+
+        first_pool : ndarray
+            Whether each agent is among the first ones susceptible to die,
+            e.g. those newly admitted.
+
+        second_pool : ndarray
+            Whether each agent is susceptible to die when `first_pool`
+            does not cover the overload.
+
+        capacity : int
+            Number of available places.
 
         Returns
         -------
-        TODO
+        must_die : ndarray
+            Positions of the agents that must die.
 
         Notes
         -----
-        TODO: include mathematical description and explanatory image
+        If both pools together are smaller than the overload, all their
+        agents die.
 
-        Examples
+        See Also
         --------
-        TODO: include some examples
+        capacity_triage_numba : Compiled version.
     """
-    # Get former is_hospitalized info
-    agents_number = len(is_hospitalized)
+    must_die_number = count_nonzero(is_admitted) - capacity
 
-    # Please be aware that if an agent is in ICU, then it must be
-    # hospitalized too
-    former_is_hospitalized = deepcopy(is_hospitalized)
-    former_is_in_ICU = deepcopy(is_in_ICU)
+    if must_die_number <= 0:
+        return array([], dtype=int)
 
-    # ICU state has higher priority
-    # Verify: is going to be in ICU or remains in ICU?
-    # ... Throw the dice ... Do it for all the agents
-    dice = random_sample(agents_number)
+    first_pool = flatnonzero(first_pool)
 
-    ICU_prob = array([
-        disease_groups
-        .items[disease_state]
-        .dist[DistTitles.icu_prob.value]
-        .sample()
-        for disease_state in disease_states
-        ])
-    ICU_prob[equal(ICU_prob, None)] = 0
+    if must_die_number <= first_pool.size:
+        return choice(first_pool, size=must_die_number, replace=False)
 
-    # if dice <= ICU_prob
-    # agent should be in ICU
-    is_in_ICU = where(
-        dice <= ICU_prob,
-        full(agents_number, True),
-        full(agents_number, False)
+    # The surplus of must die number is taken from the second pool
+    second_pool = flatnonzero(second_pool)
+    must_die_surplus = choice(
+        second_pool,
+        size=min(must_die_number - first_pool.size, second_pool.size),
+        replace=False
         )
 
-    new_in_ICU_number = len(
-        where(equal(is_in_ICU, True))[0]
-        )
+    return concatenate([must_die_surplus, first_pool])
 
-    if new_in_ICU_number > health_system.ICU_capacity:
-        # Health system got overloaded in ICU
-        # Some agents are susceptible to die
-        # 1. Those agents that were in ICU before, should remain in ICU
-        # 2. New agents in ICU, must throw the dice to see who dies
-        # or who survives.
-
-        # NOTE: if on the contrary, health system still having
-        # ICU capacity, then this ICU vacancy can be used for
-        # hospitalization if the health system gets overloaded
-        # for hospitalization, in other words, hospitalization
-        # vacancy includes ICU vacancy, but the contrary doesn't hold.
-        # This is simulated enabling that those in ICU are also
-        # hospitalized
 
-        completely_new_in_ICU = where(
-            (equal(is_in_ICU, True)) & (equal(former_is_in_ICU, False))
-            )[0]
+@jit
+def capacity_triage_numba(
+    is_admitted: ndarray,
+    first_pool: ndarray,
+    second_pool: ndarray,
+    capacity: int
+) -> ndarray:
+    """
+        Compiled version of `capacity_triage`.
+
+        Notes
+        -----
+        Agents are chosen with a partial Fisher-Yates shuffle of each
+        pool. If both pools together are smaller than the overload, all
+        their agents die.
+    """
+    must_die_number = 0
+    for i in range(is_admitted.size):
+        if is_admitted[i]:
+            must_die_number += 1
+    must_die_number -= capacity
 
-        must_die_number = new_in_ICU_number \
-            - health_system.ICU_capacity
+    if must_die_number <= 0:
+        return np_empty(0, dtype=int64)
 
-        # Update new_in_ICU_number
-        new_in_ICU_number = health_system.ICU_capacity
+    must_die = np_empty(must_die_number, dtype=int64)
+    chosen = 0
 
-        must_die = choice(
-            completely_new_in_ICU,
-            size=must_die_number,
-            replace=False
-            )
+    for pool_mask in (first_pool, second_pool):
+        pool = flatnonzero(pool_mask)
+        size = min(must_die_number - chosen, pool.size)
+
+        for i in range(size):
+            j = i + int(random_sample() * (pool.size - i))
+            pool[i], pool[j] = pool[j], pool[i]
+            must_die[chosen] = pool[i]
+            chosen += 1
+
+    return must_die[:chosen]
+
+
+def hospitalization_dice(
+    former_is_hospitalized: ndarray,
+    former_is_in_ICU: ndarray,
+    disease_states: ndarray,
+    is_dead: ndarray,
+    dead_disease_group: str,
+    disease_groups: DiseaseStates,
+    health_system: HealthSystem,
+    occupancy: Optional[int] = None,
+    ICU_occupancy: Optional[int] = None,
+    execmode: ExecutionModes = ExecutionModes.vectorized.value
+) -> tuple[ndarray, ndarray]:
+    """
+        Throw the ICU and hospitalization dice and choose the agents that
+        die because the health system got overloaded.
+
+        Parameters
+        ----------
+        former_is_hospitalized : ndarray
+            Whether each agent was hospitalized, including those in ICU.
+
+        former_is_in_ICU : ndarray
+            Whether each agent was in ICU.
+
+        disease_states : ndarray
+            Disease state of each agent. Updated in place for those that
+            die.
+
+        is_dead : ndarray
+            Whether each agent is dead. Updated in place for those that
+            die.
+
+        dead_disease_group : str
+            Disease state of the agents that died.
+
+        disease_groups : DiseaseStates
+            Disease states with their hospitalization and ICU
+            probabilities.
+
+        health_system : HealthSystem
+            Hospital and ICU capacities.
+
+        occupancy : Optional[int]
+            Number of hospitalized agents, including those in ICU. If None,
+            those in `former_is_hospitalized`.
 
-        # Update disease state of those that died
-        disease_states[must_die] = dead_disease_group
+        ICU_occupancy : Optional[int]
+            Number of agents in ICU. If None, those in `former_is_in_ICU`.
 
-        # Update is_dead for those that died
-        is_dead[must_die] = True
+        execmode : ExecutionModes
+            With numba, the triage is done by `capacity_triage_numba`.
 
-        is_in_ICU_False = where(equal(is_in_ICU, False))[0]
-        is_in_ICU_True = where(equal(is_in_ICU, True))[0]
+        Returns
+        -------
+        is_hospitalized : ndarray
+            Whether each agent is hospitalized, including those in ICU.
+
+        is_in_ICU : ndarray
+            Whether each agent is in ICU.
+
+        Notes
+        -----
+        Places left for the agents newly admitted to ICU are the ICU
+        capacity minus the patients that remain in ICU. Places left for
+        those newly admitted to the hospital but not to ICU are the
+        hospital capacity minus the patients that remain hospitalized and
+        minus those admitted to ICU. Occupancies let the agents outside the
+        given arrays keep their places.
+
+        See Also
+        --------
+        capacity_triage : Choice of the agents that die because of the
+        overload.
+    """
+    agents_number = former_is_hospitalized.size
+
+    if occupancy is None:
+        occupancy = count_nonzero(former_is_hospitalized)
+
+    if ICU_occupancy is None:
+        ICU_occupancy = count_nonzero(former_is_in_ICU)
+
+    if execmode == ExecutionModes.numba.value:
+        triage = capacity_triage_numba
+    else:
+        triage = capacity_triage
+
+    # ICU state has higher priority
+    # Verify: is going to be in ICU or remains in ICU?
+    # ... Throw the dice ... Do it for all the agents
+    dice = random_sample(agents_number)
+
+    # Probabilities are sampled once per disease state
+    # None distributions mean zero probability
+    ICU_prob = nan_to_num(disease_groups.sample_by_group(
+        disease_states,
+        DistTitles.icu_prob.value
+        ))
 
-        new_is_in_ICU_False = concatenate([is_in_ICU_False, must_die])
-        mask = isin(is_in_ICU_True, must_die, invert=True)
-        new_is_in_ICU_True = is_in_ICU_True[mask]
+    # if dice <= ICU_prob
+    # agent should be in ICU
+    is_in_ICU = dice <= ICU_prob
+
+    # Health system could get overloaded in ICU, then some agents are
+    # susceptible to die
+    # 1. Those agents that were in ICU before, should remain in ICU
+    # 2. New agents in ICU, must throw the dice to see who dies
+    # or who survives.
+
+    # NOTE: if on the contrary, health system still having
+    # ICU capacity, then this ICU vacancy can be used for
+    # hospitalization if the health system gets overloaded
+    # for hospitalization, in other words, hospitalization
+    # vacancy includes ICU vacancy, but the contrary doesn't hold.
+    # This is simulated enabling that those in ICU are also
+    # hospitalized
+    ICU_admissions = is_in_ICU & ~former_is_in_ICU
+    ICU_stays = ICU_occupancy \
+        - count_nonzero(former_is_in_ICU & ~is_in_ICU)
+
+    must_die = triage(
+        ICU_admissions,
+        ICU_admissions,
+        zeros(agents_number, dtype=bool),
+        health_system.ICU_capacity - ICU_stays
+        )
 
-        # Update values
-        is_in_ICU[new_is_in_ICU_False] = False
-        is_in_ICU[new_is_in_ICU_True] = True
+    # Update disease state and is_dead of those that died
+    disease_states[must_die] = dead_disease_group
+    is_dead[must_die] = True
+    is_in_ICU[must_die] = False
 
     # Next step is to change hospitalization state
     # Verify: is going to be hospitalized or remains hospitalized?
     # ... Throw the dice ... Do it for all the agents
     dice = random_sample(agents_number)
 
-    hospitalization_prob = array([
-        disease_groups
-        .items[disease_state]
-        .dist[DistTitles.hospitalization.value]
-        .sample()
-        for disease_state in disease_states
-        ])
-    hospitalization_prob[equal(hospitalization_prob, None)] = 0
+    hospitalization_prob = nan_to_num(disease_groups.sample_by_group(
+        disease_states,
+        DistTitles.hospitalization.value
+        ))
 
     # if dice <= hospitalization_prob
     # agent should be hospitalized
-    is_hospitalized = where(
-        dice <= hospitalization_prob,
-        full(agents_number, True),
-        full(agents_number, False)
-        )
-
-    # Merge this new is_hospitalized with those
-    # new hospitalized due to ICU
     # Remember that those in ICU are also hospitalized
-    is_hospitalized = where(
-        (equal(is_hospitalized, False)) & (equal(is_in_ICU, True)),
-        full(agents_number, True),
-        is_hospitalized
-        )
-
-    new_hospitalized_number = len(
-        where(equal(is_hospitalized, True))[0]
+    is_hospitalized = (dice <= hospitalization_prob) | is_in_ICU
+
+    # Health system could get overloaded in hospital vacancy, then some
+    # agents are susceptible to die
+    # 1. ICU has higher priority. Those agents that are in ICU,
+    # should remain in ICU
+    # 2. New hospitalized agents, that are not in ICU, must throw
+    # the dice to see who dies or who survives.
+    # 3. If they are not enough, some former hospitalized not in ICU die
+    admissions = is_hospitalized & ~former_is_hospitalized
+    first_pool = admissions & ~is_in_ICU
+    stays = occupancy \
+        - count_nonzero(former_is_hospitalized & ~is_hospitalized) \
+        + count_nonzero(admissions & is_in_ICU)
+
+    must_die = triage(
+        first_pool,
+        first_pool,
+        is_hospitalized & ~is_in_ICU & former_is_hospitalized,
+        health_system.hospital_capacity - stays
         )
 
-    if new_hospitalized_number > health_system.hospital_capacity:
-        # Health system got overloaded in hospital vacancy
-        # Some agents are susceptible to die
-        # 1. ICU has higher priority. Those agents that are in ICU,
-        # should remain in ICU
-        # 2. New hospitalized agents, that are not in ICU, must throw
-        # the dice to see who dies or who survives.
-        completely_new_hospitalized_not_in_ICU = where(
-            (equal(is_hospitalized, True)) & (equal(is_in_ICU, False))
-            & (equal(former_is_hospitalized, False))
-            )[0]
-
-        susceptible_to_die_number = len(
-            completely_new_hospitalized_not_in_ICU
-            )
+    # Update disease state and is_dead of those that died
+    disease_states[must_die] = dead_disease_group
+    is_dead[must_die] = True
+    is_hospitalized[must_die] = False
 
-        must_die_number = new_hospitalized_number \
-            - health_system.hospital_capacity
+    return is_hospitalized, is_in_ICU
 
-        if must_die_number < susceptible_to_die_number:
-            must_die = choice(
-                completely_new_hospitalized_not_in_ICU,
-                size=must_die_number,
-                replace=False
-                )
-        elif susceptible_to_die_number == must_die_number:
-            must_die = completely_new_hospitalized_not_in_ICU
-        else:
-            # must_die_number > susceptible_to_die_number
-            # The surplus of must die number forces us to include the
-            # possibility that some former hospitalized not in UCI have
-            # died
-            must_die_number_surplus = must_die_number \
-                - susceptible_to_die_number
-
-            remain_hospitalized_but_not_in_ICU = where(
-                (equal(is_hospitalized, True)) & (equal(is_in_ICU, False))
-                & (equal(former_is_hospitalized, True))
-                )[0]
-
-            must_die_surplus = choice(
-                remain_hospitalized_but_not_in_ICU,
-                size=must_die_number_surplus,
-                replace=False
-                )
 
-            must_die = concatenate([
-                must_die_surplus,
-                completely_new_hospitalized_not_in_ICU
-            ])
+def hospitalization_vectorized(
+    is_hospitalized: Series,
+    is_in_ICU: Series,
+    disease_states: Series,
+    is_dead: Series,
+    reduction_factor: Series,
+    dead_disease_group: str,
+    alpha: float,  # Reduction factor of spread prob due to hospitalization
+    disease_groups: DiseaseStates,
+    health_system: HealthSystem,
+    execmode: ExecutionModes = ExecutionModes.vectorized.value
+) -> DataFrame:
+    """
+        TODO: Add brief explanation
+        # step 1: no is_hospitalized and disease_state has probability
+        # to be hospitalized
 
-        # Update disease state of those that died
-        disease_states[must_die] = dead_disease_group
+        # step 2: is_hospitalized ... No matter if disease states
+        # changes or not ... Throw dice to see if agent still
+        # hospitalized
 
-        # Update is_dead for those that died
-        is_dead[must_die] = True
+        # step 3: if one agent cannot be hospitalized, see if it dies
+        # because of disease
 
-        is_hospitalized_False = where(equal(is_hospitalized, False))[0]
-        is_hospitalized_True = where(equal(is_hospitalized, True))[0]
+        Parameters
+        ----------
+        TODO
 
-        new_is_hospitalized_False = concatenate([
-            is_hospitalized_False, must_die
-            ])
-        mask = isin(is_hospitalized_True, must_die, invert=True)
-        new_is_hospitalized_True = is_hospitalized_True[mask]
+        Returns
+        -------
+        hospitalization_df : DataFrame
+            Dataframe with the same index as the inputs and typed columns
+            0: `is_hospitalized`, 1: `is_in_ICU`, 2: `disease_state`,
+            3: `is_dead` and 4: `reduction_factor`.
 
-        # Update values
-        is_hospitalized[new_is_hospitalized_False] = False
-        is_hospitalized[new_is_hospitalized_True] = True
+        Notes
+        -----
+        `ICU_prob` and `hospitalization_prob` are sampled once per disease
+        state for all its agents (see `DiseaseStates.sample_by_group`).
+        Inputs are not modified. Dice and triage are thrown by
+        `hospitalization_dice`.
 
-    # Determine indexes for changing reduction factor
-    new_hospitalized_indexes = where(
-        (equal(is_hospitalized, True)) & (equal(former_is_hospitalized, False))
-        )[0]
+        Examples
+        --------
+        TODO: include some examples
+    """
+    index = is_hospitalized.index
 
-    recovered_from_hospitalization_indexes = where(
-        (equal(is_hospitalized, False)) & (equal(former_is_hospitalized, True))
-        )[0]
+    # Get former is_hospitalized info
+    # Please be aware that if an agent is in ICU, then it must be
+    # hospitalized too
+    former_is_hospitalized = is_hospitalized.to_numpy(dtype=bool)
+    former_is_in_ICU = is_in_ICU.to_numpy(dtype=bool)
+
+    disease_states = disease_states.to_numpy(dtype=object, copy=True)
+    is_dead = is_dead.to_numpy(dtype=bool, copy=True)
+    reduction_factor = reduction_factor.to_numpy(dtype=float, copy=True)
+
+    is_hospitalized, is_in_ICU = hospitalization_dice(
+        former_is_hospitalized,
+        former_is_in_ICU,
+        disease_states,
+        is_dead,
+        dead_disease_group,
+        disease_groups,
+        health_system,
+        execmode=execmode
+        )
 
     # Calculate reduction factor
-    reduction_factor_copy = reduction_factor.copy()
-
-    reduction_factor_copy[new_hospitalized_indexes] = \
-        reduction_factor[new_hospitalized_indexes]*alpha
-
-    reduction_factor_copy[recovered_from_hospitalization_indexes] = \
-        reduction_factor[recovered_from_hospitalization_indexes]/alpha
-
-    # Wrap data together
-    data = array([is_hospitalized, is_in_ICU, disease_states, is_dead,
-                 reduction_factor_copy])
-    data_transposed = transpose(data)
-
-    return DataFrame(data_transposed)
+    new_hospitalized = is_hospitalized & ~former_is_hospitalized
+    recovered_from_hospitalization = ~is_hospitalized & former_is_hospitalized
+
+    reduction_factor[new_hospitalized] = \
+        reduction_factor[new_hospitalized]*alpha
+
+    reduction_factor[recovered_from_hospitalization] = \
+        reduction_factor[recovered_from_hospitalization]/alpha
+
+    # Wrap typed columns together
+    return DataFrame(
+        {
+            0: is_hospitalized,
+            1: is_in_ICU,
+            2: disease_states,
+            3: is_dead,
+            4: reduction_factor
+        },
+        index=index
+        )
 
 
 # =============================================================================
@@ -588,6 +1004,74 @@ def diagnosis_function(
     return is_diagnosed
 
 
+def diagnosis_vectorized(
+    disease_state: Series,
+    is_dead: Series,
+    is_diagnosed: Series,
+    disease_groups: DiseaseStates
+) -> ndarray:
+    """
+        Vectorized version of `diagnosis_function`.
+
+        Parameters
+        ----------
+        disease_state : Series
+            Disease state of each agent.
+
+        is_dead : Series
+            Whether each agent is dead.
+
+        is_diagnosed : Series
+            Whether each agent was already diagnosed.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        Returns
+        -------
+        is_diagnosed : ndarray
+            Updated diagnosis status of each agent.
+
+        Notes
+        -----
+        Only the agents that are alive, infected and not diagnosed yet can
+        be diagnosed. The diagnosis probabilities are drawn with one
+        `sample(size=n)` call for each disease state, and one dice is thrown
+        for each eligible agent. Dead agents and not infected agents that
+        were not diagnosed are set to not diagnosed.
+
+        See Also
+        --------
+        diagnosis_function : Diagnosis rule for a single agent.
+    """
+    disease_state = disease_state.to_numpy()
+    is_dead = is_dead.to_numpy(dtype=bool)
+    is_diagnosed = is_diagnosed.to_numpy(dtype=bool, copy=True)
+
+    is_infected = attribute_by_group(
+        disease_state, disease_groups, "is_infected"
+        ).astype(bool)
+
+    # Agents that can be diagnosed
+    eligible = flatnonzero(~is_dead & ~is_diagnosed & is_infected)
+
+    if eligible.size != 0:
+        # Verify: is going to be diagnosed? ... Throw the dice
+        dice = random_sample(eligible.size)
+
+        be_diagnosed_prob = disease_groups.sample_by_group(
+            disease_state[eligible],
+            DistTitles.diagnosis.value
+            )
+
+        is_diagnosed[eligible] = dice <= be_diagnosed_prob
+
+    # Dead agents are not diagnosed
+    is_diagnosed[is_dead] = False
+
+    return is_diagnosed
+
+
 # =============================================================================
 def isolation_function(
     disease_state: str,
@@ -638,7 +1122,7 @@ def isolation_handler(
     beta: float,  # Reduction factor of spread prob due to being isolated
     disease_groups: DiseaseStates,
     isolation_adherence_groups: Optional[IsolationAdherenceGroups] = None
-) -> Series([bool, bool, float, float, bool, float]):
+) -> tuple[bool, bool, float, float, bool, float]:
     """
         TODO: Add brief explanation
 
@@ -721,9 +1205,146 @@ def isolation_handler(
                     # do nothing
                     adheres_to_isolation = False
 
-    return Series([is_diagnosed, is_isolated, isolation_time,
-                   isolation_max_time, adheres_to_isolation,
-                   reduction_factor])
+    return (is_diagnosed, is_isolated, isolation_time,
+            isolation_max_time, adheres_to_isolation,
+            reduction_factor)
+
+
+def isolation_vectorized(
+    disease_state: Series,
+    isolation_adherence_group: Series,
+    is_diagnosed: Series,
+    is_isolated: Series,
+    isolation_time: Series,
+    isolation_max_time: Series,
+    adheres_to_isolation: Series,
+    reduction_factor: Series,
+    beta: float,  # Reduction factor of spread prob due to being isolated
+    disease_groups: DiseaseStates,
+    isolation_adherence_groups: Optional[IsolationAdherenceGroups] = None
+) -> DataFrame:
+    """
+        Vectorized version of `isolation_handler`.
+
+        Parameters
+        ----------
+        disease_state : Series
+            Disease state of each agent.
+
+        isolation_adherence_group : Series
+            Isolation adherence group of each agent.
+
+        is_diagnosed : Series
+            Whether each agent is diagnosed.
+
+        is_isolated : Series
+            Whether each agent is isolated.
+
+        isolation_time : Series
+            Time elapsed since each agent got isolated, in scale of days.
+
+        isolation_max_time : Series
+            Time each agent must remain isolated, in scale of days.
+
+        adheres_to_isolation : Series
+            Whether each agent adheres to isolation.
+
+        reduction_factor : Series
+            Reduction factor of spread probability of each agent.
+
+        beta : float
+            Reduction factor of spread probability due to being isolated.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        isolation_adherence_groups : IsolationAdherenceGroups, optional
+            Isolation adherence groups. If None, every agent adheres to
+            isolation.
+
+        Returns
+        -------
+        isolation_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `is_diagnosed`, `is_isolated`, `isolation_time`,
+            `isolation_max_time`, `adheres_to_isolation` and
+            `reduction_factor`.
+
+        Notes
+        -----
+        The branches of `isolation_handler` are expressed as boolean masks:
+        isolated agents whose isolation time is over leave the isolation,
+        and diagnosed agents that are not isolated throw the adherence dice
+        (all at once). Isolation days are sampled in bulk for each disease
+        state of those that start an isolation.
+
+        See Also
+        --------
+        isolation_handler : Isolation rule for a single agent.
+    """
+    index = disease_state.index
+    disease_state = disease_state.to_numpy()
+    is_diagnosed = is_diagnosed.to_numpy(dtype=bool, copy=True)
+    is_isolated = is_isolated.to_numpy(dtype=bool, copy=True)
+    isolation_time = isolation_time.to_numpy(dtype=float, copy=True)
+    isolation_max_time = isolation_max_time.to_numpy(dtype=float, copy=True)
+    adheres_to_isolation = adheres_to_isolation.to_numpy(
+        dtype=bool, copy=True
+        )
+    reduction_factor = reduction_factor.to_numpy(dtype=float, copy=True)
+
+    # Isolation must end
+    isolation_ends = flatnonzero(
+        is_diagnosed & is_isolated & (isolation_time >= isolation_max_time)
+        )
+    isolation_time[isolation_ends] = nan
+    isolation_max_time[isolation_ends] = nan
+    is_isolated[isolation_ends] = False
+    is_diagnosed[isolation_ends] = False
+    reduction_factor[isolation_ends] = reduction_factor[isolation_ends]/beta
+
+    # Diagnosed agents that are not isolated
+    not_isolated = flatnonzero(is_diagnosed & ~is_isolated)
+
+    if isolation_adherence_groups is None:
+        # Agents always adhere to isolation
+        adherents = not_isolated
+    else:
+        # Do agents adhere to be isolated? ... Throw the dice
+        dice = random_sample(not_isolated.size)
+
+        adherence_prob = isolation_adherence_groups.sample_by_group(
+            isolation_adherence_group.to_numpy()[not_isolated],
+            DistTitles.adherence.value
+            )
+
+        adheres = dice <= adherence_prob
+        adheres_to_isolation[not_isolated] = adheres
+        adherents = not_isolated[adheres]
+
+    adheres_to_isolation[adherents] = True
+    reduction_factor[adherents] = reduction_factor[adherents]*beta
+    is_isolated[adherents] = True
+    isolation_time[adherents] = 0.0
+
+    # How much time are they going to be isolated? ... Throw the dice
+    # isolation_max_time is in the scale of days
+    isolation_max_time[adherents] = disease_groups.sample_by_group(
+        disease_state[adherents],
+        DistTitles.isolation_days.value
+        )
+
+    return DataFrame(
+        {
+            "is_diagnosed": is_diagnosed,
+            "is_isolated": is_isolated,
+            "isolation_time": isolation_time,
+            "isolation_max_time": isolation_max_time,
+            "adheres_to_isolation": adheres_to_isolation,
+            "reduction_factor": reduction_factor
+        },
+        index=index
+        )
 
 
 def mr_handler(
@@ -734,7 +1355,7 @@ def mr_handler(
     beta: float,  # Reduction factor of spread prob due to being isolated
     mrc_target_groups: list,
     mr_adherence_groups: Optional[IsolationAdherenceGroups] = None
-) -> Series([bool, bool, float]):
+) -> tuple[bool, bool, float]:
     """
         TODO: Add brief explanation
 
@@ -791,10 +1412,184 @@ def mr_handler(
                 # Agent doesn't adhere to isolation
                 adheres_to_mr_isolation = False
 
-    return Series([isolated_by_mr, adheres_to_mr_isolation, reduction_factor])
+    return isolated_by_mr, adheres_to_mr_isolation, reduction_factor
+
+
+def mr_vectorized(
+    mr_group: Series,
+    mr_adherence_group: Series,
+    is_diagnosed: Series,
+    reduction_factor: Series,
+    beta: float,  # Reduction factor of spread prob due to being isolated
+    mrc_target_groups: list,
+    mr_adherence_groups: Optional[MRAdherenceGroups] = None
+) -> DataFrame:
+    """
+        Vectorized version of `mr_handler`.
+
+        Parameters
+        ----------
+        mr_group : Series
+            Mobility restrictions group of each agent.
+
+        mr_adherence_group : Series
+            Mobility restrictions adherence group of each agent.
+
+        is_diagnosed : Series
+            Whether each agent is diagnosed.
+
+        reduction_factor : Series
+            Reduction factor of spread probability of each agent.
+
+        beta : float
+            Reduction factor of spread probability due to being isolated.
+
+        mrc_target_groups : list
+            Mobility restrictions groups that must be isolated.
+
+        mr_adherence_groups : MRAdherenceGroups, optional
+            Mobility restrictions adherence groups. If None, every agent
+            adheres to the isolation.
+
+        Returns
+        -------
+        mr_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `isolated_by_mr`, `adheres_to_mr_isolation` and
+            `reduction_factor`.
+
+        Notes
+        -----
+        The membership test against `mrc_target_groups` is done once per
+        distinct `mr_group` and then broadcast to the agents through the
+        codes returned by `numpy.unique`. The adherence dice are thrown all
+        at once and adherence probabilities are sampled in bulk for each
+        adherence group.
+
+        See Also
+        --------
+        mr_handler : Mobility restrictions rule for a single agent.
+    """
+    index = mr_group.index
+    reduction_factor = reduction_factor.to_numpy(dtype=float, copy=True)
+    adheres_to_mr_isolation = zeros(reduction_factor.size, dtype=bool)
+
+    if reduction_factor.size == 0:
+        isolated_by_mr = zeros(0, dtype=bool)
+    else:
+        groups, codes = unique(mr_group.to_numpy(), return_inverse=True)
+        isolated_by_mr = isin(groups, list(mrc_target_groups))[codes]
+
+    isolated = flatnonzero(isolated_by_mr)
+
+    if mr_adherence_groups is None:
+        # Agents always adhere to isolation
+        adheres_to_mr_isolation[isolated] = True
+        reduction_factor[isolated] = reduction_factor[isolated]*beta
+    else:
+        # Do agents adhere to be isolated? ... Throw the dice
+        dice = random_sample(isolated.size)
+
+        adherence_prob = mr_adherence_groups.sample_by_group(
+            mr_adherence_group.to_numpy()[isolated],
+            DistTitles.mr_adherence.value
+            )
+
+        adherents = isolated[dice <= adherence_prob]
+        adheres_to_mr_isolation[adherents] = True
+
+        # Only diagnosed agents reduce their spread probability
+        diagnosed = adherents[
+            is_diagnosed.to_numpy(dtype=bool)[adherents]
+            ]
+        reduction_factor[diagnosed] = reduction_factor[diagnosed]*beta
+
+    return DataFrame(
+        {
+            "isolated_by_mr": isolated_by_mr,
+            "adheres_to_mr_isolation": adheres_to_mr_isolation,
+            "reduction_factor": reduction_factor
+        },
+        index=index
+        )
 
 
 # =============================================================================
+def contagion_candidates(
+    df: DataFrame,
+    natural_history: NaturalHistory,
+    disease_groups: DiseaseStates,
+    kdtree_by_disease_state: dict,
+    agents_labels_by_disease_state: dict
+) -> ndarray:
+    """
+        Find the agents that can get infected in the current step.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Population dataframe. It must contain `agent`, `x`, `y` and
+            `key` columns.
+
+        natural_history : NaturalHistory
+            Natural history of the disease.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        kdtree_by_disease_state : dict
+            KDTree of the agents of each disease state.
+
+        agents_labels_by_disease_state : dict
+            Agents labels of each disease state, in the same order used for
+            building the corresponding KDTree.
+
+        Returns
+        -------
+        candidates : ndarray
+            Sorted positions in `df` of the agents whose key allows a
+            transition by contagion and that have at least one spreader
+            other than themselves inside the corresponding `spread_radius`.
+
+        Notes
+        -----
+        The contact check only asks each spreader KDTree for the two
+        nearest neighbors of every agent, which is enough to tell whether
+        there is a spreader different from the agent itself.
+    """
+    candidates = flatnonzero(attribute_by_group(
+        df["key"].array, natural_history, "transition_by_contagion"
+        ).astype(bool))
+
+    if candidates.size == 0:
+        return candidates
+
+    locations = df[["x", "y"]].to_numpy()[candidates]
+    agents = df["agent"].to_numpy()[candidates]
+    has_contact = zeros(candidates.size, dtype=bool)
+
+    for spreader_state, disease_group in disease_groups.items.items():
+        kdtree = kdtree_by_disease_state.get(spreader_state)
+        if not disease_group.can_spread or not kdtree:
+            continue
+
+        # query discards neighbors exactly at distance_upper_bound while
+        # query_ball_point keeps them
+        distances, neighbors = kdtree.query(
+            locations,
+            k=2,
+            distance_upper_bound=nextafter(disease_group.spread_radius, inf)
+            )
+
+        found = neighbors < kdtree.n
+        labels = agents_labels_by_disease_state[spreader_state][
+            where(found, neighbors, 0)
+            ]
+        has_contact |= (found & (labels != agents[:, None])).any(axis=1)
+
+    return candidates[has_contact]
+
+
 def contagion_function(
     agent: int,
     x: float,
@@ -806,13 +1601,13 @@ def contagion_function(
     times_infected: int,
     disease_state_time: float,
     reduction_factor: float,
+    susceptibility_trait: float,
     natural_history: NaturalHistory,
     disease_groups: DiseaseStates,
     susceptibility_groups: SusceptibilityGroups,
     kdtree_by_disease_state: dict,
-    agents_labels_by_disease_state: dict,
-    df_copy: DataFrame
-) -> Series([str, int, list, float, bool, bool]):
+    agents_labels_by_disease_state: dict
+) -> tuple[str, int, list, float, bool, bool]:
     """
         TODO
         # Set None the disease_state_time
@@ -850,18 +1645,6 @@ def contagion_function(
         natural_history.items[key].transition_by_contagion
 
     if transition_by_contagion:
-        # Get the transitions info for the current
-        # key (vulnerability_group, current disease_state)
-        transitions = natural_history.items[key].transitions
-
-        # Get disease_states enabled for the probable transition
-        # after contagion and and their corresponding probabilities
-        disease_states = list(transitions.keys())
-        probabilities = [
-            transitions[transition].probability
-            for transition in disease_states
-            ]
-
         # Agent location
         agent_location = [x, y]
 
@@ -879,77 +1662,421 @@ def contagion_function(
                     disease_groups.items[spreader_state] \
                     .spread_radius
 
-                # Detect if the agents of "disease_state" that are
-                # inside a distance equal to the tracing_radius
-                # points_inside_radius_array is a ndarray with a
-                # list of indeces which correspond neighbors of
-                # agent
-                points_inside_radius_array = \
-                    kdtree_by_disease_state[spreader_state] \
-                    .query_ball_point(
-                        agent_location,
-                        spread_radius
-                        )
+                # Detect if the agents of "disease_state" that are
+                # inside a distance equal to the tracing_radius
+                # points_inside_radius_array is a ndarray with a
+                # list of indeces which correspond neighbors of
+                # agent
+                points_inside_radius_array = \
+                    kdtree_by_disease_state[spreader_state] \
+                    .query_ball_point(
+                        agent_location,
+                        spread_radius
+                        )
+
+                # Now we have to get the corresponding spreader
+                # labels excluding the agent's own label
+                spreader_labels_inside_radius = list(setdiff1d(
+                        agents_labels_by_disease_state[
+                            spreader_state][
+                            points_inside_radius_array],
+                        agent
+                        )
+                    )
+
+                # Calculate joint probability for contagion
+                spread_probability = disease_groups.items[spreader_state] \
+                    .spread_probability
+
+                # Susceptibility is sampled again unless it is a trait of
+                # the agent
+                if isnan(susceptibility_trait):
+                    susceptibility = susceptibility_groups \
+                        .items[susceptibility_group] \
+                        .dist[DistTitles.susceptibility.value].sample()
+                else:
+                    susceptibility = susceptibility_trait
+
+                joint_probability = \
+                    (1.0 - immunization_level) \
+                    * susceptibility \
+                    * spread_probability * reduction_factor
+
+                # Check if got infected
+                for spreader in spreader_labels_inside_radius:
+                    # Throw the dice
+                    dice = random_sample()
+
+                    if dice <= joint_probability:
+                        # Got infected !!!
+                        # Save who infected the agent
+                        infected_by.append(spreader)
+
+        if len(infected_by) != 0:
+            # Update times_infected
+            times_infected += 1
+
+            # Verify: becomes into? ... Throw the dice using the sampler of
+            # the current key (vulnerability_group, current disease_state)
+            disease_state = natural_history.transition_sampler(key).sample()
+
+            # Set the time elapsed since it got infected
+            # in zero
+            disease_state_time = 0
+
+            # Set True the flag that forces to calculate
+            # disease state max time
+            do_calculate_max_time = True
+
+            # Set True the flag that forces to update
+            # immunization params
+            do_update_immunization_params = True
+    else:
+        # transition_by_contagion == False
+        # It is supposed that this is the case for those with is_dead == True
+        pass
+
+    return (disease_state, times_infected, infected_by,
+            disease_state_time, do_calculate_max_time,
+            do_update_immunization_params)
+
+
+def multi_exposure_infection(
+    susceptibles: ndarray,
+    probabilities: ndarray
+) -> ndarray:
+    """
+        Decide which (susceptible, spreader) contacts are successful
+        throwing a single dice for each susceptible agent.
+
+        Parameters
+        ----------
+        susceptibles : ndarray
+            Position of the susceptible agent of each contact, sorted so the
+            contacts of the same agent are consecutive.
+
+        probabilities : ndarray
+            Contagion probability of each contact.
+
+        Returns
+        -------
+        success : ndarray
+            Boolean array with the successful contacts. It has the same
+            distribution as throwing one dice for each contact.
+
+        Notes
+        -----
+        An agent with contact probabilities p_1, ..., p_n gets infected with
+        probability
+
+        P = 1 - (1 - p_1) * ... * (1 - p_n)
+
+        so one dice u per agent is enough. If u < P, the first successful
+        contact is the first j such that 1 - (1 - p_1) * ... * (1 - p_j)
+        > u, which follows the distribution of the first success given
+        that there is at least one. The contacts after it are independent,
+        so a dice is thrown only for them. Random draws are then
+        proportional to the number of susceptible agents plus the contacts
+        of the infected ones, instead of the number of contacts.
+    """
+    success = zeros(susceptibles.size, dtype=bool)
+
+    if susceptibles.size == 0:
+        return success
+
+    # A floor for log(1 - p) avoids -inf (p = 1) in the cumulative sums
+    with errstate(divide="ignore"):
+        log_survival = maximum(log1p(-minimum(probabilities, 1.0)), -1e6)
+
+    agents_starts = flatnonzero(concatenate((
+        [True], susceptibles[1:] != susceptibles[:-1]
+        )))
+    counts = diff(concatenate((agents_starts, [susceptibles.size])))
+
+    # One dice per susceptible agent
+    dice = random_sample(agents_starts.size)
+    infection_probability = \
+        1.0 - exp(add.reduceat(log_survival, agents_starts))
+    is_infected = dice < infection_probability
+
+    if not is_infected.any():
+        return success
+
+    # Work only on the contacts of the infected agents
+    infected_contacts = flatnonzero(repeat(is_infected, counts))
+    counts = counts[is_infected]
+    starts = concatenate(([0], cumsum(counts)[:-1]))
+    log_survival = log_survival[infected_contacts]
+
+    # Probability of having at least one success up to each contact
+    cumulative = cumsum(log_survival)
+    offset = repeat(cumulative[starts] - log_survival[starts], counts)
+    at_least_one = 1.0 - exp(cumulative - offset)
+
+    position = arange(infected_contacts.size) - repeat(starts, counts)
+    is_after_dice = at_least_one > repeat(dice[is_infected], counts)
+
+    # First successful contact, the last one if rounding errors hide it
+    first = minimum.reduceat(
+        where(is_after_dice, position, counts.max()),
+        starts
+        )
+    first = minimum(first, counts - 1)
+    first = repeat(first, counts)
+
+    # Contacts after the first success throw their own dice
+    later = flatnonzero(position > first)
+    infected_success = position == first
+    infected_success[later] = random_sample(later.size) \
+        <= probabilities[infected_contacts[later]]
+
+    success[infected_contacts] = infected_success
+
+    return success
+
+
+def contagion_vectorized(
+    df: DataFrame,
+    natural_history: NaturalHistory,
+    disease_groups: DiseaseStates,
+    susceptibility_groups: SusceptibilityGroups,
+    kdtree_by_disease_state: dict,
+    agents_labels_by_disease_state: dict,
+    candidates: Optional[ndarray] = None,
+    closed_form: bool = False
+) -> DataFrame:
+    """
+        Vectorized version of `contagion_function`. Instead of cycling
+        through the agents, it works on arrays of (susceptible, spreader)
+        pairs.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Population dataframe. It must contain `agent`, `x`, `y`,
+            `immunization_level`, `key`, `disease_state`,
+            `susceptibility_group`, `times_infected`, `disease_state_time`
+            and `reduction_factor` columns.
+
+        natural_history : NaturalHistory
+            Natural history of the disease.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        susceptibility_groups : SusceptibilityGroups
+            Susceptibility groups.
+
+        kdtree_by_disease_state : dict
+            KDTree of the agents of each disease state.
+
+        agents_labels_by_disease_state : dict
+            Agents labels of each disease state, in the same order used for
+            building the corresponding KDTree.
+
+        candidates : ndarray, optional
+            Positions of the agents that can get infected, as returned by
+            `contagion_candidates`. If None, every agent whose key allows a
+            transition by contagion is considered.
+
+        closed_form : bool
+            If True, a single dice is thrown for each susceptible agent
+            instead of one for each contact (see `multi_exposure_infection`).
+
+        Returns
+        -------
+        contagion_df : DataFrame
+            Dataframe with the same index as `df` and columns
+            `disease_state`, `times_infected`, `infected_by`,
+            `disease_state_time`, `do_calculate_max_time` and
+            `do_update_immunization_params`.
+
+        Notes
+        -----
+        For each spreader state, every pair of agents (susceptible, spreader)
+        inside the `spread_radius` is retrieved at once. The joint
+        probability of each pair is
 
-                # Now we have to get the corresponding spreader
-                # labels excluding the agent's own label
-                spreader_labels_inside_radius = list(setdiff1d(
-                        agents_labels_by_disease_state[
-                            spreader_state][
-                            points_inside_radius_array],
-                        agent
-                        )
-                    )
+        (1 - immunization_level) * susceptibility * spread_probability
+        * reduction_factor
 
-                # Calculate joint probability for contagion
-                spread_probability = disease_groups.items[spreader_state] \
-                    .spread_probability
+        where the susceptibility is sampled once for each susceptible agent
+        and spreader state, as `contagion_function` does. Then one dice is
+        thrown for each pair and `infected_by` is rebuilt splitting the
+        successful pairs by susceptible agent.
 
-                joint_probability = \
-                    (1.0 - immunization_level) \
-                    * (susceptibility_groups.items[susceptibility_group]
-                       .dist[DistTitles.susceptibility.value].sample()) \
-                    * spread_probability * reduction_factor
+        See Also
+        --------
+        contagion_function : Contagion rule for a single agent.
 
-                # Check if got infected
-                for spreader in spreader_labels_inside_radius:
-                    # Throw the dice
-                    dice = random_sample()
+        contagion_candidates : Agents that can get infected.
 
-                    if dice <= joint_probability:
-                        # Got infected !!!
-                        # Save who infected the agent
-                        infected_by.append(spreader)
+        multi_exposure_infection : Closed form contagion of each agent.
+    """
+    n_agents = df.shape[0]
+
+    agents = df["agent"].to_numpy()
+    keys = df["key"].array
+    disease_states = df["disease_state"].to_numpy(dtype=object, copy=True)
+    times_infected = df["times_infected"].to_numpy(dtype=int, copy=True)
+    disease_state_time = df["disease_state_time"].to_numpy(
+        dtype=float, copy=True
+        )
+    infected_by = [[] for agent in range(n_agents)]
+
+    # Agents that can get infected by contagion
+    if candidates is None:
+        candidates = flatnonzero(attribute_by_group(
+            keys, natural_history, "transition_by_contagion"
+            ).astype(bool))
+
+    susceptible_indexes = []
+    spreader_labels = []
+    spreader_order = []
+    contact_probabilities = []
+
+    if candidates.size != 0:
+        candidates_tree = KDTree(
+            df[["x", "y"]].to_numpy()[candidates]
+            )
+        immunization_level = df["immunization_level"].to_numpy(dtype=float)
+        reduction_factor = df["reduction_factor"].to_numpy(dtype=float)
+        susceptibility_group = df["susceptibility_group"].to_numpy()
 
-        if len(infected_by) != 0:
-            # Update times_infected
-            times_infected += 1
+        if "susceptibility_trait" in df.columns:
+            susceptibility_trait = df["susceptibility_trait"].to_numpy(
+                dtype=float
+                )
+        else:
+            susceptibility_trait = full(n_agents, nan)
+
+        spreaders = [
+            disease_state_label
+            for disease_state_label in disease_groups.items.keys()
+            if disease_groups.items[disease_state_label].can_spread
+            ]
 
-            # Verify: becomes into? ... Throw the dice
-            disease_state = choice(
-                disease_states,
-                p=probabilities
+        for order, spreader_state in enumerate(spreaders):
+            if not kdtree_by_disease_state[spreader_state]:
+                continue
+
+            spread_radius = disease_groups.items[spreader_state] \
+                .spread_radius
+            spread_probability = disease_groups.items[spreader_state] \
+                .spread_probability
+
+            i, j = neighbor_pairs(
+                candidates_tree,
+                kdtree_by_disease_state[spreader_state],
+                spread_radius
                 )
+            susceptibles = candidates[i]
+            labels = agents_labels_by_disease_state[spreader_state][j]
 
-            # Set the time elapsed since it got infected
-            # in zero
-            disease_state_time = 0
+            # Exclude the agent's own label
+            mask = agents[susceptibles] != labels
+            susceptibles = susceptibles[mask]
+            labels = labels[mask]
 
-            # Set True the flag that forces to calculate
-            # disease state max time
-            do_calculate_max_time = True
+            if susceptibles.size == 0:
+                continue
 
-            # Set True the flag that forces to update
-            # immunization params
-            do_update_immunization_params = True
+            # Susceptibility is sampled once for each susceptible agent
+            # without susceptibility trait
+            unique_susceptibles, inverse = unique(
+                susceptibles, return_inverse=True
+                )
+            susceptibility = fill_traits(
+                susceptibility_trait[unique_susceptibles],
+                susceptibility_group[unique_susceptibles],
+                susceptibility_groups,
+                DistTitles.susceptibility.value
+                )[inverse]
+
+            joint_probability = \
+                (1.0 - immunization_level[susceptibles]) \
+                * susceptibility * spread_probability \
+                * reduction_factor[susceptibles]
+
+            if closed_form:
+                # Dice are thrown once every contact is known
+                success = full(susceptibles.size, True)
+                contact_probabilities.append(joint_probability)
+            else:
+                # Throw all the dice at once
+                dice = random_sample(susceptibles.size)
+                success = dice <= joint_probability
+
+            susceptible_indexes.append(susceptibles[success])
+            spreader_labels.append(labels[success])
+            spreader_order.append(full(success.sum(), order))
+
+    if susceptible_indexes:
+        susceptible_indexes = concatenate(susceptible_indexes)
+        spreader_labels = concatenate(spreader_labels)
+        spreader_order = concatenate(spreader_order)
     else:
-        # transition_by_contagion == False
-        # It is supposed that this is the case for those with is_dead == True
-        pass
+        susceptible_indexes = array([], dtype=int)
 
-    return Series([disease_state, times_infected, infected_by,
-                   disease_state_time, do_calculate_max_time,
-                   do_update_immunization_params])
+    if closed_form and susceptible_indexes.size != 0:
+        # Group the contacts of each susceptible agent
+        sorting = lexsort(
+            (spreader_labels, spreader_order, susceptible_indexes)
+            )
+        susceptible_indexes = susceptible_indexes[sorting]
+        spreader_labels = spreader_labels[sorting]
+        spreader_order = spreader_order[sorting]
+
+        success = multi_exposure_infection(
+            susceptible_indexes,
+            concatenate(contact_probabilities)[sorting]
+            )
+
+        susceptible_indexes = susceptible_indexes[success]
+        spreader_labels = spreader_labels[success]
+        spreader_order = spreader_order[success]
+
+    do_calculate_max_time = zeros(n_agents, dtype=bool)
+
+    if susceptible_indexes.size != 0:
+        # Sort by susceptible agent, then by spreader state and label
+        sorting = lexsort(
+            (spreader_labels, spreader_order, susceptible_indexes)
+            )
+        susceptible_indexes = susceptible_indexes[sorting]
+        spreader_labels = spreader_labels[sorting]
+
+        infected, starts = unique(susceptible_indexes, return_index=True)
+
+        # Segment successful pairs by susceptible agent
+        for index, segment in zip(
+            infected,
+            split(spreader_labels, starts[1:])
+        ):
+            infected_by[index] = segment.tolist()
+
+        times_infected[infected] += 1
+        disease_state_time[infected] = 0
+        do_calculate_max_time[infected] = True
+
+        # Verify: becomes into? ... Throw the dice for each key
+        infected_keys, inverse = group_codes(keys[infected])
+        for position, key in enumerate(infected_keys):
+            mask = inverse == position
+            disease_states[infected[mask]] = natural_history \
+                .transition_sampler(key).sample(int(mask.sum()))
+
+    return DataFrame(
+        {
+            "disease_state": disease_states,
+            "times_infected": times_infected,
+            "infected_by": infected_by,
+            "disease_state_time": disease_state_time,
+            "do_calculate_max_time": do_calculate_max_time,
+            "do_update_immunization_params": do_calculate_max_time.copy()
+        },
+        index=df.index
+        )
 
 
 # =============================================================================
@@ -957,7 +2084,7 @@ def init_immunization_params_iterative(
     immunization_group: str,
     immunization_level: float,
     immunization_groups: ImmunizationGroups
-) -> Series([float, float, float]):
+) -> tuple[float, float, float]:
     """
         TODO: Add brief explanation
 
@@ -1006,8 +2133,81 @@ def init_immunization_params_iterative(
         immunization_max_time = nan
         immunization_slope = nan
 
-    return Series([immunization_time, immunization_max_time,
-                   immunization_slope])
+    return (immunization_time, immunization_max_time,
+            immunization_slope)
+
+
+def init_immunization_params_vectorized(
+    immunization_group: Series,
+    immunization_level: Series,
+    immunization_groups: ImmunizationGroups
+) -> DataFrame:
+    """
+        Vectorized version of `init_immunization_params_iterative`.
+
+        Parameters
+        ----------
+        immunization_group : Series
+            Immunization group of each agent.
+
+        immunization_level : Series
+            Immunization level of each agent.
+
+        immunization_groups : ImmunizationGroups
+            Immunization groups.
+
+        Returns
+        -------
+        immunization_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `immunization_time`, `immunization_max_time` and
+            `immunization_slope`. They are NaN for agents whose
+            `immunization_level` is zero.
+
+        Raises
+        ------
+        ValueError
+            If an agent with non zero `immunization_level` belongs to an
+            immunization group without immunization time distribution.
+
+        See Also
+        --------
+        init_immunization_params_iterative : Immunization params of a
+        single agent.
+    """
+    groups = immunization_group.to_numpy()
+    level = immunization_level.to_numpy(dtype=float)
+    immunized = level != 0
+
+    for group in unique(groups[immunized]):
+        distribution = immunization_groups \
+            .items[group] \
+            .dist[DistTitles.immunization_time.value]
+
+        if distribution.dist_type is None:
+            raise ValueError(
+                f"Error with {DistTitles.immunization_time.value} for"
+                f"immunization group '{group}': "
+                "If immunization_level != 0"
+                f"then {DistTitles.immunization_time.value} must not be None"
+                )
+
+    # In scale of days
+    immunization_time = where(immunized, 0.0, nan)
+    immunization_max_time = full(level.size, nan)
+    immunization_max_time[immunized] = immunization_groups.sample_by_group(
+        groups[immunized],
+        DistTitles.immunization_time.value
+        )
+
+    return DataFrame(
+        {
+            "immunization_time": immunization_time,
+            "immunization_max_time": immunization_max_time,
+            "immunization_slope": - level/immunization_max_time
+        },
+        index=immunization_group.index
+        )
 
 
 def update_immunization_params_iterative(
@@ -1019,7 +2219,7 @@ def update_immunization_params_iterative(
     immunization_max_time: float,  # In scale of days
     do_update_immunization_params: bool,
     natural_history: NaturalHistory
-) -> Series([float, float, float, float, bool]):
+) -> tuple[float, float, float, float, bool]:
     """
         TODO: Add brief explanation
 
@@ -1076,8 +2276,132 @@ def update_immunization_params_iterative(
 
         do_update_immunization_params = False
 
-    return Series([immunization_level, immunization_slope, immunization_time,
-                   immunization_max_time, do_update_immunization_params])
+    return (immunization_level, immunization_slope, immunization_time,
+            immunization_max_time, do_update_immunization_params)
+
+
+def update_immunization_params_vectorized(
+    key: Series,  # Must correspond to the outdated key
+    disease_state: Series,
+    immunization_level: Series,
+    immunization_slope: Series,
+    immunization_time: Series,  # In scale of days
+    immunization_max_time: Series,  # In scale of days
+    do_update_immunization_params: Series,
+    natural_history: NaturalHistory
+) -> DataFrame:
+    """
+        Vectorized version of `update_immunization_params_iterative`.
+
+        Parameters
+        ----------
+        key : Series
+            Outdated key (vulnerability group and former disease state) of
+            each agent.
+
+        disease_state : Series
+            Current disease state of each agent.
+
+        immunization_level : Series
+            Immunization level of each agent.
+
+        immunization_slope : Series
+            Immunization slope of each agent.
+
+        immunization_time : Series
+            Immunization time of each agent, in scale of days.
+
+        immunization_max_time : Series
+            Immunization max time of each agent, in scale of days.
+
+        do_update_immunization_params : Series
+            Whether the immunization params of each agent must be updated.
+
+        natural_history : NaturalHistory
+            Natural history of the disease.
+
+        Returns
+        -------
+        immunization_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `immunization_level`, `immunization_slope`, `immunization_time`,
+            `immunization_max_time` and `do_update_immunization_params`.
+
+        Notes
+        -----
+        Agents to be updated are grouped by (former key, disease state) so
+        the immunization gain is looked up and the immunization time is
+        sampled once for each transition.
+
+        See Also
+        --------
+        update_immunization_params_iterative : Immunization params update of
+        a single agent.
+    """
+    index = key.index
+    immunization_level = immunization_level.to_numpy(dtype=float, copy=True)
+    immunization_slope = immunization_slope.to_numpy(dtype=float, copy=True)
+    immunization_time = immunization_time.to_numpy(dtype=float, copy=True)
+    immunization_max_time = immunization_max_time.to_numpy(
+        dtype=float, copy=True
+        )
+    do_update_immunization_params = do_update_immunization_params \
+        .to_numpy(dtype=bool, copy=True)
+
+    to_update = flatnonzero(do_update_immunization_params)
+
+    # Group agents by transition, i.e. by (former key, disease state) pair
+    former_keys, key_inverse = group_codes(key.array[to_update])
+    states, state_inverse = group_codes(disease_state.array[to_update])
+    pairs, pair_inverse = unique(
+        key_inverse * len(states) + state_inverse,
+        return_inverse=True
+        )
+
+    for position, pair in enumerate(pairs):
+        agents = to_update[pair_inverse == position]
+        transition = natural_history.items[former_keys[pair // len(states)]] \
+            .transitions[states[pair % len(states)]]
+
+        # Update immunization_level with the gain
+        immunization_level[agents] = minimum(
+            immunization_level[agents] + transition.immunization_gain,
+            1.0
+            )
+
+        # Update immunization_max_time
+        distribution = transition.dist[DistTitles.immunization_time.value]
+
+        if distribution.dist_type is not None:
+            immunization_time_remainder = where(
+                isnan(immunization_max_time[agents]),
+                0.0,
+                immunization_max_time[agents] - immunization_time[agents]
+                )
+
+            immunization_max_time[agents] = \
+                distribution.sample(size=agents.size) \
+                + immunization_time_remainder
+
+    # Update immunization_slope, it is NaN where immunization_max_time is
+    immunization_slope[to_update] = \
+        - immunization_level[to_update]/immunization_max_time[to_update]
+
+    # Restart immnuzation_time
+    immunization_time[to_update] = 0.0
+
+    do_update_immunization_params[to_update] = False
+
+    return DataFrame(
+        {
+            "immunization_level": immunization_level,
+            "immunization_slope": immunization_slope,
+            "immunization_time": immunization_time,
+            "immunization_max_time": immunization_max_time,
+            "do_update_immunization_params": do_update_immunization_params
+        },
+        index=index
+        )
 
 
 # =============================================================================
@@ -1087,7 +2411,7 @@ def update_immunization_level_iterative(
     immunization_slope: float,
     immunization_time: float,  # In scale of days
     immunization_max_time: float  # In scale of days
-) -> Series([float, float, float, float]):
+) -> tuple[float, float, float, float]:
     """
         TODO: Add brief explanation
 
@@ -1121,8 +2445,71 @@ def update_immunization_level_iterative(
         immunization_time = nan
         immunization_max_time = nan
 
-    return Series([immunization_level, immunization_slope, immunization_time,
-                   immunization_max_time])
+    return (immunization_level, immunization_slope, immunization_time,
+            immunization_max_time)
+
+
+def update_immunization_level_vectorized(
+    dt: float,  # In scale of days
+    immunization_level: Series,
+    immunization_slope: Series,
+    immunization_time: Series,  # In scale of days
+    immunization_max_time: Series  # In scale of days
+) -> DataFrame:
+    """
+        Vectorized version of `update_immunization_level_iterative`.
+
+        Parameters
+        ----------
+        dt : float
+            Time step, in scale of days.
+
+        immunization_level : Series
+            Immunization level of each agent.
+
+        immunization_slope : Series
+            Immunization slope of each agent.
+
+        immunization_time : Series
+            Immunization time of each agent, in scale of days.
+
+        immunization_max_time : Series
+            Immunization max time of each agent, in scale of days.
+
+        Returns
+        -------
+        immunization_df : DataFrame
+            Dataframe with the same index as the inputs and columns
+            `immunization_level`, `immunization_slope`, `immunization_time`
+            and `immunization_max_time`.
+
+        Notes
+        -----
+        Immunization level decays linearly while `immunization_time` is
+        lower than `immunization_max_time`. Otherwise (NaN included) the
+        immunization level is set to zero and the params to NaN.
+
+        See Also
+        --------
+        update_immunization_level_iterative : Immunization level update of a
+        single agent.
+    """
+    level = immunization_level.to_numpy(dtype=float)
+    slope = immunization_slope.to_numpy(dtype=float)
+    time = immunization_time.to_numpy(dtype=float)
+    max_time = immunization_max_time.to_numpy(dtype=float)
+
+    decays = time < max_time
+
+    return DataFrame(
+        {
+            "immunization_level": where(decays, slope*dt + level, 0.0),
+            "immunization_slope": where(decays, slope, nan),
+            "immunization_time": where(decays, time + dt, nan),
+            "immunization_max_time": where(decays, max_time, nan)
+        },
+        index=immunization_level.index
+        )
 
 
 # =============================================================================
@@ -1134,12 +2521,13 @@ def alertness_function(
     is_dead: bool,
     vulnerability_group: str,
     disease_state: str,
+    alertness_trait: float,
     natural_history: NaturalHistory,
     disease_groups: DiseaseStates,
     kdtree_by_disease_state: dict,
     agents_labels_by_disease_state: dict,
     dead_disease_group: str
-) -> Series([bool, list]):
+) -> tuple[bool, list]:
     """
         TODO: Add brief explanation
 
@@ -1165,8 +2553,6 @@ def alertness_function(
     if is_dead:
         pass
     else:
-        all_avoidable_neighbors = array([])
-
         # Agent location
         agent_location = [x, y]
 
@@ -1206,15 +2592,15 @@ def alertness_function(
 
                     if len(avoidable_neighbors) != 0:
 
-                        all_avoidable_neighbors = concatenate(
-                            (all_avoidable_neighbors, avoidable_neighbors),
-                            axis=None
-                            )
-
                         for avoidable_agent_index in avoidable_neighbors:
-                            # Calculate alertness probability
-                            probability = natural_history.items[key] \
-                                .dist[DistTitles.alertness.value].sample()
+                            # Calculate alertness probability, unless it
+                            # is a trait of the agent
+                            if isnan(alertness_trait):
+                                probability = natural_history.items[key] \
+                                    .dist[DistTitles.alertness.value] \
+                                    .sample()
+                            else:
+                                probability = alertness_trait
 
                             if probability:
 
@@ -1233,13 +2619,171 @@ def alertness_function(
                                     # alerted_by
                                     alerted_by.append(avoidable_agent_index)
 
-        # float to int
-        all_avoidable_neighbors = all_avoidable_neighbors.astype(int)
+    return is_alert, alerted_by
+
+
+def alertness_vectorized(
+    df: DataFrame,
+    natural_history: NaturalHistory,
+    disease_groups: DiseaseStates,
+    kdtree_by_disease_state: dict,
+    agents_labels_by_disease_state: dict,
+    dead_disease_group: str
+) -> DataFrame:
+    """
+        Vectorized version of `alertness_function`. Instead of cycling
+        through the agents, it works on arrays of (agent, avoidable agent)
+        pairs.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Population dataframe. It must contain `agent`, `key`, `x`, `y`,
+            `is_dead` and `vulnerability_group` columns.
+
+        natural_history : NaturalHistory
+            Natural history of the disease.
+
+        disease_groups : DiseaseStates
+            Disease states.
+
+        kdtree_by_disease_state : dict
+            KDTree of the agents of each disease state.
+
+        agents_labels_by_disease_state : dict
+            Agents labels of each disease state, in the same order used for
+            building the corresponding KDTree.
+
+        dead_disease_group : str
+            Label of the dead disease state.
+
+        Returns
+        -------
+        alertness_df : DataFrame
+            Dataframe with the same index as `df` and columns `is_alert` and
+            `alerted_by`. Each element of `alerted_by` is an array with the
+            labels of the agents that alerted the agent.
+
+        Notes
+        -----
+        For each vulnerability group and avoidable state, every pair of
+        agents inside the corresponding `avoidance_radius` is retrieved at
+        once. Alertness probabilities are sampled in bulk for each agent key
+        and one dice is thrown for each pair.
+
+        See Also
+        --------
+        alertness_function : Alertness rule for a single agent.
+    """
+    n_agents = df.shape[0]
+
+    agents = df["agent"].to_numpy()
+    keys = df["key"].array
+    vulnerability_groups = df["vulnerability_group"].to_numpy()
+    alive = flatnonzero(~df["is_dead"].to_numpy(dtype=bool))
+    locations = df[["x", "y"]].to_numpy()
+
+    avoidable_states = [
+        disease_state_label
+        for disease_state_label in disease_groups.items.keys()
+        if disease_state_label != dead_disease_group
+        ]
+
+    agents_indexes = []
+    avoidable_labels = []
+    avoidable_order = []
+
+    for vulnerability_group in unique(vulnerability_groups[alive]):
+        group_agents = alive[
+            vulnerability_groups[alive] == vulnerability_group
+            ]
+        group_tree = KDTree(locations[group_agents])
+
+        for order, avoidable_state in enumerate(avoidable_states):
+            # Get radius to avoid an avoidable_agent (avoidance_radius)
+            avoidance_radius = natural_history.items[
+                std_str_join_cols(
+                    str(vulnerability_group),
+                    str(avoidable_state)
+                    )
+                ].avoidance_radius
+
+            if (avoidance_radius == 0
+               or not kdtree_by_disease_state[avoidable_state]):
+                continue
 
-        # ndarray to list
-        all_avoidable_neighbors = all_avoidable_neighbors.tolist()
+            i, j = neighbor_pairs(
+                group_tree,
+                kdtree_by_disease_state[avoidable_state],
+                avoidance_radius
+                )
+            pair_agents = group_agents[i]
+            labels = agents_labels_by_disease_state[avoidable_state][j]
+
+            # Exclude the agent's own label
+            mask = agents[pair_agents] != labels
+
+            agents_indexes.append(pair_agents[mask])
+            avoidable_labels.append(labels[mask])
+            avoidable_order.append(full(mask.sum(), order))
+
+    is_alert = zeros(n_agents, dtype=bool)
+    alerted_by = [array([], dtype=int) for agent in range(n_agents)]
+
+    if agents_indexes:
+        agents_indexes = concatenate(agents_indexes)
+        avoidable_labels = concatenate(avoidable_labels)
+        avoidable_order = concatenate(avoidable_order)
+
+        # Calculate alertness probabilities of the agents without
+        # alertness trait and throw all the dice at once
+        if "alertness_trait" in df.columns:
+            alertness_trait = df["alertness_trait"].to_numpy(
+                dtype=float
+                )[agents_indexes]
+        else:
+            alertness_trait = full(agents_indexes.size, nan)
 
-    return Series([is_alert, alerted_by])
+        probability = fill_traits(
+            alertness_trait,
+            keys[agents_indexes],
+            natural_history,
+            DistTitles.alertness.value
+            )
+        dice = random_sample(agents_indexes.size)
+
+        # Note that alertness depends on a probability, which tries to model
+        # the probability that an agent with a defined group and state is
+        # alert
+        alerted = (probability != 0) & (dice <= probability)
+        agents_indexes = agents_indexes[alerted]
+        avoidable_labels = avoidable_labels[alerted]
+        avoidable_order = avoidable_order[alerted]
+
+        # Sort by agent, then by avoidable state and label
+        sorting = lexsort(
+            (avoidable_labels, avoidable_order, agents_indexes)
+            )
+        agents_indexes = agents_indexes[sorting]
+        avoidable_labels = avoidable_labels[sorting].astype(int)
+
+        alerted_agents, starts = unique(agents_indexes, return_index=True)
+        is_alert[alerted_agents] = True
+
+        # Segment alerting agents by alerted agent
+        for index, segment in zip(
+            alerted_agents,
+            split(avoidable_labels, starts[1:])
+        ):
+            alerted_by[index] = segment
+
+    return DataFrame(
+        {
+            "is_alert": is_alert,
+            "alerted_by": alerted_by
+        },
+        index=df.index
+        )
 
 
 # =============================================================================
@@ -1297,14 +2841,17 @@ class AgentDisease:
         df = cls.init_is_dead(df, disease_groups, execmode, npartitions)
 
         # Generate key column
-        df = cls.generate_key_col(df, execmode, npartitions)
+        df = cls.generate_key_col(
+            df, execmode, npartitions, natural_history
+            )
 
         # Init disease_state_max_time
         df = cls.init_disease_state_max_time(
             df,
             disease_groups,
             natural_history,
-            ExecutionModes.iterative.value
+            execmode,
+            npartitions
         )
 
         # Init is_hospìtalized and is_in_ICU
@@ -1313,7 +2860,8 @@ class AgentDisease:
         df = df.assign(reduction_factor=1.0)
         df = cls.to_hospitalize_agents(
             df, dead_disease_group, alpha, disease_groups, health_system,
-            ExecutionModes.vectorized.value
+            execmode if execmode == ExecutionModes.numba.value
+            else ExecutionModes.vectorized.value
             )
 
         # Init is_diagnosed
@@ -1363,6 +2911,71 @@ class AgentDisease:
         return df
 
     @classmethod
+    def init_traits(
+        cls,
+        df: DataFrame,
+        susceptibility_groups: SusceptibilityGroups,
+        natural_history: NaturalHistory
+    ) -> DataFrame:
+        """
+            Draw once the per agent traits, i.e. the samples of those
+            distributions with `trait` set, into the columns
+            `susceptibility_trait` and `alertness_trait`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe. It must contain `susceptibility_group`
+                and `key` columns.
+
+            susceptibility_groups : SusceptibilityGroups
+                Susceptibility groups.
+
+            natural_history : NaturalHistory
+                Natural history of the disease.
+
+            Returns
+            -------
+            df : DataFrame
+                Dataframe with the trait columns. They are `nan` for the
+                agents whose distribution is not a trait, which are sampled
+                again on each encounter.
+
+            Notes
+            -----
+            The alertness trait depends on the agent key, so it is dropped
+            whenever the disease state of the agent changes and drawn again
+            by `update_alertness_state`.
+
+            See Also
+            --------
+            sample_traits : TODO complete explanation
+
+            refill_traits : TODO complete explanation
+        """
+        try:
+            df = df.assign(susceptibility_trait=nan, alertness_trait=nan)
+
+            df = refill_traits(
+                df, "susceptibility_trait", "susceptibility_group",
+                susceptibility_groups, DistTitles.susceptibility.value
+                )
+
+            df = refill_traits(
+                df, "alertness_trait", "key",
+                natural_history, DistTitles.alertness.value
+                )
+        except Exception as error:
+            validation_list = ["susceptibility_group", "key"]
+            exception_burner([
+                error,
+                check_field_existance(df, validation_list)
+                ])
+        else:
+            return df
+
+    @classmethod
+    @partitioned_stage
     def init_is_dead(
         cls,
         df: DataFrame,
@@ -1401,21 +3014,27 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.iterative.value:
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.multiprocessing.value]:
                 df["is_dead"] = df.apply(
                     lambda row: disease_groups
                     .items[row["disease_state"]].is_dead,
                     axis=1
                 )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df["is_dead"] = df.apply(
                     lambda row: disease_groups
                     .items[row["disease_state"]].is_dead,
                     axis=1,
                     meta=('is_dead', 'bool')
                 )
-                df = df.compute()
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df["is_dead"] = attribute_by_group(
+                    df["disease_state"].to_numpy(),
+                    disease_groups,
+                    "is_dead"
+                    ).astype(bool)
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1430,6 +3049,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def init_times_infected(
         cls,
         df: DataFrame,
@@ -1468,21 +3088,27 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.iterative.value:
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.multiprocessing.value]:
                 df["times_infected"] = df.apply(
                     lambda row: 1 if disease_groups
                     .items[row["disease_state"]].is_infected else 0,
                     axis=1
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df["times_infected"] = df.apply(
                     lambda row: 1 if disease_groups
                     .items[row["disease_state"]].is_infected else 0,
                     axis=1,
                     meta=(0, "int64")
                 )
-                df = df.compute()
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df["times_infected"] = attribute_by_group(
+                    df["disease_state"].to_numpy(),
+                    disease_groups,
+                    "is_infected"
+                    ).astype(int)
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1497,6 +3123,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def init_immunization_level(
         cls,
         df: DataFrame,
@@ -1535,7 +3162,8 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.iterative.value:
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.multiprocessing.value]:
                 df["immunization_level"] = df.apply(
                     lambda row: immunization_groups
                     .items[row["immunization_group"]].dist[
@@ -1543,7 +3171,6 @@ class AgentDisease:
                     axis=1
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df["immunization_level"] = df.apply(
                     lambda row: immunization_groups
                     .items[row["immunization_group"]].dist[
@@ -1551,7 +3178,12 @@ class AgentDisease:
                     axis=1,
                     meta=(0, "int64")
                 )
-                df = df.compute()
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df["immunization_level"] = immunization_groups.sample_by_group(
+                    df["immunization_group"].to_numpy(),
+                    DistTitles.immunization_level.value
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1566,6 +3198,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def init_immunization_params(
         cls,
         df: DataFrame,
@@ -1603,34 +3236,58 @@ class AgentDisease:
             --------
             TODO: include some examples
         """
+        # Types of the values returned by init_immunization_params_iterative
+        dtypes = {
+            0: "float64",
+            1: "float64",
+            2: "float64"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 df[["immunization_time", "immunization_max_time",
-                    "immunization_slope"]] = df.apply(
-                    lambda row: init_immunization_params_iterative(
-                        row["immunization_group"],
-                        row["immunization_level"],
-                        immunization_groups
+                    "immunization_slope"]] = apply_rows(
+                    df,
+                    partial(
+                        init_immunization_params_iterative,
+                        immunization_groups=immunization_groups
                         ),
-                        axis=1
+                    ["immunization_group", "immunization_level"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df[["immunization_time", "immunization_max_time",
-                    "immunization_slope"]] = df.apply(
-                        lambda row: init_immunization_params_iterative(
-                            row["immunization_group"],
-                            row["immunization_level"],
-                            immunization_groups
+                    "immunization_slope"]] = df.map_partitions(
+                        apply_rows,
+                        partial(
+                            init_immunization_params_iterative,
+                            immunization_groups=immunization_groups
+                            ),
+                        ["immunization_group", "immunization_level"],
+                        dtypes,
+                        meta=dtypes
+                        )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["immunization_time", "immunization_max_time",
+                    "immunization_slope"]] = \
+                    init_immunization_params_vectorized(
+                        df["immunization_group"],
+                        df["immunization_level"],
+                        immunization_groups
+                        )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["immunization_time", "immunization_max_time",
+                    "immunization_slope"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        init_immunization_params_iterative,
+                        immunization_groups=immunization_groups
                         ),
-                        axis=1,
-                        meta={
-                            0: "float64",
-                            1: "float64",
-                            2: "float64"
-                        }
-                    )
-                df = df.compute()
+                    ["immunization_group", "immunization_level"],
+                    npartitions,
+                    dtypes
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1645,11 +3302,13 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def generate_key_col(
         cls,
         df: DataFrame,
         execmode: ExecutionModes = ExecutionModes.iterative.value,
-        npartitions: Optional[int] = 1
+        npartitions: Optional[int] = 1,
+        natural_history: Optional[NaturalHistory] = None
     ) -> DataFrame:
         """
             TODO: Add brief explanation
@@ -1658,6 +3317,13 @@ class AgentDisease:
             ----------
             TODO
 
+            natural_history : NaturalHistory, optional
+                Only used in vectorized mode. If provided, `key` is stored
+                as a categorical whose categories are `natural_history.keys`
+                so that `df["key"].cat.codes` is
+                `vulnerability_code * n_states + state_code` and the string
+                label is still available with `df["key"].astype(str)`.
+
             Returns
             -------
             TODO
@@ -1677,6 +3343,8 @@ class AgentDisease:
 
             std_str_join_cols : TODO complete explanation
 
+            NaturalHistory.key_categorical : TODO complete explanation
+
             check_field_existance : TODO complete explanation
 
             Examples
@@ -1684,7 +3352,8 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.iterative.value:
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.multiprocessing.value]:
                 df["key"] = df.apply(
                     lambda row: std_str_join_cols(
                         str(row["vulnerability_group"]),
@@ -1693,7 +3362,6 @@ class AgentDisease:
                     axis=1
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df["key"] = df.apply(
                     lambda row: std_str_join_cols(
                         str(row["vulnerability_group"]),
@@ -1702,12 +3370,18 @@ class AgentDisease:
                     axis=1,
                     meta=(0, "str")
                     )
-                df = df.compute()
-            elif execmode == ExecutionModes.vectorized.value:
-                df["key"] = std_str_join_cols(
-                    df["vulnerability_group"],
-                    df["disease_state"]
-                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                if natural_history is not None:
+                    df["key"] = natural_history.key_categorical(
+                        df["vulnerability_group"],
+                        df["disease_state"]
+                        )
+                else:
+                    df["key"] = std_str_join_cols(
+                        df["vulnerability_group"],
+                        df["disease_state"]
+                        )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1722,12 +3396,14 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def init_disease_state_max_time(
         cls,
         df: DataFrame,
         disease_groups: DiseaseStates,
         natural_history: NaturalHistory,
-        execmode: ExecutionModes = ExecutionModes.iterative.value
+        execmode: ExecutionModes = ExecutionModes.iterative.value,
+        npartitions: Optional[int] = 1
     ) -> DataFrame:
         """
             TODO: Add brief explanation
@@ -1768,7 +3444,8 @@ class AgentDisease:
             df = df.assign(disease_state_time=nan)
             df = df.assign(disease_state_max_time=nan)
 
-            if execmode == ExecutionModes.iterative.value:
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.multiprocessing.value]:
                 df["do_calculate_max_time"] = df.apply(
                     lambda row: init_calculate_max_time_iterative(
                         row["key"],
@@ -1776,7 +3453,17 @@ class AgentDisease:
                         ),
                     axis=1
                     )
-            elif execmode == ExecutionModes.vectorized.value:
+            elif execmode == ExecutionModes.dask.value:
+                df["do_calculate_max_time"] = df.apply(
+                    lambda row: init_calculate_max_time_iterative(
+                        row["key"],
+                        natural_history
+                        ),
+                    axis=1,
+                    meta=(0, "bool")
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
                 df["do_calculate_max_time"] = \
                     init_calculate_max_time_vectorized(
                         df["key"],
@@ -1796,12 +3483,12 @@ class AgentDisease:
             # Call determine_disease_state_max_time function in order
             # to calculate it for those agents who are infected
             df = cls.determine_disease_state_max_time(
-                df, disease_groups, natural_history, execmode
+                df, disease_groups, natural_history, execmode, npartitions
             )
             return df
 
-    # TODO: Reimplement calculate_max_time_vectorized
     @classmethod
+    @partitioned_stage
     def determine_disease_state_max_time(
         cls,
         df: DataFrame,
@@ -1844,49 +3531,67 @@ class AgentDisease:
             --------
             TODO: include some examples
         """
+        # Types of the values returned by calculate_max_time_iterative
+        dtypes = {
+            0: "float64",
+            1: "float64"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 df[["disease_state_time",
-                    "disease_state_max_time"]] = df.apply(
-                    lambda row: calculate_max_time_iterative(
-                        row["key"],
-                        row["disease_state"],
-                        row["do_calculate_max_time"],
-                        row["disease_state_time"],
-                        row["disease_state_max_time"],
-                        disease_groups,
-                        natural_history
+                    "disease_state_max_time"]] = apply_rows(
+                    df,
+                    partial(
+                        calculate_max_time_iterative,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
                         ),
-                    axis=1
+                    ["key", "disease_state", "do_calculate_max_time",
+                     "disease_state_time", "disease_state_max_time"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df[["disease_state_time",
-                    "disease_state_max_time"]] = df.apply(
-                    lambda row: calculate_max_time_iterative(
-                        row["key"],
-                        row["disease_state"],
-                        row["do_calculate_max_time"],
-                        row["disease_state_time"],
-                        row["disease_state_max_time"],
+                    "disease_state_max_time"]] = df.map_partitions(
+                    apply_rows,
+                    partial(
+                        calculate_max_time_iterative,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
+                        ),
+                    ["key", "disease_state", "do_calculate_max_time",
+                     "disease_state_time", "disease_state_max_time"],
+                    dtypes,
+                    meta=dtypes
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["disease_state_time",
+                    "disease_state_max_time"]] = \
+                    calculate_max_time_vectorized(
+                        df["key"],
+                        df["disease_state"],
+                        df["do_calculate_max_time"],
+                        df["disease_state_time"],
+                        df["disease_state_max_time"],
                         disease_groups,
                         natural_history
+                        )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["disease_state_time",
+                    "disease_state_max_time"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        calculate_max_time_iterative,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
                         ),
-                    axis=1,
-                    meta={
-                        0: "float64",
-                        1: "float64"
-                    }
-                    )
-                df = df.compute()
-            # TODO: Reimplement calculate_max_time_vectorized
-            # elif execmode == ExecutionModes.vectorized.value:
-            #     df["disease_state_max_time"] = calculate_max_time_vectorized(
-            #         df["key"],
-            #         df["do_calculate_max_time"],
-            #         df["disease_state_max_time"],
-            #         natural_history
-            #         )
+                    ["key", "disease_state", "do_calculate_max_time",
+                     "disease_state_time", "disease_state_max_time"],
+                    npartitions,
+                    dtypes
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -1905,6 +3610,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def disease_state_transition(
         cls,
         df: DataFrame,
@@ -1912,7 +3618,8 @@ class AgentDisease:
         disease_groups: DiseaseStates,
         natural_history: NaturalHistory,
         execmode: ExecutionModes = ExecutionModes.iterative.value,
-        npartitions: Optional[int] = 1
+        npartitions: Optional[int] = 1,
+        scheduler: Optional[TransitionScheduler] = None
     ) -> DataFrame:
         """
             TODO: Add brief explanation
@@ -1921,6 +3628,15 @@ class AgentDisease:
             ----------
             TODO
 
+            scheduler : TransitionScheduler, optional
+                Schedule of disease states expiration. Only used in
+                vectorized mode: if given, only the agents of the due bucket
+                are touched instead of the whole population, and the agents
+                that went through a transition are rescheduled. The
+                `disease_state_time` of the other agents is kept by the
+                scheduler and is not written into `df`, see
+                `TransitionScheduler.materialize`.
+
             Returns
             -------
             TODO
@@ -1942,12 +3658,23 @@ class AgentDisease:
 
             transition_function : TODO complete explanation
 
+            transition_vectorized : TODO complete explanation
+
             determine_disease_state_max_time : TODO complete explanation
 
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by transition_function
+        dtypes = {
+            0: "object",
+            1: "float64",
+            2: "bool",
+            3: "bool",
+            4: "bool"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 # Update disease state time
@@ -1955,65 +3682,136 @@ class AgentDisease:
 
                 df[["disease_state", "disease_state_time", "is_dead",
                     "do_calculate_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: transition_function(
-                        row["disease_state"],
-                        row["disease_state_time"],
-                        row["disease_state_max_time"],
-                        row["is_dead"],
-                        row["key"],
-                        disease_groups,
-                        natural_history
+                    "do_update_immunization_params"]] = apply_rows(
+                    df,
+                    partial(
+                        transition_function,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
                         ),
-                    axis=1
+                    ["disease_state", "disease_state_time",
+                     "disease_state_max_time", "is_dead", "key"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
                 # Update disease state time
-                df = from_pandas(df, npartitions=npartitions)
                 df["disease_state_time"] = df["disease_state_time"] + dt
 
                 df[["disease_state", "disease_state_time", "is_dead",
                     "do_calculate_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: transition_function(
-                        row["disease_state"],
-                        row["disease_state_time"],
-                        row["disease_state_max_time"],
-                        row["is_dead"],
-                        row["key"],
-                        disease_groups,
-                        natural_history
+                    "do_update_immunization_params"]] = df.map_partitions(
+                    apply_rows,
+                    partial(
+                        transition_function,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
                         ),
-                    axis=1,
-                    meta={
-                        0: "str",
-                        1: "float64",
-                        2: "bool",
-                        3: "bool",
-                        4: "bool"
-                    }
+                    ["disease_state", "disease_state_time",
+                     "disease_state_max_time", "is_dead", "key"],
+                    dtypes,
+                    meta=dtypes
                     )
-                df = df.compute()
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                if scheduler is None:
+                    # Update disease state time
+                    df["disease_state_time"] = df["disease_state_time"] + dt
+
+                    # nan max times never satisfy the comparison
+                    due = flatnonzero(
+                        df["disease_state_time"].to_numpy()
+                        >= df["disease_state_max_time"].to_numpy()
+                        )
+                else:
+                    # Only the agents of the due bucket are touched, the
+                    # disease state time of the others is kept by the
+                    # scheduler
+                    due_labels = scheduler.pop_due()
+                    full_df = df
+                    df = full_df.loc[due_labels].copy()
+                    df["disease_state_time"] = scheduler.times(due_labels)
+                    due = arange(len(df))
+
+                df[["disease_state", "is_dead", "do_calculate_max_time",
+                    "do_update_immunization_params"]] = transition_vectorized(
+                    df["disease_state"].to_numpy(),
+                    df["is_dead"].to_numpy(),
+                    df["key"].array,
+                    due,
+                    disease_groups,
+                    natural_history
+                    ).set_index(df.index)
+            elif execmode == ExecutionModes.multiprocessing.value:
+                # Update disease state time
+                df["disease_state_time"] = df["disease_state_time"] + dt
 
+                df[["disease_state", "disease_state_time", "is_dead",
+                    "do_calculate_max_time",
+                    "do_update_immunization_params"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        transition_function,
+                        disease_groups=disease_groups,
+                        natural_history=natural_history
+                        ),
+                    ["disease_state", "disease_state_time",
+                     "disease_state_max_time", "is_dead", "key"],
+                    npartitions,
+                    dtypes
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
                     )
 
-            # Call determine_disease_state_max_time function in order
-            # to calculate it for those agents who went through a transition
-            df = cls.determine_disease_state_max_time(
-                df, disease_groups, natural_history, execmode
-                )
+            if "alertness_trait" in df.columns:
+                # Agents who went through a transition change their key, so
+                # they need a new alertness trait
+                df["alertness_trait"] = df["alertness_trait"].mask(
+                    df["do_calculate_max_time"]
+                    )
 
             # Call update_immunization_params function in order to update them
-            # for those agents who went through a transition
+            # for those agents who went through a transition. It needs the
+            # former key, so it goes before the key is updated
             df = cls.update_immunization_params(
                 df, natural_history, execmode
                 )
 
             # Update key column
-            df = cls.generate_key_col(df, execmode)
+            df = cls.generate_key_col(
+                df, execmode, natural_history=natural_history
+                )
+
+            # Call determine_disease_state_max_time function in order
+            # to calculate it for those agents who went through a transition.
+            # It needs the key of the new disease state
+            df = cls.determine_disease_state_max_time(
+                df, disease_groups, natural_history, execmode
+                )
+
+            if scheduler is not None \
+                    and execmode in [ExecutionModes.vectorized.value,
+                                     ExecutionModes.numba.value]:
+                # Schedule the expiration of the new disease states
+                scheduler.schedule(
+                    due_labels,
+                    df["disease_state_time"].to_numpy(),
+                    df["disease_state_max_time"].to_numpy()
+                    )
+
+                # Write the due agents back into the population
+                for column in [
+                    "disease_state", "disease_state_time",
+                    "disease_state_max_time", "is_dead",
+                    "do_calculate_max_time", "immunization_level",
+                    "immunization_slope", "immunization_time",
+                    "immunization_max_time", "do_update_immunization_params",
+                    "key", "alertness_trait"
+                ]:
+                    if column in df.columns:
+                        full_df.loc[due_labels, column] = df[column]
+                df = full_df
 
         except Exception as error:
             validation_list = ["disease_state", "disease_state_time",
@@ -2068,7 +3866,8 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.vectorized.value:
+            if execmode in [ExecutionModes.vectorized.value,
+                            ExecutionModes.numba.value]:
                 df[["is_hospitalized", "is_in_ICU",
                     "disease_state", "is_dead",
                     "reduction_factor"]] = hospitalization_vectorized(
@@ -2080,7 +3879,8 @@ class AgentDisease:
                     dead_disease_group,
                     alpha,
                     disease_groups,
-                    health_system
+                    health_system,
+                    execmode
                     )
             else:
                 raise NotImplementedError(
@@ -2097,6 +3897,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def to_diagnose_agents(
         cls,
         df: DataFrame,
@@ -2132,6 +3933,8 @@ class AgentDisease:
 
             diagnosis_function : TODO complete explanation
 
+            diagnosis_vectorized : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
@@ -2148,7 +3951,6 @@ class AgentDisease:
                     axis=1
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df["is_diagnosed"] = df.apply(
                     lambda row: diagnosis_function(
                         row["disease_state"],
@@ -2159,7 +3961,24 @@ class AgentDisease:
                     axis=1,
                     meta=(0, "bool")
                     )
-                df = df.compute()
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df["is_diagnosed"] = diagnosis_vectorized(
+                    df["disease_state"],
+                    df["is_dead"],
+                    df["is_diagnosed"],
+                    disease_groups
+                    )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df["is_diagnosed"] = ProcessPool.apply(
+                    df,
+                    partial(
+                        diagnosis_function,
+                        disease_groups=disease_groups
+                        ),
+                    ["disease_state", "is_dead", "is_diagnosed"],
+                    npartitions
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2174,6 +3993,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def to_isolate_agents(
         cls,
         df: DataFrame,
@@ -2212,10 +4032,22 @@ class AgentDisease:
 
             isolation_handler : TODO complete explanation
 
+            isolation_vectorized : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by isolation_handler
+        dtypes = {
+            0: "bool",
+            1: "bool",
+            2: "float64",
+            3: "float64",
+            4: "bool",
+            5: "float64"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 # Update isolation time
@@ -2223,54 +4055,82 @@ class AgentDisease:
 
                 df[["is_diagnosed", "is_isolated", "isolation_time",
                     "isolation_max_time", "adheres_to_isolation",
-                    "reduction_factor"]] = df.apply(
-                    lambda row: isolation_handler(
-                        row["disease_state"],
-                        row["isolation_adherence_group"],
-                        row["is_diagnosed"],
-                        row["is_isolated"],
-                        row["isolation_time"],
-                        row["isolation_max_time"],
-                        row["adheres_to_isolation"],
-                        row["reduction_factor"],
-                        beta,
-                        disease_groups,
-                        isolation_adherence_groups
+                    "reduction_factor"]] = apply_rows(
+                    df,
+                    partial(
+                        isolation_handler,
+                        beta=beta,
+                        disease_groups=disease_groups,
+                        isolation_adherence_groups=isolation_adherence_groups
                         ),
-                    axis=1
+                    ["disease_state", "isolation_adherence_group",
+                     "is_diagnosed", "is_isolated", "isolation_time",
+                     "isolation_max_time", "adheres_to_isolation",
+                     "reduction_factor"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
                 # Update isolation time
-                df = from_pandas(df, npartitions=npartitions)
                 df["isolation_time"] = df["isolation_time"] + dt
 
                 df[["is_diagnosed", "is_isolated", "isolation_time",
                     "isolation_max_time", "adheres_to_isolation",
-                    "reduction_factor"]] = df.apply(
-                    lambda row: isolation_handler(
-                        row["disease_state"],
-                        row["isolation_adherence_group"],
-                        row["is_diagnosed"],
-                        row["is_isolated"],
-                        row["isolation_time"],
-                        row["isolation_max_time"],
-                        row["adheres_to_isolation"],
-                        row["reduction_factor"],
-                        beta,
-                        disease_groups,
-                        isolation_adherence_groups
+                    "reduction_factor"]] = df.map_partitions(
+                    apply_rows,
+                    partial(
+                        isolation_handler,
+                        beta=beta,
+                        disease_groups=disease_groups,
+                        isolation_adherence_groups=isolation_adherence_groups
                         ),
-                    axis=1,
-                    meta={
-                        0: "bool",
-                        1: "bool",
-                        2: "float64",
-                        3: "float64",
-                        4: "bool",
-                        5: "float64",
-                    }
-                    )
-                df = df.compute()
+                    ["disease_state", "isolation_adherence_group",
+                     "is_diagnosed", "is_isolated", "isolation_time",
+                     "isolation_max_time", "adheres_to_isolation",
+                     "reduction_factor"],
+                    dtypes,
+                    meta=dtypes
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                # Update isolation time
+                df["isolation_time"] = df["isolation_time"] + dt
+
+                df[["is_diagnosed", "is_isolated", "isolation_time",
+                    "isolation_max_time", "adheres_to_isolation",
+                    "reduction_factor"]] = isolation_vectorized(
+                    df["disease_state"],
+                    df["isolation_adherence_group"],
+                    df["is_diagnosed"],
+                    df["is_isolated"],
+                    df["isolation_time"],
+                    df["isolation_max_time"],
+                    df["adheres_to_isolation"],
+                    df["reduction_factor"],
+                    beta,
+                    disease_groups,
+                    isolation_adherence_groups
+                    )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                # Update isolation time
+                df["isolation_time"] = df["isolation_time"] + dt
+
+                df[["is_diagnosed", "is_isolated", "isolation_time",
+                    "isolation_max_time", "adheres_to_isolation",
+                    "reduction_factor"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        isolation_handler,
+                        beta=beta,
+                        disease_groups=disease_groups,
+                        isolation_adherence_groups=isolation_adherence_groups
+                        ),
+                    ["disease_state", "isolation_adherence_group",
+                     "is_diagnosed", "is_isolated", "isolation_time",
+                     "isolation_max_time", "adheres_to_isolation",
+                     "reduction_factor"],
+                    npartitions,
+                    dtypes
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2288,6 +4148,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def to_isolate_agents_by_mr(
         cls,
         df: DataFrame,
@@ -2323,48 +4184,78 @@ class AgentDisease:
 
             check_field_existance : TODO complete explanation
 
-            isolation_handler : TODO complete explanation
+            mr_handler : TODO complete explanation
+
+            mr_vectorized : TODO complete explanation
 
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by mr_handler
+        dtypes = {
+            0: "bool",
+            1: "bool",
+            2: "float64"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 df[["isolated_by_mr", "adheres_to_mr_isolation",
-                    "reduction_factor"]] = df.apply(
-                    lambda row: mr_handler(
-                        row["mr_group"],
-                        row["mr_adherence_group"],
-                        row["is_diagnosed"],
-                        row["reduction_factor"],
-                        beta,
-                        mrc_target_groups,
-                        mr_adherence_groups
+                    "reduction_factor"]] = apply_rows(
+                    df,
+                    partial(
+                        mr_handler,
+                        beta=beta,
+                        mrc_target_groups=mrc_target_groups,
+                        mr_adherence_groups=mr_adherence_groups
                         ),
-                    axis=1
+                    ["mr_group", "mr_adherence_group", "is_diagnosed",
+                     "reduction_factor"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df[["isolated_by_mr", "adheres_to_mr_isolation",
-                    "reduction_factor"]] = df.apply(
-                    lambda row: mr_handler(
-                        row["mr_group"],
-                        row["mr_adherence_group"],
-                        row["is_diagnosed"],
-                        row["reduction_factor"],
-                        beta,
-                        mrc_target_groups,
-                        mr_adherence_groups
+                    "reduction_factor"]] = df.map_partitions(
+                    apply_rows,
+                    partial(
+                        mr_handler,
+                        beta=beta,
+                        mrc_target_groups=mrc_target_groups,
+                        mr_adherence_groups=mr_adherence_groups
                         ),
-                    axis=1,
-                    meta={
-                        0: "bool",
-                        1: "bool",
-                        2: "float64"
-                    }
+                    ["mr_group", "mr_adherence_group", "is_diagnosed",
+                     "reduction_factor"],
+                    dtypes,
+                    meta=dtypes
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["isolated_by_mr", "adheres_to_mr_isolation",
+                    "reduction_factor"]] = mr_vectorized(
+                    df["mr_group"],
+                    df["mr_adherence_group"],
+                    df["is_diagnosed"],
+                    df["reduction_factor"],
+                    beta,
+                    mrc_target_groups,
+                    mr_adherence_groups
+                    )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["isolated_by_mr", "adheres_to_mr_isolation",
+                    "reduction_factor"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        mr_handler,
+                        beta=beta,
+                        mrc_target_groups=mrc_target_groups,
+                        mr_adherence_groups=mr_adherence_groups
+                        ),
+                    ["mr_group", "mr_adherence_group", "is_diagnosed",
+                     "reduction_factor"],
+                    npartitions,
+                    dtypes
                     )
-                df = df.compute()
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2390,7 +4281,9 @@ class AgentDisease:
         disease_groups: DiseaseStates,
         susceptibility_groups: SusceptibilityGroups,
         execmode: ExecutionModes = ExecutionModes.iterative.value,
-        npartitions: Optional[int] = 1
+        npartitions: Optional[int] = 1,
+        scheduler: Optional[TransitionScheduler] = None,
+        closed_form: bool = False
     ) -> DataFrame:
         """
             TODO: Add brief explanation
@@ -2399,6 +4292,16 @@ class AgentDisease:
             ----------
             TODO
 
+            scheduler : TransitionScheduler, optional
+                Schedule of disease states expiration. Only used in
+                vectorized mode: the agents that got infected are
+                rescheduled.
+
+            closed_form : bool
+                Only used in vectorized mode. If True, a single dice is
+                thrown for each susceptible agent, see
+                `multi_exposure_infection`.
+
             Returns
             -------
             TODO
@@ -2418,96 +4321,213 @@ class AgentDisease:
 
             check_field_existance : TODO complete explanation
 
+            contagion_candidates : TODO complete explanation
+
             contagion_function : TODO complete explanation
 
+            contagion_vectorized : TODO complete explanation
+
             determine_disease_state_max_time : TODO complete explanation
 
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by contagion_function
+        dtypes = {
+            0: "object",
+            1: "int64",
+            2: "object",
+            3: "float64",
+            4: "bool",
+            5: "bool"
+        }
+
         try:
-            if execmode == ExecutionModes.iterative.value:
-                df_copy = df.copy()
-
-                df[["disease_state", "times_infected", "infected_by",
-                    "disease_state_time", "do_calculate_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: contagion_function(
-                        row["agent"],
-                        row["x"],
-                        row["y"],
-                        row["immunization_level"],
-                        row["key"],
-                        row["disease_state"],
-                        row["susceptibility_group"],
-                        row["times_infected"],
-                        row["disease_state_time"],
-                        row["reduction_factor"],
-                        natural_history,
-                        disease_groups,
-                        susceptibility_groups,
-                        kdtree_by_disease_state,
-                        agents_labels_by_disease_state,
-                        df_copy
-                        ),
-                    axis=1
+            contagion_columns = [
+                "disease_state", "times_infected", "infected_by",
+                "disease_state_time", "do_calculate_max_time",
+                "do_update_immunization_params"
+                ]
+
+            # Only agents that can get infected and have at least one
+            # spreader around are evaluated
+            candidates = contagion_candidates(
+                df,
+                natural_history,
+                disease_groups,
+                kdtree_by_disease_state,
+                agents_labels_by_disease_state
+                )
+
+            if execmode in [ExecutionModes.iterative.value,
+                            ExecutionModes.dask.value,
+                            ExecutionModes.multiprocessing.value]:
+                candidates_df = df.iloc[candidates]
+
+                if "susceptibility_trait" not in df.columns:
+                    candidates_df = candidates_df.assign(
+                        susceptibility_trait=nan
+                        )
+
+                if execmode == ExecutionModes.dask.value \
+                        and candidates.size != 0:
+                    candidates_df = from_pandas(
+                        candidates_df,
+                        npartitions=npartitions
+                        )
+
+                if candidates.size == 0:
+                    contagion_df = DataFrame(columns=range(6))
+                elif execmode == ExecutionModes.iterative.value:
+                    contagion_df = apply_rows(
+                        candidates_df,
+                        partial(
+                            contagion_function,
+                            natural_history=natural_history,
+                            disease_groups=disease_groups,
+                            susceptibility_groups=susceptibility_groups,
+                            kdtree_by_disease_state=kdtree_by_disease_state,
+                            agents_labels_by_disease_state=(
+                                agents_labels_by_disease_state
+                                )
+                            ),
+                        ["agent", "x", "y", "immunization_level", "key",
+                         "disease_state", "susceptibility_group",
+                         "times_infected", "disease_state_time",
+                         "reduction_factor", "susceptibility_trait"],
+                        dtypes
+                        )
+                elif execmode == ExecutionModes.dask.value:
+                    contagion_df = candidates_df.map_partitions(
+                        apply_rows,
+                        partial(
+                            contagion_function,
+                            natural_history=natural_history,
+                            disease_groups=disease_groups,
+                            susceptibility_groups=susceptibility_groups,
+                            kdtree_by_disease_state=kdtree_by_disease_state,
+                            agents_labels_by_disease_state=(
+                                agents_labels_by_disease_state
+                                )
+                            ),
+                        ["agent", "x", "y", "immunization_level", "key",
+                         "disease_state", "susceptibility_group",
+                         "times_infected", "disease_state_time",
+                         "reduction_factor", "susceptibility_trait"],
+                        dtypes,
+                        meta=dtypes
+                        ).compute()
+                else:
+                    contagion_df = ProcessPool.apply(
+                        candidates_df,
+                        partial(
+                            contagion_function,
+                            natural_history=natural_history,
+                            disease_groups=disease_groups,
+                            susceptibility_groups=susceptibility_groups,
+                            kdtree_by_disease_state=kdtree_by_disease_state,
+                            agents_labels_by_disease_state=(
+                                agents_labels_by_disease_state
+                                )
+                            ),
+                        ["agent", "x", "y", "immunization_level", "key",
+                         "disease_state", "susceptibility_group",
+                         "times_infected", "disease_state_time",
+                         "reduction_factor", "susceptibility_trait"],
+                        npartitions,
+                        dtypes
+                        )
+
+                # Agents out of the working set keep their values
+                infected_by = Series(
+                    [[] for agent in range(df.shape[0])],
+                    dtype=object
+                    ).to_numpy()
+                df["do_calculate_max_time"] = False
+                df["do_update_immunization_params"] = False
+
+                for position, column in enumerate(contagion_columns):
+                    if column == "infected_by":
+                        values = infected_by
+                    else:
+                        values = df[column].to_numpy(copy=True)
+                    values[candidates] = contagion_df[position].to_numpy()
+                    df[column] = values
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[contagion_columns] = contagion_vectorized(
+                    df,
+                    natural_history,
+                    disease_groups,
+                    susceptibility_groups,
+                    kdtree_by_disease_state,
+                    agents_labels_by_disease_state,
+                    candidates,
+                    closed_form
                     )
-            elif execmode == ExecutionModes.dask.value:
-                df_copy = df.copy()
-                df = from_pandas(df, npartitions=npartitions)
-
-                df[["disease_state", "times_infected", "infected_by",
-                    "disease_state_time", "do_calculate_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: contagion_function(
-                        row["agent"],
-                        row["x"],
-                        row["y"],
-                        row["immunization_level"],
-                        row["key"],
-                        row["disease_state"],
-                        row["susceptibility_group"],
-                        row["times_infected"],
-                        row["disease_state_time"],
-                        row["reduction_factor"],
-                        natural_history,
-                        disease_groups,
-                        susceptibility_groups,
-                        kdtree_by_disease_state,
-                        agents_labels_by_disease_state,
-                        df_copy
-                        ),
-                    axis=1,
-                    meta={
-                        0: "str",
-                        1: "int64",
-                        2: "object",
-                        3: "float64",
-                        4: "bool",
-                        5: "bool"
-                    }
-                    )
-                df = df.compute()
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
                     )
 
-            # Call determine_disease_state_max_time function in order
-            # to calculate it for those agents who went through a transition
-            df = cls.determine_disease_state_max_time(
-                df, disease_groups, natural_history, execmode
-                )
+            # Agents whose disease state changed
+            infected = flatnonzero(df["do_calculate_max_time"].to_numpy())
 
-            # Call update_immunization_params function in order to update them
-            # for those agents who went through a transition
-            df = cls.update_immunization_params(
-                df, natural_history, execmode
-                )
+            if "alertness_trait" in df.columns:
+                # Their key changes, so they need a new alertness trait
+                df["alertness_trait"] = df["alertness_trait"].mask(
+                    df["do_calculate_max_time"]
+                    )
 
-            # Update key column
-            df = cls.generate_key_col(df, execmode)
+            if infected.size != 0:
+                # Only the agents who went through a transition need their
+                # disease state max time, immunization params and key
+                # updated
+                infected_df = df.iloc[infected].copy()
+
+                if execmode == ExecutionModes.dask.value:
+                    # Keep the subset partitioned through the three updates
+                    infected_df = from_pandas(
+                        infected_df,
+                        npartitions=npartitions
+                        )
+
+                # Immunization params need the former key and the max time
+                # needs the key of the new disease state
+                infected_df = cls.update_immunization_params(
+                    infected_df, natural_history, execmode
+                    )
+
+                infected_df = cls.generate_key_col(
+                    infected_df, execmode, natural_history=natural_history
+                    )
+
+                infected_df = cls.determine_disease_state_max_time(
+                    infected_df, disease_groups, natural_history, execmode
+                    )
+
+                if execmode == ExecutionModes.dask.value:
+                    infected_df = infected_df.compute()
+
+                for column in [
+                    "disease_state_time", "disease_state_max_time",
+                    "do_calculate_max_time", "immunization_level",
+                    "immunization_slope", "immunization_time",
+                    "immunization_max_time", "do_update_immunization_params",
+                    "key"
+                ]:
+                    df.loc[infected_df.index, column] = infected_df[column]
+
+            if scheduler is not None \
+                    and execmode in [ExecutionModes.vectorized.value,
+                                     ExecutionModes.numba.value]:
+                # Schedule the expiration of the new disease states
+                scheduler.schedule(
+                    df.index.to_numpy()[infected],
+                    df["disease_state_time"].to_numpy()[infected],
+                    df["disease_state_max_time"].to_numpy()[infected]
+                    )
 
         except Exception as error:
             validation_list = ["agent", "x", "y", "immunization_level",
@@ -2522,6 +4542,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def update_immunization_params(
         cls,
         df: DataFrame,
@@ -2557,52 +4578,84 @@ class AgentDisease:
 
             update_immunization_params_iterative : TODO complete explanation
 
+            update_immunization_params_vectorized : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by update_immunization_params_iterative
+        dtypes = {
+            0: "float64",
+            1: "float64",
+            2: "float64",
+            3: "float64",
+            4: "bool"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 df[["immunization_level", "immunization_slope",
                     "immunization_time", "immunization_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: update_immunization_params_iterative(
-                        row["key"],  # In this case, this key is the old one
-                        row["disease_state"],
-                        row["immunization_level"],
-                        row["immunization_slope"],
-                        row["immunization_time"],  # In scale of days
-                        row["immunization_max_time"],  # In scale of days
-                        row["do_update_immunization_params"],
-                        natural_history
+                    "do_update_immunization_params"]] = apply_rows(
+                    df,
+                    partial(
+                        update_immunization_params_iterative,
+                        natural_history=natural_history
                         ),
-                    axis=1
+                    ["key", "disease_state", "immunization_level",
+                     "immunization_slope", "immunization_time",
+                     "immunization_max_time",
+                     "do_update_immunization_params"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df[["immunization_level", "immunization_slope",
                     "immunization_time", "immunization_max_time",
-                    "do_update_immunization_params"]] = df.apply(
-                    lambda row: update_immunization_params_iterative(
-                        row["key"],  # In this case, this key is the old one
-                        row["disease_state"],
-                        row["immunization_level"],
-                        row["immunization_slope"],
-                        row["immunization_time"],  # In scale of days
-                        row["immunization_max_time"],  # In scale of days
-                        row["do_update_immunization_params"],
+                    "do_update_immunization_params"]] = df.map_partitions(
+                    apply_rows,
+                    partial(
+                        update_immunization_params_iterative,
+                        natural_history=natural_history
+                        ),
+                    ["key", "disease_state", "immunization_level",
+                     "immunization_slope", "immunization_time",
+                     "immunization_max_time",
+                     "do_update_immunization_params"],
+                    dtypes,
+                    meta=dtypes
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["immunization_level", "immunization_slope",
+                    "immunization_time", "immunization_max_time",
+                    "do_update_immunization_params"]] = \
+                    update_immunization_params_vectorized(
+                        df["key"],  # In this case, this key is the old one
+                        df["disease_state"],
+                        df["immunization_level"],
+                        df["immunization_slope"],
+                        df["immunization_time"],  # In scale of days
+                        df["immunization_max_time"],  # In scale of days
+                        df["do_update_immunization_params"],
                         natural_history
+                        )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["immunization_level", "immunization_slope",
+                    "immunization_time", "immunization_max_time",
+                    "do_update_immunization_params"]] = ProcessPool.apply(
+                    df,
+                    partial(
+                        update_immunization_params_iterative,
+                        natural_history=natural_history
                         ),
-                    axis=1,
-                    meta={
-                        0: "float64",
-                        1: "float64",
-                        2: "float64",
-                        3: "float64",
-                        4: "bool"
-                    }
-                    )
-                df = df.compute()
+                    ["key", "disease_state", "immunization_level",
+                     "immunization_slope", "immunization_time",
+                     "immunization_max_time",
+                     "do_update_immunization_params"],
+                    npartitions,
+                    dtypes
+                    )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2620,6 +4673,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def update_immunization_level(
         cls,
         df: DataFrame,
@@ -2656,43 +4710,64 @@ class AgentDisease:
 
             update_immunization_level_iterative : TODO complete explanation
 
+            update_immunization_level_vectorized : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by update_immunization_level_iterative
+        dtypes = {
+            0: "float64",
+            1: "float64",
+            2: "float64",
+            3: "float64"
+        }
+
         try:
             if execmode == ExecutionModes.iterative.value:
                 df[["immunization_level", "immunization_slope",
-                    "immunization_time", "immunization_max_time"]] = df.apply(
-                    lambda row: update_immunization_level_iterative(
-                        dt,  # In scale of days
-                        row["immunization_level"],
-                        row["immunization_slope"],
-                        row["immunization_time"],  # In scale of days
-                        row["immunization_max_time"]  # In scale of days
-                        ),
-                    axis=1
-                    )
+                    "immunization_time", "immunization_max_time"]] = \
+                    apply_rows(
+                        df,
+                        partial(update_immunization_level_iterative, dt),
+                        ["immunization_level", "immunization_slope",
+                         "immunization_time", "immunization_max_time"],
+                        dtypes
+                        )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
                 df[["immunization_level", "immunization_slope",
-                    "immunization_time", "immunization_max_time"]] = df.apply(
-                    lambda row: update_immunization_level_iterative(
+                    "immunization_time", "immunization_max_time"]] = \
+                    df.map_partitions(
+                        apply_rows,
+                        partial(update_immunization_level_iterative, dt),
+                        ["immunization_level", "immunization_slope",
+                         "immunization_time", "immunization_max_time"],
+                        dtypes,
+                        meta=dtypes
+                        )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["immunization_level", "immunization_slope",
+                    "immunization_time", "immunization_max_time"]] = \
+                    update_immunization_level_vectorized(
                         dt,  # In scale of days
-                        row["immunization_level"],
-                        row["immunization_slope"],
-                        row["immunization_time"],  # In scale of days
-                        row["immunization_max_time"]  # In scale of days
-                        ),
-                    axis=1,
-                    meta={
-                        0: "float64",
-                        1: "float64",
-                        2: "float64",
-                        3: "float64",
-                    }
-                    )
-                df = df.compute()
+                        df["immunization_level"],
+                        df["immunization_slope"],
+                        df["immunization_time"],  # In scale of days
+                        df["immunization_max_time"]  # In scale of days
+                        )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["immunization_level", "immunization_slope",
+                    "immunization_time", "immunization_max_time"]] = \
+                    ProcessPool.apply(
+                        df,
+                        partial(update_immunization_level_iterative, dt),
+                        ["immunization_level", "immunization_slope",
+                         "immunization_time", "immunization_max_time"],
+                        npartitions,
+                        dtypes
+                        )
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2709,6 +4784,7 @@ class AgentDisease:
             return df
 
     @classmethod
+    @partitioned_stage
     def update_alertness_state(
         cls,
         df: DataFrame,
@@ -2748,53 +4824,103 @@ class AgentDisease:
 
             alertness_function : TODO complete explanation
 
+            alertness_vectorized : TODO complete explanation
+
+            refill_traits : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
         """
+        # Types of the values returned by alertness_function
+        dtypes = {
+            0: "bool",
+            1: "object"
+        }
+
         try:
+            if "alertness_trait" in df.columns:
+                # Draw the traits of the agents whose key changed
+                if execmode == ExecutionModes.dask.value:
+                    df = df.map_partitions(
+                        refill_traits, "alertness_trait", "key",
+                        natural_history, DistTitles.alertness.value
+                        )
+                else:
+                    df = refill_traits(
+                        df, "alertness_trait", "key",
+                        natural_history, DistTitles.alertness.value
+                        )
+                input_df = df
+            else:
+                input_df = df.assign(alertness_trait=nan)
+
             if execmode == ExecutionModes.iterative.value:
-                df[["is_alert", "alerted_by"]] = df.apply(
-                    lambda row: alertness_function(
-                        row["agent"],
-                        row["key"],
-                        row["x"],
-                        row["y"],
-                        row["is_dead"],
-                        row["vulnerability_group"],
-                        row["disease_state"],
-                        natural_history,
-                        disease_groups,
-                        kdtree_by_disease_state,
-                        agents_labels_by_disease_state,
-                        dead_disease_group
+                df[["is_alert", "alerted_by"]] = apply_rows(
+                    input_df,
+                    partial(
+                        alertness_function,
+                        natural_history=natural_history,
+                        disease_groups=disease_groups,
+                        kdtree_by_disease_state=kdtree_by_disease_state,
+                        agents_labels_by_disease_state=(
+                            agents_labels_by_disease_state
+                            ),
+                        dead_disease_group=dead_disease_group
                         ),
-                    axis=1
+                    ["agent", "key", "x", "y", "is_dead",
+                     "vulnerability_group", "disease_state",
+                     "alertness_trait"],
+                    dtypes
                     )
             elif execmode == ExecutionModes.dask.value:
-                df = from_pandas(df, npartitions=npartitions)
-                df[["is_alert", "alerted_by"]] = df.apply(
-                    lambda row: alertness_function(
-                        row["agent"],
-                        row["key"],
-                        row["x"],
-                        row["y"],
-                        row["is_dead"],
-                        row["vulnerability_group"],
-                        row["disease_state"],
-                        natural_history,
-                        disease_groups,
-                        kdtree_by_disease_state,
-                        agents_labels_by_disease_state,
-                        dead_disease_group
+                df[["is_alert", "alerted_by"]] = input_df.map_partitions(
+                    apply_rows,
+                    partial(
+                        alertness_function,
+                        natural_history=natural_history,
+                        disease_groups=disease_groups,
+                        kdtree_by_disease_state=kdtree_by_disease_state,
+                        agents_labels_by_disease_state=(
+                            agents_labels_by_disease_state
+                            ),
+                        dead_disease_group=dead_disease_group
                         ),
-                    axis=1,
-                    meta={
-                        0: "bool",
-                        1: "object"
-                    }
+                    ["agent", "key", "x", "y", "is_dead",
+                     "vulnerability_group", "disease_state",
+                     "alertness_trait"],
+                    dtypes,
+                    meta=dtypes
+                    )
+            elif execmode in [ExecutionModes.vectorized.value,
+                              ExecutionModes.numba.value]:
+                df[["is_alert", "alerted_by"]] = alertness_vectorized(
+                    df,
+                    natural_history,
+                    disease_groups,
+                    kdtree_by_disease_state,
+                    agents_labels_by_disease_state,
+                    dead_disease_group
+                    )
+            elif execmode == ExecutionModes.multiprocessing.value:
+                df[["is_alert", "alerted_by"]] = ProcessPool.apply(
+                    input_df,
+                    partial(
+                        alertness_function,
+                        natural_history=natural_history,
+                        disease_groups=disease_groups,
+                        kdtree_by_disease_state=kdtree_by_disease_state,
+                        agents_labels_by_disease_state=(
+                            agents_labels_by_disease_state
+                            ),
+                        dead_disease_group=dead_disease_group
+                        ),
+                    ["agent", "key", "x", "y", "is_dead",
+                     "vulnerability_group", "disease_state",
+                     "alertness_trait"],
+                    npartitions,
+                    dtypes
                     )
-                df = df.compute()
             else:
                 raise NotImplementedError(
                     f"`execmode = {execmode}` is still not implemented yet"
@@ -2860,7 +4986,16 @@ class AgentDisease:
             TODO: include some examples
         """
         try:
-            if execmode == ExecutionModes.iterative.value:
+            # Policies are evaluated in the same way for every execmode, only
+            # the isolation of the agents depends on it
+            implemented_execmodes = [
+                ExecutionModes.iterative.value,
+                ExecutionModes.dask.value,
+                ExecutionModes.vectorized.value,
+                ExecutionModes.numba.value,
+                ExecutionModes.multiprocessing.value
+                ]
+            if execmode in implemented_execmodes:
                 # =============================================================
                 # Mobility Restrictions - Tracing Policies
                 # =============================================================
@@ -3185,7 +5320,8 @@ class AgentDisease:
                     mrc_target_groups,
                     beta,
                     mr_adherence_groups,
-                    execmode
+                    execmode,
+                    npartitions
                 )
             else:
                 raise NotImplementedError(
@@ -24,6 +24,8 @@ from typing import Optional, Union
 
 from math import fmod
 from numpy import ndarray, arctan2, cos, sin, pi, sqrt, inf, frompyfunc, array
+from numpy import empty, mod, lexsort, unique, isin, searchsorted
+from numpy.random import random_sample
 from pandas.core.frame import DataFrame, Series
 
 from abmodel.models.population import BoxSize
@@ -31,6 +33,8 @@ from abmodel.models.disease import MobilityGroups, DistTitles
 from abmodel.utils.distributions import Distribution
 from abmodel.utils.utilities import check_field_errors
 from abmodel.utils.utilities import check_field_existance, exception_burner
+from abmodel.utils.execution_modes import ExecutionModes
+from abmodel.utils.jit import jit
 
 
 def move_individual_agent(
@@ -81,6 +85,74 @@ def move_individual_agent(
     return row
 
 
+@jit
+def deviation_angles_numba(
+    relative_angles: ndarray,
+    starts: ndarray
+) -> ndarray:
+    """
+        Compiled version of `AgentMovement.deviation_angle` for many agents
+        at once.
+
+        Parameters
+        ----------
+        relative_angles : ndarray
+            Angles in [0, 2*pi) towards the agents to avoid, sorted by agent
+            and then by angle.
+
+        starts : ndarray
+            Position in `relative_angles` of the first angle of each agent.
+
+        Returns
+        -------
+        new_angles : ndarray
+            For each agent, the angle in the middle of the largest gap
+            between consecutive angles to avoid. Ties are broken at random.
+    """
+    n_groups = starts.size
+    new_angles = empty(n_groups)
+
+    for group in range(n_groups):
+        start = starts[group]
+        end = starts[group + 1] if group + 1 < n_groups \
+            else relative_angles.size
+
+        # Gap after each angle, the last one wraps around the circle
+        max_gap = -1.0
+        ties = 0
+        for k in range(start, end):
+            if k < end - 1:
+                gap = relative_angles[k + 1] - relative_angles[k]
+            else:
+                gap = 2*pi - relative_angles[end - 1] \
+                    + relative_angles[start]
+            if gap > max_gap:
+                max_gap = gap
+                ties = 1
+            elif gap == max_gap:
+                ties += 1
+
+        # Random gap when there are more than one max value
+        chosen = int(random_sample() * ties)
+        for k in range(start, end):
+            if k < end - 1:
+                gap = relative_angles[k + 1] - relative_angles[k]
+            else:
+                gap = 2*pi - relative_angles[end - 1] \
+                    + relative_angles[start]
+            if gap == max_gap:
+                if chosen == 0:
+                    # Standardize angles on the interval [0, 2*pi]
+                    new_angles[group] = mod(
+                        relative_angles[k] + max_gap/2,
+                        2*pi
+                        )
+                    break
+                chosen -= 1
+
+    return new_angles
+
+
 class AgentMovement:
     """
         TODO: Add brief explanation
@@ -871,7 +943,12 @@ class AgentMovement:
         return row
 
     @classmethod
-    def avoid_agents(cls, df: DataFrame, df_to_avoid: DataFrame) -> DataFrame:
+    def avoid_agents(
+        cls,
+        df: DataFrame,
+        df_to_avoid: DataFrame,
+        execmode: ExecutionModes = ExecutionModes.iterative.value
+    ) -> DataFrame:
         """
             TODO: Add brief explanation
 
@@ -879,6 +956,11 @@ class AgentMovement:
             ----------
             TODO
 
+            execmode : ExecutionModes
+                With numba, the largest gap search is done by
+                `deviation_angles_numba` for all the agents at once. Any
+                other mode uses `deviation_angle` on each group.
+
             Returns
             -------
             TODO
@@ -895,6 +977,8 @@ class AgentMovement:
             --------
             deviation_angle : TODO complete explanation
 
+            deviation_angles_numba : TODO complete explanation
+
             replace_velocities : TODO complete explanation
 
             Examples
@@ -902,47 +986,99 @@ class AgentMovement:
             TODO: include some examples
         """
         try:
-            df_copy = df.copy()
-
-            scared_agents = df_copy.loc[df_copy.agent.isin(
-                df_to_avoid["agent"].unique()
-                )][["agent", "x", "y", "vx", "vy"]]
-
-            scary_agents = scared_agents.merge(
-                        df_to_avoid, how="inner", on="agent"
-                        ).merge(
-                    df_copy.rename(
-                        columns={
-                            "agent": "agent_to_avoid",
-                            "x": "x_to_avoid",
-                            "y": "y_to_avoid"
-                            })[["agent_to_avoid", "x_to_avoid", "y_to_avoid"]],
-                    how="inner",
-                    on="agent_to_avoid"
+            if execmode == ExecutionModes.numba.value:
+                positions = df[["agent", "x", "y"]]
+                pairs = df_to_avoid[["agent", "agent_to_avoid"]] \
+                    .dropna() \
+                    .astype({"agent_to_avoid": df["agent"].dtype}) \
+                    .merge(positions, how="inner", on="agent") \
+                    .merge(
+                        positions.rename(
+                            columns={
+                                "agent": "agent_to_avoid",
+                                "x": "x_to_avoid",
+                                "y": "y_to_avoid"
+                                }),
+                        how="inner",
+                        on="agent_to_avoid"
+                        )
+
+                # Standardize angles on the interval [0, 2*pi]
+                relative_angles = mod(
+                    arctan2(
+                        (pairs["y_to_avoid"] - pairs["y"]).to_numpy(),
+                        (pairs["x_to_avoid"] - pairs["x"]).to_numpy()
+                        ),
+                    2*pi
                     )
-            scary_agents["x_relative"] = scary_agents.apply(
-                    lambda row: row.x_to_avoid - row.x, axis=1
+
+                # Sort by agent, then by angle
+                agents = pairs["agent"].to_numpy()
+                sorting = lexsort((relative_angles, agents))
+                scared_agents, starts = unique(
+                    agents[sorting], return_index=True
                     )
 
-            scary_agents["y_relative"] = scary_agents.apply(
-                    lambda row: row.y_to_avoid - row.y, axis=1
+                new_angles = deviation_angles_numba(
+                    relative_angles[sorting],
+                    starts
                     )
 
-            scary_agents["relative_angle"] = cls.vector_angles(
-                scary_agents,
-                ["x_relative", "y_relative"]
-                )
+                df = df.copy()
+                is_scared = isin(df["agent"].to_numpy(), scared_agents)
+                new_angles = new_angles[searchsorted(
+                    scared_agents, df["agent"].to_numpy()[is_scared]
+                    )]
+                vx = df["vx"].to_numpy(dtype=float, copy=True)
+                vy = df["vy"].to_numpy(dtype=float, copy=True)
+                velocity_norm = sqrt(vx[is_scared]**2 + vy[is_scared]**2)
+                vx[is_scared] = velocity_norm * cos(new_angles)
+                vy[is_scared] = velocity_norm * sin(new_angles)
+                df["vx"] = vx
+                df["vy"] = vy
+            else:
+                df_copy = df.copy()
+
+                scared_agents = df_copy.loc[df_copy.agent.isin(
+                    df_to_avoid["agent"].unique()
+                    )][["agent", "x", "y", "vx", "vy"]]
+
+                scary_agents = scared_agents.merge(
+                            df_to_avoid, how="inner", on="agent"
+                            ).merge(
+                        df_copy.rename(
+                            columns={
+                                "agent": "agent_to_avoid",
+                                "x": "x_to_avoid",
+                                "y": "y_to_avoid"
+                                })[["agent_to_avoid", "x_to_avoid",
+                                    "y_to_avoid"]],
+                        how="inner",
+                        on="agent_to_avoid"
+                        )
+                scary_agents["x_relative"] = scary_agents.apply(
+                        lambda row: row.x_to_avoid - row.x, axis=1
+                        )
 
-            scary_agents["relative_angle"] = \
-                scary_agents["relative_angle"].apply(cls.standardize_angle)
+                scary_agents["y_relative"] = scary_agents.apply(
+                        lambda row: row.y_to_avoid - row.y, axis=1
+                        )
 
-            new_angles = scary_agents[["agent", "relative_angle"]] \
-                .groupby("agent").apply(cls.deviation_angle)
+                scary_agents["relative_angle"] = cls.vector_angles(
+                    scary_agents,
+                    ["x_relative", "y_relative"]
+                    )
 
-            df = df.apply(
-                lambda row: cls.replace_velocities(row, new_angles),
-                axis=1
-                )
+                scary_agents["relative_angle"] = \
+                    scary_agents["relative_angle"].apply(cls.standardize_angle)
+
+                new_angles = scary_agents[["agent", "relative_angle"]] \
+                    .groupby("agent").apply(cls.deviation_angle)
+
+                df = df.apply(
+                    lambda row: cls.replace_velocities(row, new_angles),
+                    axis=1
+                    )
         except Exception as error:
             exception_burner([
                 error,
@@ -20,9 +20,10 @@
 # Nicole Rivera (https://github.com/nicolerivera1)
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
-from numpy import array, setdiff1d, concatenate, transpose
+from numpy import array, setdiff1d, concatenate, transpose, ndarray
 # where, full, ndarray, isin, concatenate
 # from numpy.random import choice, random_sample
+from scipy.spatial import KDTree
 from pandas.core.frame import DataFrame
 
 from abmodel.utils.execution_modes import ExecutionModes
@@ -30,6 +31,50 @@ from abmodel.utils.utilities import check_field_existance, exception_burner
 from abmodel.models.disease import DiseaseStates
 
 
+def neighbor_pairs(
+    kdtree: KDTree,
+    other_kdtree: KDTree,
+    radius: float
+) -> tuple[ndarray, ndarray]:
+    """
+        Find every pair of points (i, j) such that the point `i` of `kdtree`
+        and the point `j` of `other_kdtree` are at a distance lower or
+        equal than `radius`.
+
+        Parameters
+        ----------
+        kdtree : KDTree
+            Tree built from the first set of points.
+
+        other_kdtree : KDTree
+            Tree built from the second set of points.
+
+        radius : float
+            Maximum distance between the points of a pair.
+
+        Returns
+        -------
+        i : ndarray
+            Indices of the points in `kdtree`.
+
+        j : ndarray
+            Indices of the points in `other_kdtree`.
+
+        Notes
+        -----
+        Pairs are retrieved all at once using
+        `KDTree.sparse_distance_matrix`, so no python list is built for each
+        single point as it happens with `KDTree.query_ball_point`.
+    """
+    pairs = kdtree.sparse_distance_matrix(
+        other_kdtree,
+        radius,
+        output_type="ndarray"
+        )
+
+    return pairs["i"].astype(int), pairs["j"].astype(int)
+
+
 def trace_neighbors_vectorized(
     df: DataFrame,
     tracing_radius: float,
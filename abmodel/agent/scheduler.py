@@ -0,0 +1,295 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from numpy import array, ceil, concatenate, isnan, nan, where
+from numpy import asarray, ndarray, unique
+from pandas.core.frame import DataFrame
+from pandas import concat
+
+
+class TransitionScheduler:
+    """
+        Time-indexed schedule of the moment in which the current disease
+        state of each agent expires.
+
+        Agents are kept in buckets keyed by the step in which their
+        `disease_state_time` reaches `disease_state_max_time`, so
+        `AgentDisease.disease_state_transition` only has to look at the
+        agents of the bucket that is due instead of scanning the whole
+        population.
+
+        The scheduler also keeps the disease state clock of each agent as
+        it was when it was last written. The clock increases by `dt` in
+        every step, so `disease_state_time` is computed from the number of
+        steps elapsed instead of being rewritten for every agent in every
+        step.
+
+        Agents are identified by the index labels of the population
+        dataframe.
+
+        Attributes
+        ----------
+        dt : float
+            Time increment per step in scale of days.
+
+        step : int
+            Number of buckets popped so far.
+
+        buckets : dict
+            Arrays of agent labels indexed by the step in which they are
+            due.
+
+        clocks : DataFrame
+            `disease_state_time` and `disease_state_max_time` of each agent
+            as they were written, together with the `written` step and the
+            `due_step` of its current entry in `buckets`.
+
+        Methods
+        -------
+        schedule
+        pop_due
+        upcoming
+        times
+        materialize
+        discard
+
+        Notes
+        -----
+        Entries are never removed from `buckets` when an agent is
+        rescheduled, e.g. after a contagion, or discarded. Stale entries are
+        dropped when their bucket is popped because the `due_step` of the
+        agent does not match the bucket any more.
+    """
+    columns = [
+        "disease_state_time", "disease_state_max_time", "written", "due_step"
+        ]
+
+    def __init__(self, dt: float):
+        self.dt = dt
+        self.step = 0
+        self.buckets = {}
+        self.clocks = DataFrame(columns=self.columns, dtype=float)
+
+    def schedule(
+        self,
+        agents: ndarray,
+        disease_state_time: ndarray,
+        disease_state_max_time: ndarray
+    ) -> None:
+        """
+            Store the clocks of the agents, written in the current step, and
+            put each agent in the bucket of the step in which its current
+            disease state expires.
+
+            Parameters
+            ----------
+            agents : ndarray
+                Labels of the agents to schedule.
+
+            disease_state_time : ndarray
+                Time spent by each agent in its current disease state.
+
+            disease_state_max_time : ndarray
+                Time after which each agent leaves its current disease
+                state. Agents with `nan` are not put in any bucket.
+        """
+        agents = asarray(agents)
+        disease_state_time = asarray(disease_state_time, dtype=float)
+        disease_state_max_time = asarray(disease_state_max_time, dtype=float)
+
+        finite = ~isnan(disease_state_max_time)
+
+        # Time is increased by dt before comparing it against max time, so
+        # at least one more step is always needed. The small offset keeps
+        # rounding errors from delaying an agent one step; agents scheduled
+        # too early are rescheduled by pop_due
+        steps_ahead = ceil(
+            (disease_state_max_time - disease_state_time) / self.dt - 1e-9
+            ).clip(min=1)
+        due_step = where(finite, self.step + steps_ahead, nan)
+
+        written = DataFrame(
+            {
+                "disease_state_time": disease_state_time,
+                "disease_state_max_time": disease_state_max_time,
+                "written": float(self.step),
+                "due_step": due_step
+            },
+            index=agents
+            )
+
+        if self.clocks.empty:
+            self.clocks = written
+        else:
+            new_agents = ~written.index.isin(self.clocks.index)
+            self.clocks.loc[written.index[~new_agents]] = \
+                written[~new_agents]
+            if new_agents.any():
+                self.clocks = concat([self.clocks, written[new_agents]])
+
+        scheduled_agents = agents[finite]
+        scheduled_steps = due_step[finite].astype(int)
+        for bucket in unique(scheduled_steps):
+            self.buckets.setdefault(int(bucket), []).append(
+                scheduled_agents[scheduled_steps == bucket]
+                )
+
+    def pop_due(self) -> ndarray:
+        """
+            Advance one step and pop the bucket of the new step.
+
+            Returns
+            -------
+            due : ndarray
+                Sorted labels of the agents whose disease state expired,
+                i.e. whose `disease_state_time`, already increased by `dt`,
+                reached `disease_state_max_time`.
+        """
+        self.step += 1
+        bucket = self.buckets.pop(self.step, [])
+
+        if not bucket:
+            return array([], dtype=self.clocks.index.dtype)
+
+        candidates = unique(concatenate(bucket))
+
+        # Drop stale entries, i.e. agents rescheduled or discarded
+        candidates = candidates[candidates_in(self.clocks, candidates)]
+        candidates = candidates[
+            self.clocks.loc[candidates, "due_step"].to_numpy() == self.step
+            ]
+
+        disease_state_time = self.times(candidates)
+        disease_state_max_time = \
+            self.clocks.loc[candidates, "disease_state_max_time"].to_numpy()
+
+        is_due = disease_state_time >= disease_state_max_time
+
+        # Agents popped before their time are put back in the schedule
+        early = ~is_due
+        self.schedule(
+            candidates[early],
+            disease_state_time[early],
+            disease_state_max_time[early]
+            )
+
+        return candidates[is_due]
+
+    def upcoming(self) -> ndarray:
+        """
+            Labels of the agents that the next `pop_due` may return.
+
+            Returns
+            -------
+            agents : ndarray
+                Labels of the agents of the next bucket. It may include
+                stale entries.
+        """
+        bucket = self.buckets.get(self.step + 1, [])
+
+        if not bucket:
+            return array([], dtype=self.clocks.index.dtype)
+
+        candidates = unique(concatenate(bucket))
+
+        return candidates[candidates_in(self.clocks, candidates)]
+
+    def times(self, agents: ndarray) -> ndarray:
+        """
+            Compute the current `disease_state_time` of some agents.
+
+            Parameters
+            ----------
+            agents : ndarray
+                Labels of the agents.
+
+            Returns
+            -------
+            disease_state_time : ndarray
+                Time written for each agent increased by `dt` for each step
+                elapsed since then.
+        """
+        clocks = self.clocks.loc[agents]
+
+        return clocks["disease_state_time"].to_numpy() \
+            + (self.step - clocks["written"].to_numpy())*self.dt
+
+    def materialize(
+        self,
+        df: DataFrame,
+        labels: ndarray = None
+    ) -> DataFrame:
+        """
+            Write the current `disease_state_time` into `df`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe.
+
+            labels : ndarray, optional
+                Index labels of the agents to write. All the agents of `df`
+                if not given.
+
+            Returns
+            -------
+            df : DataFrame
+                Population dataframe with `disease_state_time` of `labels`
+                up to date.
+        """
+        if labels is None:
+            df["disease_state_time"] = self.times(df.index.to_numpy())
+        elif len(labels) != 0:
+            df.loc[labels, "disease_state_time"] = self.times(labels)
+
+        return df
+
+    def discard(self, labels: ndarray) -> None:
+        """
+            Forget agents, e.g. once they are dead.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents to forget.
+        """
+        self.clocks = self.clocks.drop(index=labels)
+
+
+def candidates_in(clocks: DataFrame, candidates: ndarray) -> ndarray:
+    """
+        Mask of the `candidates` that still have a clock.
+
+        Parameters
+        ----------
+        clocks : DataFrame
+            Clocks indexed by agent label.
+
+        candidates : ndarray
+            Agent labels.
+
+        Returns
+        -------
+        mask : ndarray
+            Whether each candidate has a clock.
+    """
+    return clocks.index.get_indexer(candidates) >= 0
@@ -26,10 +26,13 @@ from dataclasses import dataclass, field
 from copy import deepcopy
 
 from munch import Munch
+from numpy import ndarray, full, nan
+from pandas import Categorical
 from pydantic import BaseModel
 
 from abmodel.utils import Distribution
 from abmodel.utils import init_distribution
+from abmodel.utils import group_codes
 
 
 # ============================================================================
@@ -155,6 +158,12 @@ class SimpleDistGroups:
             Each key of this dictionary corresponds to a single
             group name.
 
+        Methods
+        -------
+        sample_by_group
+            Draw one sample for each element from the distribution of its
+            group.
+
         See Also
         --------
         DistributionGroup : Single Distribution group
@@ -180,6 +189,54 @@ class SimpleDistGroups:
             for single_group in self.group_info
         }
 
+    def sample_by_group(
+        self,
+        labels: Union[ndarray, Categorical],
+        dist_title: str
+    ) -> ndarray:
+        """
+            Draw one sample for each element of `labels` from the
+            distribution `dist_title` of the group it belongs to.
+
+            Parameters
+            ----------
+            labels : ndarray or Categorical
+                Group label of each element, e.g. the `key` column or the
+                codes of a categorical column.
+
+            dist_title : str
+                Title of the distribution to sample from.
+
+            Returns
+            -------
+            samples : ndarray
+                Array of floats with the samples. It is `nan` for those
+                elements whose group distribution has `dist_type` None.
+
+            Notes
+            -----
+            Only one call to `Distribution.sample` is done for each distinct
+            label, asking for as many samples as elements share that label,
+            and the samples are scattered back to the elements.
+        """
+        samples = full(len(labels), nan)
+
+        if len(labels) == 0:
+            return samples
+
+        unique_labels, inverse = group_codes(labels)
+
+        for position, label in enumerate(unique_labels):
+            distribution = self.items[label].dist[dist_title]
+
+            if distribution.dist_type is None:
+                continue
+
+            mask = inverse == position
+            samples[mask] = distribution.sample(size=int(mask.sum()))
+
+        return samples
+
     def single_dist_title_validation(self, expected_dist_title: str):
         """
             Validates `dist_title` to be equal to
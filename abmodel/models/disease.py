@@ -24,9 +24,14 @@ from enum import Enum
 from dataclasses import dataclass
 from copy import deepcopy
 
+from numpy import where
+from pandas import Categorical
+from pandas.core.series import Series
+
 from abmodel.models import SimpleDistGroups
 from abmodel.models import ComplexDistGroups
 from abmodel.utils import std_str_join_cols
+from abmodel.utils import AliasTable
 
 
 # ============================================================================
@@ -360,6 +365,17 @@ class NaturalHistory(ComplexDistGroups):
         ----------
         TODO
 
+        vulnerability_groups : list
+            Vulnerability groups, in order of appearance in `group_info`.
+
+        disease_groups : list
+            Disease groups, in order of appearance in `group_info`.
+
+        keys : list
+            Every (vulnerability group, disease group) key. The key of the
+            vulnerability group `v` and the disease group `s` is at position
+            `v * len(disease_groups) + s`.
+
         See Also
         --------
         TODO
@@ -382,9 +398,17 @@ class NaturalHistory(ComplexDistGroups):
         ]
 
         self.transitions = {}
+        self.vulnerability_groups = []
+        self.disease_groups = []
         for single_group in self.group_info:
             vulnerability_group = single_group.pop("vulnerability_group")
             disease_group = single_group.pop("disease_group")
+
+            if str(vulnerability_group) not in self.vulnerability_groups:
+                self.vulnerability_groups.append(str(vulnerability_group))
+            if str(disease_group) not in self.disease_groups:
+                self.disease_groups.append(str(disease_group))
+
             single_group["name"] = std_str_join_cols(
                 str(vulnerability_group), str(disease_group)
                 )
@@ -400,3 +424,84 @@ class NaturalHistory(ComplexDistGroups):
             self.items[key].transitions = deepcopy(self.transitions[key].items)
 
         self.__delattr__("transitions")
+
+        # Samplers of the next disease state of each key, built on demand
+        self.transition_samplers = {}
+
+        self.keys = [
+            std_str_join_cols(vulnerability_group, disease_group)
+            for vulnerability_group in self.vulnerability_groups
+            for disease_group in self.disease_groups
+            ]
+
+    def transition_sampler(self, key: str) -> AliasTable:
+        """
+            Get the sampler of the disease states that the agents with
+            `key` can transition to. It is built the first time it is
+            requested and reused afterwards.
+
+            Parameters
+            ----------
+            key : str
+                Key (vulnerability group, disease group).
+
+            Returns
+            -------
+            sampler : AliasTable
+                Sampler of the disease states weighted by the probability
+                of each transition.
+        """
+        if key not in self.transition_samplers:
+            transitions = self.items[key].transitions
+            self.transition_samplers[key] = AliasTable(
+                list(transitions.keys()),
+                [
+                    transitions[transition].probability
+                    for transition in transitions.keys()
+                    ]
+                )
+
+        return self.transition_samplers[key]
+
+    def key_categorical(
+        self,
+        vulnerability_group: Series,
+        disease_state: Series
+    ) -> Categorical:
+        """
+            Build the keys of the agents as a categorical whose categories
+            are `keys`.
+
+            Parameters
+            ----------
+            vulnerability_group : Series
+                Vulnerability group of each agent.
+
+            disease_state : Series
+                Disease state of each agent.
+
+            Returns
+            -------
+            key : Categorical
+                Key of each agent. Its integer code is
+                `vulnerability_code * len(disease_groups) + state_code`,
+                and its value is the usual string key. Agents whose
+                vulnerability group or disease state are not in the natural
+                history get a missing value.
+        """
+        vulnerability_codes = Categorical(
+            vulnerability_group.astype(str),
+            categories=self.vulnerability_groups
+            ).codes
+        disease_codes = Categorical(
+            disease_state.astype(str),
+            categories=self.disease_groups
+            ).codes
+
+        codes = where(
+            (vulnerability_codes < 0) | (disease_codes < 0),
+            -1,
+            vulnerability_codes * len(self.disease_groups) + disease_codes
+            )
+
+        return Categorical.from_codes(codes, categories=self.keys)
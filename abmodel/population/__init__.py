@@ -20,8 +20,14 @@
 # Nicole Rivera (https://github.com/nicolerivera1)
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
+from .active_sets import ActiveSets
+from .hospital import Hospital
+from .lazy_timers import ImmunizationTimer
 from .population import Population
 
 __all__ = [
+    "ActiveSets",
+    "Hospital",
+    "ImmunizationTimer",
     "Population",
     ]
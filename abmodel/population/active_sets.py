@@ -0,0 +1,200 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from typing import Optional
+
+from numpy import array, isin, ndarray
+from pandas.core.frame import DataFrame
+
+from abmodel.models import DiseaseStates
+from abmodel.models import DistTitles
+from abmodel.utils import Distribution
+
+
+def has_probability(distribution: Optional[Distribution]) -> bool:
+    """
+        Whether a probability distribution can yield a non zero
+        probability.
+
+        Parameters
+        ----------
+        distribution : Distribution, optional
+            Probability distribution of a disease state.
+
+        Returns
+        -------
+        has_probability : bool
+            False if the distribution is missing, has no type or is the
+            constant zero, True otherwise.
+    """
+    if distribution is None or distribution.dist_type is None:
+        return False
+    if distribution.dist_type == "constant":
+        return distribution.constant != 0
+    return True
+
+
+class ActiveSets:
+    """
+        Index labels of the agents that can be changed by the diagnosis,
+        isolation and hospitalization stages.
+
+        Sets are updated incrementally: after a stage runs, or after the
+        disease state of some agents changes, only the rows of those agents
+        are checked again.
+
+        Attributes
+        ----------
+        infected_states : list
+            Disease states whose agents are infected and alive.
+
+        hospitalizable_states : list
+            Disease states with hospitalization or ICU probability.
+
+        sets : dict
+            Sets of index labels keyed by category: `infected`, `diagnosed`,
+            `isolated`, `hospitalized` and `hospitalizable`.
+
+        Methods
+        -------
+        update
+        discard
+        labels
+        verify
+    """
+    categories = [
+        "infected", "diagnosed", "isolated", "hospitalized", "hospitalizable"
+        ]
+
+    def __init__(self, disease_groups: DiseaseStates):
+        self.infected_states = [
+            disease_state
+            for disease_state, item in disease_groups.items.items()
+            if item.is_infected and not item.is_dead
+            ]
+
+        self.hospitalizable_states = [
+            disease_state
+            for disease_state, item in disease_groups.items.items()
+            if has_probability(item.dist.get(DistTitles.hospitalization.value))
+            or has_probability(item.dist.get(DistTitles.icu_prob.value))
+            ]
+
+        self.sets = {category: set() for category in self.categories}
+
+    def membership(self, df: DataFrame) -> dict:
+        """
+            Compute the categories of every agent of `df`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe or a subset of it.
+
+            Returns
+            -------
+            membership : dict
+                Boolean arrays aligned with `df` keyed by category.
+        """
+        disease_state = df["disease_state"].to_numpy()
+        is_dead = df["is_dead"].to_numpy(dtype=bool)
+
+        return {
+            "infected": isin(disease_state, self.infected_states) & ~is_dead,
+            "diagnosed": df["is_diagnosed"].to_numpy(dtype=bool),
+            "isolated": df["is_isolated"].to_numpy(dtype=bool),
+            "hospitalized": df["is_hospitalized"].to_numpy(dtype=bool),
+            "hospitalizable": isin(disease_state, self.hospitalizable_states)
+            }
+
+    def update(self, df: DataFrame) -> None:
+        """
+            Check again the categories of the agents of `df`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Rows of the agents that may have changed.
+        """
+        labels = df.index.to_numpy()
+
+        for category, mask in self.membership(df).items():
+            self.sets[category].difference_update(labels.tolist())
+            self.sets[category].update(labels[mask].tolist())
+
+    def discard(self, labels: ndarray) -> None:
+        """
+            Remove agents from every set, e.g. once they are dead.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents to remove.
+        """
+        for category in self.categories:
+            self.sets[category].difference_update(labels.tolist())
+
+    def labels(self, *categories: str) -> ndarray:
+        """
+            Sorted index labels of the agents in any of `categories`.
+
+            Parameters
+            ----------
+            categories : str
+                Categories to join.
+
+            Returns
+            -------
+            labels : ndarray
+                Sorted index labels.
+        """
+        union = set().union(*[self.sets[category] for category in categories])
+
+        return array(sorted(union), dtype=int)
+
+    def verify(self, df: DataFrame) -> None:
+        """
+            Compare the sets against a full recompute from `df`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Whole population dataframe.
+
+            Raises
+            ------
+            ValueError
+                If any set differs from the recomputed one.
+        """
+        labels = df.index.to_numpy()
+
+        wrong_categories = [
+            category
+            for category, mask in self.membership(df).items()
+            if self.sets[category] != set(labels[mask].tolist())
+            ]
+
+        if wrong_categories:
+            raise ValueError(
+                "Active sets differ from a full recompute for categories: "
+                f"{wrong_categories}"
+                )
@@ -0,0 +1,220 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from numpy import ndarray
+from pandas.core.frame import DataFrame
+
+from abmodel.utils import ExecutionModes
+from abmodel.models import DiseaseStates
+from abmodel.models import HealthSystem
+from abmodel.agent.disease import hospitalization_dice
+
+
+class Hospital:
+    """
+        Hospital and ICU of the population, whose patients and occupancy
+        are kept across steps.
+
+        Every step, the patients and the agents that can be hospitalized
+        throw the dice of `hospitalization_dice` as in
+        `hospitalization_vectorized`, but the places left for the triage
+        are taken from the occupancy counters and only the agents that were
+        admitted, discharged or died because of the overload are returned.
+
+        Attributes
+        ----------
+        health_system : HealthSystem
+            Hospital and ICU capacities.
+
+        disease_groups : DiseaseStates
+            Disease states with their hospitalization and ICU
+            probabilities.
+
+        dead_disease_group : str
+            Disease state of the agents that died.
+
+        alpha : float
+            Reduction factor of spread probability due to hospitalization.
+
+        execmode : ExecutionModes
+            With numba, the triage is done by `capacity_triage_numba`.
+
+        patients : set
+            Index labels of the hospitalized agents, including those in
+            ICU.
+
+        ICU_patients : set
+            Index labels of the agents in ICU.
+
+        Methods
+        -------
+        admit
+        discard
+        evolve
+    """
+    columns = [
+        "is_hospitalized", "is_in_ICU", "disease_state", "is_dead",
+        "reduction_factor"
+        ]
+
+    def __init__(
+        self,
+        health_system: HealthSystem,
+        disease_groups: DiseaseStates,
+        dead_disease_group: str,
+        alpha: float,
+        execmode: ExecutionModes = ExecutionModes.vectorized.value
+    ):
+        self.health_system = health_system
+        self.disease_groups = disease_groups
+        self.dead_disease_group = dead_disease_group
+        self.alpha = alpha
+        self.execmode = execmode
+        self.patients = set()
+        self.ICU_patients = set()
+
+    @property
+    def occupancy(self) -> int:
+        """Number of hospitalized agents, including those in ICU."""
+        return len(self.patients)
+
+    @property
+    def ICU_occupancy(self) -> int:
+        """Number of agents in ICU."""
+        return len(self.ICU_patients)
+
+    def admit(self, df: DataFrame) -> None:
+        """
+            Take the patients of `df` as they are, e.g. once the
+            population is initialized.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe.
+        """
+        labels = df.index.to_numpy()
+
+        self.patients.update(
+            labels[df["is_hospitalized"].to_numpy(dtype=bool)].tolist()
+            )
+        self.ICU_patients.update(
+            labels[df["is_in_ICU"].to_numpy(dtype=bool)].tolist()
+            )
+
+    def discard(self, labels: ndarray) -> None:
+        """
+            Remove agents from the hospital, e.g. once they are dead.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents to remove.
+        """
+        self.patients.difference_update(labels.tolist())
+        self.ICU_patients.difference_update(labels.tolist())
+
+    def evolve(self, df: DataFrame) -> DataFrame:
+        """
+            Update the hospitalization and ICU status of the patients and
+            of the agents that can be hospitalized.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Rows of every patient and of the agents that can be
+                hospitalized, with the columns in `Hospital.columns`.
+
+            Returns
+            -------
+            changed_df : DataFrame
+                Rows of `df` whose columns in `Hospital.columns` changed,
+                i.e. those of the agents admitted, discharged or dead
+                because of the overload.
+
+            Notes
+            -----
+            Occupancy counters are passed to `hospitalization_dice`, so the
+            patients outside `df` keep their places and nobody is counted
+            again.
+
+            See Also
+            --------
+            hospitalization_vectorized : Same update over the whole
+            population.
+
+            hospitalization_dice : Dice and triage of the agents in `df`.
+        """
+        labels = df.index.to_numpy()
+
+        former_is_hospitalized = df["is_hospitalized"].to_numpy(dtype=bool)
+        former_is_in_ICU = df["is_in_ICU"].to_numpy(dtype=bool)
+        disease_states = df["disease_state"].to_numpy(dtype=object, copy=True)
+        is_dead = df["is_dead"].to_numpy(dtype=bool, copy=True)
+
+        is_hospitalized, is_in_ICU = hospitalization_dice(
+            former_is_hospitalized,
+            former_is_in_ICU,
+            disease_states,
+            is_dead,
+            self.dead_disease_group,
+            self.disease_groups,
+            self.health_system,
+            occupancy=self.occupancy,
+            ICU_occupancy=self.ICU_occupancy,
+            execmode=self.execmode
+            )
+
+        # Keep only admissions, discharges and deaths
+        new_hospitalized = is_hospitalized & ~former_is_hospitalized
+        discharged = ~is_hospitalized & former_is_hospitalized
+        has_changed = new_hospitalized | discharged \
+            | (is_in_ICU != former_is_in_ICU) \
+            | (is_dead != df["is_dead"].to_numpy(dtype=bool))
+
+        self.patients.difference_update(labels[discharged].tolist())
+        self.patients.update(labels[new_hospitalized].tolist())
+        self.ICU_patients.difference_update(
+            labels[former_is_in_ICU & ~is_in_ICU].tolist()
+            )
+        self.ICU_patients.update(
+            labels[is_in_ICU & ~former_is_in_ICU].tolist()
+            )
+
+        reduction_factor = df["reduction_factor"].to_numpy(
+            dtype=float, copy=True
+            )
+        reduction_factor[new_hospitalized] = \
+            reduction_factor[new_hospitalized]*self.alpha
+        reduction_factor[discharged] = \
+            reduction_factor[discharged]/self.alpha
+
+        return DataFrame(
+            {
+                "is_hospitalized": is_hospitalized[has_changed],
+                "is_in_ICU": is_in_ICU[has_changed],
+                "disease_state": disease_states[has_changed],
+                "is_dead": is_dead[has_changed],
+                "reduction_factor": reduction_factor[has_changed]
+            },
+            index=df.index[has_changed]
+            )
@@ -0,0 +1,179 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from numpy import nan, ndarray, where
+from pandas.core.frame import DataFrame
+
+
+class ImmunizationTimer:
+    """
+        Immunization clocks of the population, stored as the values they
+        had in the step in which they were last written.
+
+        `AgentDisease.update_immunization_level` decays the immunization
+        level linearly and increases the immunization time by `dt` in every
+        step until the immunization time reaches its max time. Both are
+        affine functions of the number of steps elapsed, so instead of
+        rewriting the immunization columns of every agent in every step,
+        the timer only counts steps and the columns are computed when they
+        are read.
+
+        Attributes
+        ----------
+        dt : float
+            Time increment per step in scale of days.
+
+        ticks : int
+            Number of steps elapsed so far.
+
+        state : DataFrame
+            Immunization columns of each agent as they were written,
+            together with the `tick` in which they were written.
+
+        Methods
+        -------
+        absorb
+        tick
+        values
+        materialize
+        discard
+    """
+    columns = [
+        "immunization_level", "immunization_slope", "immunization_time",
+        "immunization_max_time"
+        ]
+
+    def __init__(self, dt: float):
+        self.dt = dt
+        self.ticks = 0
+        self.state = DataFrame(columns=self.columns + ["tick"], dtype=float)
+
+    def absorb(self, df: DataFrame) -> None:
+        """
+            Store the immunization columns of the agents of `df`, which
+            must be up to date.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Rows of the agents whose immunization columns were written.
+        """
+        written = df[self.columns].astype(float).assign(tick=self.ticks)
+
+        if self.state.empty:
+            self.state = written
+        else:
+            self.state.loc[written.index] = written
+
+    def tick(self) -> None:
+        """
+            Advance one step, i.e. what `update_immunization_level` does to
+            every agent.
+        """
+        self.ticks += 1
+
+    def values(self, labels: ndarray) -> DataFrame:
+        """
+            Compute the current immunization columns of some agents.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents.
+
+            Returns
+            -------
+            values : DataFrame
+                Immunization columns indexed by `labels`.
+
+            Notes
+            -----
+            An agent written `j` steps ago with immunization time `t` and
+            max time `T` keeps decaying while `t + (j - 1)*dt < T`, so its
+            immunization level is `level + slope*j*dt` and its immunization
+            time is `t + j*dt`. Otherwise (NaN included) its immunization
+            expired: the level is zero and the other columns are NaN.
+        """
+        state = self.state.loc[labels]
+        level = state["immunization_level"].to_numpy()
+        slope = state["immunization_slope"].to_numpy()
+        time = state["immunization_time"].to_numpy()
+        max_time = state["immunization_max_time"].to_numpy()
+        elapsed = (self.ticks - state["tick"].to_numpy())*self.dt
+
+        is_written = elapsed == 0
+        expired = ~is_written & ~(time + elapsed - self.dt < max_time)
+
+        return DataFrame(
+            {
+                "immunization_level": where(
+                    expired,
+                    0.0,
+                    where(is_written, level, level + slope*elapsed)
+                    ),
+                "immunization_slope": where(expired, nan, slope),
+                "immunization_time": where(expired, nan, time + elapsed),
+                "immunization_max_time": where(expired, nan, max_time)
+            },
+            index=state.index
+            )
+
+    def materialize(
+        self,
+        df: DataFrame,
+        labels: ndarray = None
+    ) -> DataFrame:
+        """
+            Write the current immunization columns into `df`.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe.
+
+            labels : ndarray, optional
+                Index labels of the agents to write. All the agents of `df`
+                if not given.
+
+            Returns
+            -------
+            df : DataFrame
+                Population dataframe with the immunization columns of
+                `labels` up to date.
+        """
+        if labels is None:
+            df[self.columns] = self.values(df.index.to_numpy())
+        elif len(labels) != 0:
+            df.loc[labels, self.columns] = self.values(labels)
+
+        return df
+
+    def discard(self, labels: ndarray) -> None:
+        """
+            Forget agents, e.g. once they are dead.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents to forget.
+        """
+        self.state = self.state.drop(index=labels)
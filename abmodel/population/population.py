@@ -20,17 +20,22 @@
 # Nicole Rivera (https://github.com/nicolerivera1)
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
+import logging
 from typing import Optional
 
 from numpy import array, nan_to_num, inf, maximum, floor, setdiff1d, isin, pi
+from numpy import ndarray, int64
+from numpy.random import randint
 from scipy.spatial import KDTree
 from pandas.core.frame import DataFrame
 from pandas import concat
+from dask.dataframe import from_pandas
 
 from abmodel.utils import Distribution
 from abmodel.utils import ExecutionModes
 from abmodel.utils import EvolutionModes
 from abmodel.utils import timedelta_to_days
+from abmodel.utils import seed_jit
 from abmodel.models import DistTitles
 from abmodel.models import Configutarion
 from abmodel.models import HealthSystem
@@ -48,7 +53,14 @@ from abmodel.models import MRAdherenceGroups
 from abmodel.agent import AgentMovement
 from abmodel.agent import AgentDisease
 from abmodel.agent import AgentNeighbors
+from abmodel.agent import TransitionScheduler
+from .active_sets import ActiveSets, has_probability
+from .hospital import Hospital
 from .initial_arrangement import InitialArrangement
+from .lazy_timers import ImmunizationTimer
+
+
+logger = logging.getLogger(__name__)
 
 
 class Population:
@@ -83,7 +95,8 @@ class Population:
         mr_adherence_groups: Optional[MRAdherenceGroups] = None,
         execmode: ExecutionModes = ExecutionModes.iterative.value,
         evolmode: EvolutionModes = EvolutionModes.steps.value,
-        npartitions: Optional[int] = 1
+        npartitions: Optional[int] = 1,
+        debug: bool = False
     ) -> None:
         """
             Constructor of Population class.
@@ -100,6 +113,8 @@ class Population:
 
             choose_tracing_radius : TODO complete explanation
 
+            plan_step : TODO complete explanation
+
             Examples
             --------
             TODO: include some examples
@@ -124,6 +139,7 @@ class Population:
         self.execmode = execmode
         self.evolmode = evolmode,
         self.npartitions = npartitions 
+        self.debug = debug
 
         # Required columns
         self.__req_cols_dict = {
@@ -144,6 +160,7 @@ class Population:
         # Setup internal variables
         self.__get_disease_groups_alive()
         self.__choose_tracing_radius()
+        self.__plan_step()
 
         # =====================================================================
         # Initialize population dataframe
@@ -169,6 +186,10 @@ class Population:
             --------
             TODO
         """
+        # =====================================================================
+        # Compiled kernels follow numpy's random state
+        self.__seed_kernels()
+
         # =====================================================================
         # Init population dataframe __df
         self.__df = DataFrame({
@@ -233,6 +254,55 @@ class Population:
             npartitions=self.npartitions
             )
 
+        # =====================================================================
+        # Draw per agent traits
+        self.__df = AgentDisease.init_traits(
+            df=self.__df,
+            susceptibility_groups=self.susceptibility_groups,
+            natural_history=self.natural_history
+            )
+
+        # =====================================================================
+        # Schedule disease states expiration so only due agents are checked
+        # by disease_state_transition
+        self.__transition_scheduler = None
+        if self.execmode in [ExecutionModes.vectorized.value,
+                             ExecutionModes.numba.value]:
+            self.__transition_scheduler = TransitionScheduler(self.dt)
+            self.__transition_scheduler.schedule(
+                self.__df.index.to_numpy(),
+                self.__df["disease_state_time"].to_numpy(),
+                self.__df["disease_state_max_time"].to_numpy()
+                )
+
+        # =====================================================================
+        # Track the agents that diagnosis, isolation and hospitalization can
+        # change
+        self.__active_sets = ActiveSets(self.disease_groups)
+        self.__active_sets.update(self.__df)
+
+        # =====================================================================
+        # Keep hospital and ICU patients across steps
+        self.__hospital = Hospital(
+            self.health_system,
+            self.disease_groups,
+            self.dead_disease_group,
+            self.configuration.alpha,
+            self.execmode
+            )
+        self.__hospital.admit(self.__df)
+
+        # =====================================================================
+        # Immunization decays linearly, so its columns are only computed when
+        # they are read instead of in every step
+        self.__immunization_timer = None
+        if "update_immunization_level" not in self.skipped_stages:
+            self.__df = self.__df.astype(
+                {column: float for column in ImmunizationTimer.columns}
+                )
+            self.__immunization_timer = ImmunizationTimer(self.dt)
+            self.__immunization_timer.absorb(self.__df)
+
         # =====================================================================
         # Initialize __accumulated_df
         if self.evolmode == EvolutionModes.cumulative.value:
@@ -279,6 +349,9 @@ class Population:
             --------
             TODO
         """
+        self.__materialize_immunization()
+        self.__materialize_disease_state_time()
+
         return self.__df
 
     def get_accumulated_population_df(self):
@@ -386,11 +459,21 @@ class Population:
             self.__evolve_single_step()
 
             if self.evolmode == EvolutionModes.cumulative.value:
+                self.__materialize_immunization()
+                self.__materialize_disease_state_time()
                 self.__accumulated_df = concat(
                     [self.__accumulated_df, self.__df],
                     ignore_index=True
                     )
 
+    def __seed_kernels(self) -> None:
+        """
+            Seed the generator of the compiled kernels from numpy's random
+            state, so numba runs are reproduced by `numpy.random.seed`.
+        """
+        if self.execmode == ExecutionModes.numba.value:
+            seed_jit(randint(0, 2**32, dtype=int64))
+
     def __remove_dead_agents(self):
         """
             TODO: Add brief explanation
@@ -407,9 +490,17 @@ class Population:
             --------
             TODO: include some examples
         """
-        self.__df = self.__df[
-            ~self.__df[["is_dead"]].any(axis="columns")
-            ]
+        is_dead = self.__df[["is_dead"]].any(axis="columns")
+
+        dead_labels = self.__df.index[is_dead].to_numpy()
+
+        self.__active_sets.discard(dead_labels)
+        self.__hospital.discard(dead_labels)
+        if self.__immunization_timer is not None:
+            self.__immunization_timer.discard(dead_labels)
+        if self.__transition_scheduler is not None:
+            self.__transition_scheduler.discard(dead_labels)
+        self.__df = self.__df[~is_dead]
 
     def __evolve_single_step(self):
         """
@@ -427,10 +518,15 @@ class Population:
             --------
             TODO: include some examples
         """
+        # =====================================================================
+        # Compiled kernels follow numpy's random state
+        self.__seed_kernels()
+
         # =====================================================================
         # Remove dead agents before evolving population dataframe
         self.__remove_dead_agents()
         former_df = self.__df.copy()
+        former_indexes = self.__active_sets.labels("isolated", "hospitalized")
 
         # =====================================================================
         # Evolve step
@@ -456,52 +552,105 @@ class Population:
 
         # =====================================================================
         # Update population states by means of state transition
+        # Agents that go through a transition update their immunization
+        # params, so those must be up to date
+        if self.__transition_scheduler is None:
+            due = self.__df["disease_state_time"].to_numpy() + self.dt \
+                >= self.__df["disease_state_max_time"].to_numpy()
+            due_labels = self.__df.index[due].to_numpy()
+        else:
+            due_labels = self.__transition_scheduler.upcoming()
+        self.__materialize_immunization(due_labels)
+
         self.__df = AgentDisease.disease_state_transition(
             df=self.__df,
             dt=self.dt,
             disease_groups=self.disease_groups,
             natural_history=self.natural_history,
             execmode=self.execmode,
-            npartitions=self.npartitions
+            npartitions=self.npartitions,
+            scheduler=self.__transition_scheduler
             )
 
+        self.__absorb_immunization(due_labels)
+
         # =====================================================================
-        # Update Hospitalization and ICU status
-        self.__df = AgentDisease.to_hospitalize_agents(
-            df=self.__df,
-            dead_disease_group=self.dead_disease_group,
-            alpha=self.configuration.alpha,
-            disease_groups=self.disease_groups,
-            health_system=self.health_system,
-            execmode=ExecutionModes.vectorized.value
-            )
+        # Update active sets with the agents whose disease state changed
+        has_changed = self.__df["disease_state"].to_numpy() \
+            != former_df["disease_state"].to_numpy()
+
+        self.__active_sets.update(self.__df[has_changed])
 
         # =====================================================================
-        # Update diagnosis status
-        self.__df = AgentDisease.to_diagnose_agents(
-            df=self.__df,
-            disease_groups=self.disease_groups,
-            execmode=self.execmode,
-            npartitions=self.npartitions
-            )
+        # Update Hospitalization and ICU status
+        # Only hospitalized agents and those whose disease state has
+        # hospitalization or ICU probability can change, and only those
+        # admitted, discharged or dead are written back
+        labels = self.__active_sets.labels("hospitalized", "hospitalizable")
+
+        if len(labels) != 0:
+            changed_df = self.__hospital.evolve(
+                self.__df.loc[labels, Hospital.columns]
+                )
+            self.__update_subset(changed_df, Hospital.columns)
 
         # =====================================================================
-        # Update isolation status
-        self.__df = AgentDisease.to_isolate_agents(
-            df=self.__df,
-            dt=self.dt,
-            beta=self.configuration.beta,
-            disease_groups=self.disease_groups,
-            isolation_adherence_groups=self.isolation_adherence_groups,
-            execmode=self.execmode,
-            npartitions=self.npartitions
-            )
+        # Only infected, diagnosed and isolated agents can change their
+        # diagnosis or isolation status
+        do_diagnose = "to_diagnose_agents" not in self.skipped_stages
+        do_isolate = "to_isolate_agents" not in self.skipped_stages
+        labels = self.__active_sets.labels("infected", "diagnosed", "isolated")
+
+        if (do_diagnose or do_isolate) and len(labels) != 0:
+            subset_df = self.__df.loc[labels].copy()
+
+            # In dask mode the subset stays partitioned through diagnosis
+            # and isolation, and it is computed once afterwards
+            if self.execmode == ExecutionModes.dask.value:
+                subset_df = from_pandas(
+                    subset_df, npartitions=self.npartitions
+                    )
+
+            # =================================================================
+            # Update diagnosis status
+            if do_diagnose:
+                subset_df = AgentDisease.to_diagnose_agents(
+                    df=subset_df,
+                    disease_groups=self.disease_groups,
+                    execmode=self.execmode,
+                    npartitions=self.npartitions
+                    )
+
+            # =================================================================
+            # Update isolation status
+            if do_isolate:
+                subset_df = AgentDisease.to_isolate_agents(
+                    df=subset_df,
+                    dt=self.dt,
+                    beta=self.configuration.beta,
+                    disease_groups=self.disease_groups,
+                    isolation_adherence_groups=self
+                    .isolation_adherence_groups,
+                    execmode=self.execmode,
+                    npartitions=self.npartitions
+                    )
+
+            if self.execmode == ExecutionModes.dask.value:
+                subset_df = subset_df.compute()
+
+            self.__update_subset(
+                subset_df,
+                ["is_diagnosed", "is_isolated", "isolation_time",
+                 "isolation_max_time", "adheres_to_isolation",
+                 "reduction_factor"]
+                )
+
+        if self.debug:
+            self.__active_sets.verify(self.__df)
 
         # =====================================================================
         # Stop isolated and hospitalized agents
-        indexes = self.__df.query(
-            "is_isolated == True | is_hospitalized == True"
-            ).index.values
+        indexes = self.__active_sets.labels("isolated", "hospitalized")
 
         if len(indexes) != 0:
             self.__df = AgentMovement.stop_agents(self.__df, indexes)
@@ -509,10 +658,6 @@ class Population:
         # =====================================================================
         # Initialize velocities for formerly isolated and formerly hospitalized
         # agents
-        former_indexes = former_df.query(
-            "is_isolated == True | is_hospitalized == True"
-            ).index.values
-
         mask = isin(former_indexes, indexes, invert=True)
         should_init_indexes = former_indexes[mask]
 
@@ -552,19 +697,38 @@ class Population:
 
         # =====================================================================
         # Update alertness states for avoiding avoidable agents
-        self.__df = AgentDisease.update_alertness_state(
-            df=self.__df,
-            kdtree_by_disease_state=self.kdtree_by_disease_state,
-            agents_labels_by_disease_state=self.agents_labels_by_disease_state,
-            natural_history=self.natural_history,
-            disease_groups=self.disease_groups,
-            dead_disease_group=self.dead_disease_group,
-            execmode=self.execmode,
-            npartitions=self.npartitions
-            )
+        if "update_alertness_state" not in self.skipped_stages:
+            self.__df = AgentDisease.update_alertness_state(
+                df=self.__df,
+                kdtree_by_disease_state=self.kdtree_by_disease_state,
+                agents_labels_by_disease_state=self
+                .agents_labels_by_disease_state,
+                natural_history=self.natural_history,
+                disease_groups=self.disease_groups,
+                dead_disease_group=self.dead_disease_group,
+                execmode=self.execmode,
+                npartitions=self.npartitions
+                )
+        else:
+            # No agent is alerted
+            self.__df = self.__df.assign(
+                is_alert=False,
+                alerted_by=[
+                    array([], dtype=int) for agent in range(len(self.__df))
+                    ]
+                )
 
         # =====================================================================
         # Change population states by means of contagion
+        former_disease_state = self.__df["disease_state"].to_numpy()
+
+        # Agents that can get infected read their immunization level and
+        # update their immunization params once infected
+        can_get_infected = isin(former_disease_state, self.susceptible_states)
+        self.__materialize_immunization(
+            self.__df.index[can_get_infected].to_numpy()
+            )
+
         self.__df = AgentDisease.disease_state_transition_by_contagion(
             df=self.__df,
             kdtree_by_disease_state=self.kdtree_by_disease_state,
@@ -573,21 +737,130 @@ class Population:
             disease_groups=self.disease_groups,
             susceptibility_groups=self.susceptibility_groups,
             execmode=self.execmode,
-            npartitions=self.npartitions
+            npartitions=self.npartitions,
+            scheduler=self.__transition_scheduler
             )
 
+        # Update active sets with the agents that got infected
+        has_changed = self.__df["disease_state"].to_numpy() \
+            != former_disease_state
+
+        self.__active_sets.update(self.__df[has_changed])
+        self.__absorb_immunization(self.__df.index[has_changed].to_numpy())
+
         # =====================================================================
         # Update immunization level
-        self.__df = AgentDisease.update_immunization_level(
-            df=self.__df,
-            dt=self.dt,
-            natural_history=self.natural_history,
-            execmode=self.execmode,
-            npartitions=self.npartitions
-            )
+        # Same as AgentDisease.update_immunization_level, computed when read
+        if self.__immunization_timer is not None:
+            self.__immunization_timer.tick()
 
         # =====================================================================
         # Mobility Restrictions
+        if "apply_mobility_restrictions" not in self.skipped_stages:
+            self.__apply_mobility_restrictions(former_df)
+        else:
+            # No agent is isolated by mobility restrictions
+            self.__df = self.__df.assign(
+                isolated_by_mr=False,
+                adheres_to_mr_isolation=False
+                )
+
+        # =====================================================================
+        # Avoid avoidable agents
+        if "avoid_agents" not in self.skipped_stages:
+            filtered_df = self.__df[self.__df["is_alert"]][
+                ["agent", "alerted_by"]
+                ]
+            df_to_avoid = filtered_df \
+                .explode("alerted_by") \
+                .rename(columns={"alerted_by": "agent_to_avoid"})
+            if df_to_avoid.empty is False:
+                self.__df = AgentMovement.avoid_agents(
+                    df=self.__df,
+                    df_to_avoid=df_to_avoid,
+                    execmode=self.execmode
+                )
+
+        # =====================================================================
+        # Update agents' positions
+        # NOTE: mobility_profile should be in iteration_time units, so the
+        # value we should use for dt here is dt=1.0
+        self.__df = AgentMovement.move_agents(
+            df=self.__df,
+            box_size=self.configuration.box_size,
+            dt=1.0
+            )
+
+    def __materialize_immunization(self, labels: ndarray = None) -> None:
+        """
+            Bring the immunization columns of some agents up to date.
+
+            Parameters
+            ----------
+            labels : ndarray, optional
+                Index labels of the agents. All the agents if not given.
+        """
+        if self.__immunization_timer is not None:
+            self.__df = self.__immunization_timer.materialize(
+                self.__df, labels
+                )
+
+    def __materialize_disease_state_time(self) -> None:
+        """
+            Bring `disease_state_time` up to date, which is kept by the
+            transition scheduler when there is one.
+        """
+        if self.__transition_scheduler is not None:
+            self.__df = self.__transition_scheduler.materialize(self.__df)
+
+    def __absorb_immunization(self, labels: ndarray) -> None:
+        """
+            Store the immunization columns of some agents, written by a
+            stage after they were brought up to date.
+
+            Parameters
+            ----------
+            labels : ndarray
+                Index labels of the agents.
+        """
+        if self.__immunization_timer is not None and len(labels) != 0:
+            self.__immunization_timer.absorb(self.__df.loc[labels])
+
+    def __update_subset(self, subset_df: DataFrame, columns: list) -> None:
+        """
+            Write back the `columns` of a subset of the population, which
+            was evolved apart, and update the active sets of its agents.
+
+            Parameters
+            ----------
+            subset_df : DataFrame
+                Rows of the population dataframe, with at least `columns`.
+
+            columns : list
+                Columns changed by the stages applied to `subset_df`.
+        """
+        if subset_df.empty:
+            return
+
+        self.__df.loc[subset_df.index, columns] = subset_df[columns]
+        self.__active_sets.update(self.__df.loc[subset_df.index])
+
+    def __apply_mobility_restrictions(self, former_df: DataFrame) -> None:
+        """
+            TODO: Add brief explanation
+
+            Parameters
+            ----------
+            TODO
+
+            See Also
+            --------
+            TODO
+
+            Examples
+            --------
+            TODO: include some examples
+        """
         variables = AgentDisease.apply_mobility_restrictions(
             step=self.__step,
             df=self.__df,
@@ -600,7 +873,8 @@ class Population:
             grace_time_in_steps=self.__grace_time_in_steps,
             iteration_time=self.configuration.iteration_time,
             mr_adherence_groups=self.mr_adherence_groups,
-            execmode=ExecutionModes.iterative.value
+            execmode=self.execmode,
+            npartitions=self.npartitions
             )
         # Assign values
         self.__df = variables[0]
@@ -642,28 +916,6 @@ class Population:
                     preserve_dtypes_dict={"step": int, "agent": int}
                     )
 
-        # =====================================================================
-        # Avoid avoidable agents
-        filtered_df = self.__df[self.__df["is_alert"]][["agent", "alerted_by"]]
-        df_to_avoid = filtered_df \
-            .explode("alerted_by") \
-            .rename(columns={"alerted_by": "agent_to_avoid"})
-        if df_to_avoid.empty is False:
-            self.__df = AgentMovement.avoid_agents(
-                df=self.__df,
-                df_to_avoid=df_to_avoid
-            )
-
-        # =====================================================================
-        # Update agents' positions
-        # NOTE: mobility_profile should be in iteration_time units, so the
-        # value we should use for dt here is dt=1.0
-        self.__df = AgentMovement.move_agents(
-            df=self.__df,
-            box_size=self.configuration.box_size,
-            dt=1.0
-            )
-
     def __get_disease_groups_alive(self) -> None:
         """
             TODO: Add brief explanation
@@ -691,6 +943,14 @@ class Population:
             [self.dead_disease_group]
             ))
 
+        # Retrieve disease group labels whose agents can get infected
+        self.susceptible_states = [
+            disease_group_label
+            for disease_group_label, disease_group
+            in self.disease_groups.items.items()
+            if disease_group.can_get_infected
+            ]
+
     def __choose_tracing_radius(self) -> None:
         """
             TODO: Add brief explanation
@@ -731,6 +991,101 @@ class Population:
             max_avoidance_radius
             )
 
+    def __plan_step(self) -> None:
+        """
+            Analyse the scenario configuration and find the stages of
+            `__evolve_single_step` that can not change the population, so
+            they are skipped on every step.
+
+            The skipped stages are stored in `skipped_stages`, a dictionary
+            whose keys are the names of the stages and whose values are the
+            reasons why they are skipped. Each skipped stage is logged.
+
+            Notes
+            -----
+            A stage is skipped when:
+
+            - `update_alertness_state` and `avoid_agents`: every
+              `avoidance_radius` in the natural history is zero, so no agent
+              is ever alerted.
+
+            - `apply_mobility_restrictions`: there are neither mobility
+              restrictions by tracing policies nor cyclic mobility
+              restrictions policies.
+
+            - `to_diagnose_agents` and `to_isolate_agents`: no infected
+              disease state has a diagnosis probability, i.e. its
+              distribution is missing, has no type or is the constant zero.
+              Agents can only be isolated after being diagnosed.
+
+            - `update_immunization_level`: there are no immunization groups
+              and no transition gains immunization, so the immunization
+              level of every agent remains zero.
+        """
+        self.skipped_stages = {}
+
+        # Alertness
+        avoidance_radius_list = [
+            self.natural_history.items[key].avoidance_radius
+            for key in self.natural_history.items.keys()
+            ]
+
+        if all(radius == 0 for radius in avoidance_radius_list):
+            reason = "every avoidance_radius is zero"
+            self.skipped_stages["update_alertness_state"] = reason
+            self.skipped_stages["avoid_agents"] = reason
+
+        # Mobility restrictions
+        cond_1 = self.global_cyclic_mr is not None
+        cond_2 = self.cyclic_mr_policies is not None
+
+        if self.mrt_policies is None and not (cond_1 and cond_2):
+            self.skipped_stages["apply_mobility_restrictions"] = \
+                "there are no mobility restrictions policies"
+
+        # Diagnosis and isolation
+        def can_be_diagnosed(disease_state: str) -> bool:
+            return has_probability(
+                self.disease_groups.items[disease_state]
+                .dist.get(DistTitles.diagnosis.value)
+                )
+
+        infected_states = [
+            disease_state
+            for disease_state in self.disease_groups_alive
+            if self.disease_groups.items[disease_state].is_infected
+            ]
+
+        if not any(map(can_be_diagnosed, infected_states)):
+            self.skipped_stages["to_diagnose_agents"] = \
+                "no infected disease state has a diagnosis probability"
+            self.skipped_stages["to_isolate_agents"] = \
+                "agents are never diagnosed"
+
+        # Immunization
+        def gains_immunization(transition) -> bool:
+            distribution = transition.dist.get(
+                DistTitles.immunization_time.value
+                )
+            has_immunization_time = distribution is not None \
+                and distribution.dist_type is not None
+
+            return transition.immunization_gain != 0 or has_immunization_time
+
+        gains = [
+            gains_immunization(transition)
+            for key in self.natural_history.items.keys()
+            for transition in self.natural_history.items[key]
+            .transitions.values()
+            ]
+
+        if self.immunization_groups is None and not any(gains):
+            self.skipped_stages["update_immunization_level"] = \
+                "there are no immunization groups nor immunization gains"
+
+        for stage, reason in self.skipped_stages.items():
+            logger.info("Skipping stage `%s`: %s", stage, reason)
+
     def __kdtrees_and_agents_indices(self) -> None:
         """
             TODO: Add brief explanation
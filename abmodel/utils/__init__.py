@@ -21,6 +21,7 @@
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
 from .distributions import Distribution
+from .distributions import AliasTable
 from .execution_modes import ExecutionModes
 from .execution_modes import EvolutionModes
 from .units import timedelta_to_days
@@ -28,11 +29,19 @@ from .utilities import check_field_existance
 from .utilities import exception_burner
 from .utilities import check_field_errors
 from .utilities import std_str_join_cols
+from .utilities import apply_rows
+from .utilities import group_codes
 from .helpers import init_distribution
+from .jit import jit
+from .jit import numba_available
+from .jit import seed_jit
+from .process_pool import ProcessPool
+from .partitions import partitioned_stage
 
 
 __all__ = [
     "Distribution",
+    "AliasTable",
     "ExecutionModes",
     "EvolutionModes",
     "timedelta_to_days",
@@ -40,5 +49,12 @@ __all__ = [
     "exception_burner",
     "check_field_errors",
     "std_str_join_cols",
-    "init_distribution"
+    "apply_rows",
+    "group_codes",
+    "init_distribution",
+    "jit",
+    "numba_available",
+    "seed_jit",
+    "ProcessPool",
+    "partitioned_stage"
     ]
@@ -24,10 +24,27 @@ from time import time
 from typing import Union, Any, Optional
 
 from pydantic import validate_arguments
-from numpy import abs, genfromtxt, ndarray, random, ones, full
+from numpy import abs, genfromtxt, ndarray, random, ones, full, concatenate
+from numpy import linspace, exp, cumsum, interp, asarray, zeros, arange
+from numpy import isclose, where, minimum
 from sklearn.neighbors import KernelDensity
 
 
+# Half width of the support of each KDE kernel in units of the bandwidth
+# used to build the inverse CDF tables of empirical distributions
+kernel_support = {
+    "gaussian": 6.0,
+    "tophat": 1.0,
+    "epanechnikov": 1.0,
+    "exponential": 20.0,
+    "linear": 1.0,
+    "cosine": 1.0
+    }
+
+# Number of points of the inverse CDF tables of empirical distributions
+icdf_table_size = 4096
+
+
 class Distribution:
     """
         Distribution class
@@ -45,6 +62,8 @@ class Distribution:
                  data: Optional[ndarray] = None,
                  filename: Optional[str] = None,
                  dist_name: Optional[str] = None,
+                 trait: bool = False,
+                 pool_size: Optional[int] = None,
                  **kwargs):
         """
             Constructor of Distribution class.
@@ -65,10 +84,12 @@ class Distribution:
 
                 'empirical' : build distributions from empirical data,
                     estimating the overall shape of the distribution using
-                    the KDE approach available via Scikit-Learn. If the data is
-                    stored in a file, then 'filename' must be passed to specify
-                    the path to the file and the data inside that file must be
-                    formatted without header in this way:
+                    the KDE approach available via Scikit-Learn. The fitted
+                    KDE is compiled into an inverse CDF table, so sampling
+                    is a uniform draw followed by an interpolation. If the
+                    data is stored in a file, then 'filename' must be passed
+                    to specify the path to the file and the data inside that
+                    file must be formatted without header in this way:
 
                     .. code-block::
                         data_0
@@ -80,7 +101,9 @@ class Distribution:
                     in order to generate a random sample from
                     this given array of points and their corresponding
                     probability weights.
-                    It uses Numpy Random Choices [2]_. If the data is
+                    It uses an `AliasTable` built once from the weights,
+                    which validates them as Numpy Random Choice [2]_
+                    does. If the data is
                     stored in a file, then 'filename' must be passed to specify
                     the path to the file and the data inside that file must be
                     formatted without header in this way:
@@ -110,6 +133,20 @@ class Distribution:
                 It specifies the distribution to use from numpy when
                 `dist_type = 'numpy'`.
 
+            trait : bool, default=False
+                If True, the distribution models a trait of each agent
+                rather than noise of each encounter: it is sampled once per
+                agent and the value is reused afterwards.
+
+            pool_size : int, optional
+                If given, samples of 'empirical', 'weights' and 'numpy'
+                distributions are drawn in blocks of `pool_size` values and
+                served from that block, so small requests do not pay the
+                cost of calling the generator each time. Samples are served
+                in the same order they are drawn, so the stream of values
+                is the same as without pool. It must not be given for
+                other distribution types.
+
             **kwargs : dict, optional
                 Extra arguments that must to be passed to the
                 Scikit-Learn's Kernel Density constructor [1]_ or
@@ -136,9 +173,26 @@ class Distribution:
             TODO: include some exhaustive examples here using each dist_type
         """
         self.dist_type = dist_type
+        self.trait = trait
         self.seed = int(time())
 
         try:
+            if pool_size is not None and pool_size < 1:
+                raise ValueError(
+                    "Parameter `pool_size` should be a positive integer"
+                    )
+
+            poolable = self.dist_type in ["empirical", "weights", "numpy"]
+            if pool_size is not None and not poolable:
+                raise ValueError(
+                    "Parameter `pool_size` is only allowed for 'empirical', "
+                    "'weights' and 'numpy' distributions"
+                    )
+
+            self.pool_size = pool_size
+            self.pool = None
+            self.pool_cursor = 0
+
             if self.dist_type is None:
                 # Allows a `Distribution` object set to None
                 self.constant = None
@@ -175,13 +229,19 @@ class Distribution:
                     self.kd_estimator = KernelDensity(**self.kwargs).fit(
                         data.reshape(-1, 1)
                         )
+
+                    self.x_table, self.cdf_table = \
+                        self.build_icdf_table(data)
+
+                    self.random_number_generator = \
+                        random.default_rng(seed=self.seed)
                 else:
                     raise ValueError(
                         "The data provided should be a 1-D array."
                         )
 
             elif self.dist_type == "weights":
-                # Using numpy.random.choice
+                # Using an alias table
                 if data is not None and filename is None:
                     pass
                 elif data is None and filename is not None:
@@ -202,6 +262,12 @@ class Distribution:
 
                     self.random_number_generator = \
                         random.default_rng(seed=self.seed)
+
+                    self.alias_table = AliasTable(
+                        self.xi,
+                        self.pi,
+                        self.random_number_generator
+                        )
                 else:
                     raise ValueError(
                         "The data provided should be a 2-D array."
@@ -238,6 +304,46 @@ class Distribution:
                 message="Error initializing distribution."
                 )
 
+    def build_icdf_table(self, data: ndarray) -> tuple[ndarray, ndarray]:
+        """
+            Compile the fitted KernelDensity estimator into a table of its
+            cumulative distribution function, which read backwards is the
+            inverse CDF used for sampling.
+
+            Parameters
+            ----------
+            data : ndarray
+                1-D array used to fit the KernelDensity estimator.
+
+            Returns
+            -------
+            x_table : ndarray
+                Points where the CDF is evaluated.
+
+            cdf_table : ndarray
+                Cumulative probability at each point of `x_table`.
+        """
+        kernel = self.kd_estimator.kernel
+        bandwidth = getattr(
+            self.kd_estimator, "bandwidth_", self.kd_estimator.bandwidth
+            )
+        half_width = kernel_support[kernel]*bandwidth
+
+        x_table = linspace(
+            data.min() - half_width,
+            data.max() + half_width,
+            icdf_table_size
+            )
+        density = exp(self.kd_estimator.score_samples(x_table.reshape(-1, 1)))
+
+        # Trapezoidal rule, normalized to end exactly at 1
+        cdf_table = concatenate(
+            ([0.0], cumsum((density[1:] + density[:-1])/2))
+            )
+        cdf_table = cdf_table/cdf_table[-1]
+
+        return x_table, cdf_table
+
     @validate_arguments
     def sample(self, size: int = 1) -> Union[ndarray, int, float]:
         """
@@ -262,6 +368,35 @@ class Distribution:
             --------
             TODO: include some examples
         """
+        if self.pool_size is not None:
+            samples = self.draw_from_pool(size)
+        else:
+            samples = self.draw(size)
+
+        if size == 1:
+            return samples[0]
+        else:
+            return samples
+
+    def draw(self, size: int) -> ndarray:
+        """
+            Draw `size` samples directly from the defined distribution.
+
+            Parameters
+            ----------
+            size : int
+                Number of samples to generate.
+
+            Returns
+            -------
+            samples : numpy.array
+                Samples generated.
+
+            Raises
+            ------
+            SystemError
+                TODO: when ?
+        """
         if self.dist_type is None:
             # Always return None
             samples = full(size, self.constant)
@@ -270,25 +405,15 @@ class Distribution:
             # "Dirac delta"-like function
             samples = self.constant*ones(size)
         elif self.dist_type == "empirical":
-            # Using KernelDensity estimator from Scikit-learn
-            try:
-                samples = self.kd_estimator.sample(
-                    n_samples=size, random_state=self.seed).flatten()
-            except Exception as error:
-                self.manage_exception(
-                    exception=error,
-                    message="Error using KernelDensity estimator."
-                    )
+            # Using the inverse CDF table of the KernelDensity estimator
+            samples = interp(
+                self.random_number_generator.random(size),
+                self.cdf_table,
+                self.x_table
+                )
         elif self.dist_type == "weights":
-            # Using numpy.random.choice
-            try:
-                samples = self.random_number_generator.choice(
-                    a=self.xi, p=self.pi, size=size)
-            except Exception as error:
-                self.manage_exception(
-                    exception=error,
-                    message="Exception with numpy random choice."
-                    )
+            # Using the alias table of the weights
+            samples = self.alias_table.sample(size)
 
         elif self.dist_type == "numpy":
             # Using numpy.random
@@ -306,10 +431,48 @@ class Distribution:
                 "{'constant', 'empirical', 'weights', 'numpy'}"
                 )
 
-        if size == 1:
-            return samples[0]
+        return samples
+
+    def draw_from_pool(self, size: int) -> ndarray:
+        """
+            Serve `size` samples from the pool of pre-drawn samples,
+            refilling it in bulk when it runs out.
+
+            Parameters
+            ----------
+            size : int
+                Number of samples to serve.
+
+            Returns
+            -------
+            samples : numpy.array
+                Samples served, in the same order they were drawn.
+
+            See Also
+            --------
+            draw : Draw samples directly from the defined distribution.
+        """
+        if self.pool is None:
+            available = 0
         else:
-            return samples
+            available = self.pool.size - self.pool_cursor
+
+        if size > available:
+            block = self.draw(max(self.pool_size, size - available))
+
+            if available == 0:
+                self.pool = block
+            else:
+                # Keep the remaining samples so the stream is not altered
+                self.pool = concatenate(
+                    (self.pool[self.pool_cursor:], block)
+                    )
+            self.pool_cursor = 0
+
+        samples = self.pool[self.pool_cursor:self.pool_cursor + size]
+        self.pool_cursor += size
+
+        return samples
 
     @validate_arguments
     def sample_positive(self, size: int = 1) -> Union[ndarray, int]:
@@ -359,3 +522,120 @@ class Distribution:
             TODO: include some examples
         """
         raise SystemError(f"{message}\nError: {exception}")
+
+
+class AliasTable:
+    """
+        Sampler of a discrete distribution using the alias method.
+
+        The table is built once from the values and their probabilities, then
+        each sample costs one uniform draw, an index and a comparison,
+        whatever the number of values.
+
+        Methods
+        -------
+        sample
+    """
+    def __init__(
+        self,
+        values: Any,
+        probabilities: Any,
+        random_number_generator: Optional[random.Generator] = None
+    ):
+        """
+            Constructor of AliasTable class.
+
+            Parameters
+            ----------
+            values : array_like
+                Values to sample.
+
+            probabilities : array_like
+                Probability of each value. They must be non negative and sum
+                up to 1.
+
+            random_number_generator : numpy.random.Generator, optional
+                Generator used for sampling. If None, the global numpy random
+                state is used.
+
+            Raises
+            ------
+            ValueError
+                If the probabilities are not valid.
+        """
+        self.values = asarray(values)
+        probabilities = asarray(probabilities, dtype=float)
+
+        if self.values.ndim != 1 or self.values.size == 0:
+            raise ValueError("`values` should be a non empty 1-D array")
+        if probabilities.shape != self.values.shape:
+            raise ValueError(
+                "`values` and `probabilities` should have the same size"
+                )
+        if (probabilities < 0).any():
+            raise ValueError("`probabilities` should be non negative")
+        if not isclose(probabilities.sum(), 1.0):
+            raise ValueError("`probabilities` do not sum to 1")
+
+        self.random_number_generator = random_number_generator
+        self.size = self.values.size
+
+        # Vose's alias method
+        scaled = probabilities*self.size/probabilities.sum()
+        self.threshold = zeros(self.size)
+        self.alias = arange(self.size)
+
+        small = [i for i in range(self.size) if scaled[i] < 1.0]
+        large = [i for i in range(self.size) if scaled[i] >= 1.0]
+
+        while small and large:
+            i = small.pop()
+            j = large.pop()
+
+            self.threshold[i] = scaled[i]
+            self.alias[i] = j
+
+            scaled[j] = scaled[j] + scaled[i] - 1.0
+            if scaled[j] < 1.0:
+                small.append(j)
+            else:
+                large.append(j)
+
+        # What remains has probability 1 up to rounding errors
+        for i in small + large:
+            self.threshold[i] = 1.0
+
+    def sample(self, size: Optional[int] = None) -> Any:
+        """
+            Sample values from the table.
+
+            Parameters
+            ----------
+            size : int, optional
+                Number of samples. If None, a single value is returned.
+
+            Returns
+            -------
+            samples : Any or numpy.array
+                Samples generated.
+        """
+        if self.random_number_generator is None:
+            uniform = random.random_sample(size)
+        else:
+            uniform = self.random_number_generator.random(size)
+
+        # The integer part picks a column and the fractional part decides
+        # between the column and its alias
+        uniform = uniform*self.size
+
+        # Rounding may take the largest uniform up to `self.size`
+        if size is None:
+            column = min(int(uniform), self.size - 1)
+            if uniform - column < self.threshold[column]:
+                return self.values[column]
+            return self.values[self.alias[column]]
+
+        column = minimum(uniform.astype(int), self.size - 1)
+        accept = uniform - column < self.threshold[column]
+
+        return self.values[where(accept, column, self.alias[column])]
@@ -33,6 +33,8 @@ class ExecutionModes(Enum):
     vectorized = "vectorized"
     dask = "dask"
     swifter = "swifter"
+    numba = "numba"
+    multiprocessing = "multiprocessing"
 
 
 class EvolutionModes(Enum):
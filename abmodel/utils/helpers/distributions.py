@@ -35,7 +35,10 @@ def init_distribution(dist_dict: dict[str, Any]) -> Distribution:
         ----------
         dist_dict : dict
             Dictionary with the required information
-            in order to initialize the distribution.
+            in order to initialize the distribution. The optional key
+            `trait` marks the distribution as a per agent trait and
+            the optional key `pool_size` enables the pool of pre-drawn
+            samples.
 
         Returns
         -------
@@ -49,13 +52,17 @@ def init_distribution(dist_dict: dict[str, Any]) -> Distribution:
     if dist_dict["dist_type"] == "constant":
         return Distribution(
             dist_type=dist_dict["dist_type"],
-            constant=dist_dict["constant"]
+            constant=dist_dict["constant"],
+            trait=dist_dict.get("trait", False),
+            pool_size=dist_dict.get("pool_size")
             )
     elif dist_dict["dist_type"] == "empirical":
         return Distribution(
             dist_type=dist_dict["dist_type"],
             data=dist_dict["data"],
             filename=dist_dict["filename"],
+            trait=dist_dict.get("trait", False),
+            pool_size=dist_dict.get("pool_size"),
             **dist_dict["kwargs"]
             )
     elif dist_dict["dist_type"] == "weights":
@@ -63,14 +70,20 @@ def init_distribution(dist_dict: dict[str, Any]) -> Distribution:
             dist_type=dist_dict["dist_type"],
             data=dist_dict["data"],
             filename=dist_dict["filename"],
+            trait=dist_dict.get("trait", False),
+            pool_size=dist_dict.get("pool_size")
             )
     elif dist_dict["dist_type"] == "numpy":
         return Distribution(
             dist_type=dist_dict["dist_type"],
             dist_name=dist_dict["dist_name"],
+            trait=dist_dict.get("trait", False),
+            pool_size=dist_dict.get("pool_size"),
             **dist_dict["kwargs"]
             )
     else:
         return Distribution(
-            dist_type=dist_dict["dist_type"]
+            dist_type=dist_dict["dist_type"],
+            trait=dist_dict.get("trait", False),
+            pool_size=dist_dict.get("pool_size")
             )
@@ -0,0 +1,87 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from typing import Callable
+
+from numpy import random
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+numba_available = njit is not None
+
+
+def jit(function: Callable) -> Callable:
+    """
+        Compile `function` with `numba.njit` when numba is installed.
+
+        Parameters
+        ----------
+        function : Callable
+            Kernel written with plain loops over numpy arrays.
+
+        Returns
+        -------
+        kernel : Callable
+            Compiled kernel, or `function` itself when numba is not
+            installed so `ExecutionModes.numba` still gives the same
+            results, only slower.
+
+        Notes
+        -----
+        Compilation is lazy and cached on disk (`cache=True`), so importing
+        the kernels does not slow down the start of the process and later
+        processes reuse the compiled code.
+    """
+    if njit is None:
+        return function
+
+    return njit(cache=True)(function)
+
+
+def _seed(seed: int) -> None:
+    random.seed(seed)
+
+
+_seed_kernel = None if njit is None else njit(cache=True)(_seed)
+
+
+def seed_jit(seed: int) -> None:
+    """
+        Seed the random generator used inside the compiled kernels.
+
+        Parameters
+        ----------
+        seed : int
+            Seed between 0 and 2**32 - 1.
+
+        Notes
+        -----
+        Compiled kernels draw from numba's own generator, which
+        `numpy.random.seed` does not reach. When numba is not installed the
+        kernels already draw from numpy's generator, so nothing is done.
+    """
+    if _seed_kernel is not None:
+        _seed_kernel(seed)
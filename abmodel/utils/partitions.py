@@ -0,0 +1,81 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from functools import wraps
+from inspect import signature
+from typing import Callable
+
+from dask.dataframe import DataFrame as DaskDataFrame
+from dask.dataframe import from_pandas
+
+from .execution_modes import ExecutionModes
+
+
+def partitioned_stage(stage: Callable) -> Callable:
+    """
+        Keep the population partitioned across consecutive dask stages.
+
+        Parameters
+        ----------
+        stage : Callable
+            Stage receiving the population as `df` together with
+            `execmode` and, optionally, `npartitions`. In dask mode its body
+            must work on a dask DataFrame and must not call `compute`.
+
+        Returns
+        -------
+        wrapper : Callable
+            Stage that, in dask mode, partitions a pandas `df` with
+            `from_pandas` and computes the result before returning it. If
+            `df` is already a dask DataFrame it is passed through and the
+            result stays lazy, so stages called one after the other (e.g.
+            the updates done after a transition) build a single graph that
+            is computed once by the outermost call.
+
+        Notes
+        -----
+        Configuration objects captured by the row kernels are shared by
+        reference with the threads of the default dask scheduler, so they
+        are not copied per partition.
+    """
+    stage_signature = signature(stage)
+
+    @wraps(stage)
+    def wrapper(*args, **kwargs):
+        arguments = stage_signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+
+        df = arguments.arguments["df"]
+        execmode = arguments.arguments["execmode"]
+
+        if execmode != ExecutionModes.dask.value \
+                or isinstance(df, DaskDataFrame):
+            return stage(*arguments.args, **arguments.kwargs)
+
+        arguments.arguments["df"] = from_pandas(
+            df,
+            npartitions=arguments.arguments.get("npartitions") or 1
+            )
+
+        return stage(*arguments.args, **arguments.kwargs).compute()
+
+    return wrapper
@@ -0,0 +1,225 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from os import cpu_count
+from typing import Callable, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+
+from numpy import array_split, arange, ndarray, random, uint32
+from pandas.core.frame import DataFrame
+from pandas.core.series import Series
+from pandas import concat
+
+from .utilities import apply_rows
+
+
+def apply_chunk(
+    chunk: DataFrame,
+    function: Callable,
+    dtypes: Optional[dict] = None,
+    seed: Optional[ndarray] = None
+) -> Union[DataFrame, Series]:
+    """
+        Apply `function` to each row of `chunk`, passing the row values as
+        positional arguments. It runs inside the workers.
+
+        Parameters
+        ----------
+        chunk : DataFrame
+            Contiguous rows of the population, restricted to the columns
+            required by `function` and in the order it expects them.
+
+        function : Callable
+            Row kernel with every other argument already bound, e.g. a
+            `functools.partial` of a module level function.
+
+        dtypes : dict, optional
+            Dtype of each value returned by `function`, for kernels
+            returning a tuple. See `apply_rows`.
+
+        seed : ndarray, optional
+            Seed of the global numpy random generator used by the row
+            kernels, set before `function` is applied.
+
+        Returns
+        -------
+        result : DataFrame or Series
+            Same output as `apply_rows` if `dtypes` is given, otherwise
+            same output as `chunk.apply(..., axis=1)`.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    if dtypes is not None:
+        return apply_rows(chunk, function, chunk.columns.to_list(), dtypes)
+
+    return chunk.apply(lambda row: function(*row), axis=1)
+
+
+class ProcessPool:
+    """
+        Persistent pool of worker processes used by
+        `ExecutionModes.multiprocessing`.
+
+        The pool is created the first time it is needed and reused by
+        every stage and step, so workers are not spawned again on each call.
+
+        Attributes
+        ----------
+        executor : ProcessPoolExecutor
+            Running pool, None if it has not been started.
+
+        max_workers : int
+            Number of worker processes of `executor`.
+
+        Methods
+        -------
+        get_executor
+        shutdown
+        apply
+    """
+    executor: Optional[ProcessPoolExecutor] = None
+    max_workers: Optional[int] = None
+
+    @classmethod
+    def get_executor(
+        cls,
+        max_workers: Optional[int] = None
+    ) -> ProcessPoolExecutor:
+        """
+            Return the running pool, starting it if needed.
+
+            Parameters
+            ----------
+            max_workers : int, optional
+                Number of worker processes. Defaults to the running pool or,
+                if there is none, to the number of CPUs. The pool is
+                restarted if it differs from the running one.
+
+            Returns
+            -------
+            executor : ProcessPoolExecutor
+        """
+        if max_workers is None and cls.executor is not None:
+            return cls.executor
+
+        max_workers = max_workers or cpu_count() or 1
+
+        if cls.executor is not None and cls.max_workers != max_workers:
+            cls.shutdown()
+
+        if cls.executor is None:
+            cls.executor = ProcessPoolExecutor(max_workers=max_workers)
+            cls.max_workers = max_workers
+
+        return cls.executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+            Stop the worker processes of the running pool, if any.
+        """
+        if cls.executor is not None:
+            cls.executor.shutdown()
+            cls.executor = None
+            cls.max_workers = None
+
+    @classmethod
+    def apply(
+        cls,
+        df: DataFrame,
+        function: Callable,
+        columns: list,
+        npartitions: Optional[int] = None,
+        dtypes: Optional[dict] = None
+    ) -> Union[DataFrame, Series]:
+        """
+            Apply a row kernel to `df` splitting it in contiguous chunks
+            that are processed in parallel by the workers.
+
+            Parameters
+            ----------
+            df : DataFrame
+                Population dataframe.
+
+            function : Callable
+                Row kernel receiving the values of `columns` as positional
+                arguments. It must be picklable, so bind the configuration
+                with `functools.partial` instead of using a lambda.
+
+            columns : list
+                Columns of `df` passed to `function`, in order.
+
+            npartitions : int, optional
+                Number of chunks. If None or 1, one chunk per worker.
+
+            dtypes : dict, optional
+                Dtype of each value returned by `function`, for kernels
+                returning a tuple. See `apply_rows`.
+
+            Returns
+            -------
+            result : DataFrame or Series
+                Same output as applying `function` row by row, with the
+                index of `df`.
+
+            Notes
+            -----
+            `function`, including the configuration and KD-trees bound to
+            it, is pickled once per chunk, i.e. once per worker for each
+            stage.
+
+            Workers are forked with the random state of the parent process,
+            so each chunk gets its own seed, spawned from a `SeedSequence`
+            whose entropy is drawn from the global numpy random generator
+            of the parent. Chunks do not repeat the dice thrown by the row
+            kernels, and `numpy.random.seed` in the parent makes the run
+            reproducible.
+        """
+        if df.shape[0] == 0:
+            return apply_chunk(df[columns], function, dtypes)
+
+        executor = cls.get_executor()
+
+        if npartitions is None or npartitions <= 1:
+            npartitions = cls.max_workers
+        npartitions = min(npartitions, df.shape[0])
+
+        df = df[columns]
+        seeds = random.SeedSequence(
+            random.randint(0, 2**32, size=4, dtype=uint32)
+            ).spawn(npartitions)
+        futures = [
+            executor.submit(
+                apply_chunk,
+                df.iloc[positions],
+                function,
+                dtypes,
+                seed.generate_state(4)
+                )
+            for positions, seed in zip(
+                array_split(arange(df.shape[0]), npartitions),
+                seeds
+                )
+            ]
+
+        return concat([future.result() for future in futures])
@@ -20,11 +20,13 @@
 # Nicole Rivera (https://github.com/nicolerivera1)
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
-from typing import Union
+from typing import Callable, Union
 
 from pydantic import validate_arguments
+from numpy import ndarray, unique, asarray
 from pandas.core.frame import DataFrame
 from pandas.core.series import Series
+from pandas import Categorical
 
 
 def check_field_existance(df: DataFrame, cols: list) -> str:
@@ -160,3 +162,86 @@ def std_str_join_cols(
                 "Both `col1` and `col2` should have the same type"
                 "corresponding to `str` or `pandas Series`")
         raise ValueError(error_string)
+
+
+def apply_rows(
+    df: DataFrame,
+    function: Callable,
+    columns: list,
+    dtypes: dict
+) -> DataFrame:
+    """
+        Apply a row kernel to `df` looping over the zipped values of
+        `columns`, so neither a Series for each row as input nor a Series
+        for each output is built as it happens with `df.apply(..., axis=1)`.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Population dataframe.
+
+        function : Callable
+            Row kernel receiving the values of `columns` as positional
+            arguments, with every other argument already bound, and
+            returning a tuple.
+
+        columns : list
+            Columns of `df` passed to `function`, in order.
+
+        dtypes : dict
+            Dtype of each value returned by `function` keyed by its
+            position, e.g. `{0: "object", 1: "float64"}`.
+
+        Returns
+        -------
+        result : DataFrame
+            One column of the given dtype for each key of `dtypes`, with
+            the index of `df`.
+    """
+    results = [
+        function(*values)
+        for values in zip(*[df[column] for column in columns])
+        ]
+
+    outputs = list(zip(*results)) or [[] for key in dtypes]
+
+    return DataFrame(
+        {
+            key: Series(values, index=df.index, dtype=dtypes[key])
+            for key, values in zip(dtypes, outputs)
+        },
+        index=df.index
+        )
+
+
+def group_codes(
+    labels: Union[ndarray, Categorical]
+) -> tuple[ndarray, ndarray]:
+    """
+        Find the distinct labels and the position of each element in them.
+
+        Parameters
+        ----------
+        labels : ndarray or Categorical
+            Group label of each element.
+
+        Returns
+        -------
+        unique_labels : ndarray
+            Distinct labels present in `labels`.
+
+        inverse : ndarray
+            Position in `unique_labels` of the label of each element.
+
+        Notes
+        -----
+        For a `Categorical` (e.g. the `key` column built by
+        `AgentDisease.generate_key_col` in vectorized mode) the integer
+        codes are used, so labels are neither hashed nor compared as
+        strings.
+    """
+    if isinstance(labels, Categorical):
+        used_codes, inverse = unique(labels.codes, return_inverse=True)
+        return labels.categories.to_numpy()[used_codes], inverse
+
+    return unique(asarray(labels), return_inverse=True)
@@ -1,23 +1,39 @@
 import pytest
 from datetime import timedelta
 from math import nan, isnan
+from numpy import array, repeat, tile, zeros
+from numpy.random import seed
 from pandas import DataFrame, Series, testing
+from scipy.spatial import KDTree
+from dask.dataframe import DataFrame as DaskDataFrame
+from dask.dataframe import from_pandas
 
 from abmodel.agent.disease import AgentDisease
+from abmodel.agent.scheduler import TransitionScheduler
 from abmodel.agent.disease import init_calculate_max_time_iterative
 from abmodel.agent.disease import init_calculate_max_time_vectorized
 from abmodel.agent.disease import calculate_max_time_iterative
 from abmodel.agent.disease import hospitalization_vectorized
+from abmodel.agent.disease import capacity_triage
+from abmodel.agent.disease import capacity_triage_numba
 from abmodel.agent.disease import diagnosis_function
+from abmodel.agent.disease import diagnosis_vectorized
 from abmodel.agent.disease import isolation_function
 from abmodel.agent.disease import isolation_handler
+from abmodel.agent.disease import isolation_vectorized
 from abmodel.agent.disease import init_immunization_params_iterative
 from abmodel.agent.disease import transition_function
+from abmodel.agent.disease import contagion_candidates
+from abmodel.agent.disease import contagion_vectorized
+from abmodel.agent.disease import multi_exposure_infection
+from abmodel.agent.disease import alertness_vectorized
 from abmodel.models.disease import DiseaseStates, NaturalHistory
 from abmodel.models.disease import IsolationAdherenceGroups
 from abmodel.models.disease import ImmunizationGroups
+from abmodel.models.disease import SusceptibilityGroups
 from abmodel.models import HealthSystem
 from abmodel.utils.execution_modes import ExecutionModes
+from abmodel.utils.jit import seed_jit
 from abmodel.models.mobility_restrictions import InterestVariables
 from abmodel.models.mobility_restrictions import MRTracingPolicies
 from abmodel.models.mobility_restrictions import MRTStopModes
@@ -27,6 +43,7 @@ from abmodel.models.mobility_restrictions import GlobalCyclicMR
 from abmodel.models.mobility_restrictions import CyclicMRModes
 from abmodel.models.disease import MRAdherenceGroups
 from abmodel.models.base import SimpleGroups
+from abmodel.utils.distributions import Distribution
 
 
 class TestAgentDisease:
@@ -1375,6 +1392,63 @@ class TestAgentDisease:
                         "kwargs": {}
                     },
                 ]
+            },
+            {
+                "vulnerability_group": "not_vulnerable",
+                "disease_group": "latency",
+                "avoidance_radius": 2.0,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": False,
+                "transitions": [],
+                "dist_info": [
+                    {
+                        "dist_title": "time_dist",
+                        "dist_type": None,
+                        "constant": None,
+                        "dist_name": None,
+                        "filename": None,
+                        "data": None,
+                        "kwargs": {}
+                    },
+                ]
+            },
+            {
+                "vulnerability_group": "vulnerable",
+                "disease_group": "immune",
+                "avoidance_radius": 2.0,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": False,
+                "transitions": [],
+                "dist_info": [
+                    {
+                        "dist_title": "time_dist",
+                        "dist_type": None,
+                        "constant": None,
+                        "dist_name": None,
+                        "filename": None,
+                        "data": None,
+                        "kwargs": {}
+                    },
+                ]
+            },
+            {
+                "vulnerability_group": "vulnerable",
+                "disease_group": "dead",
+                "avoidance_radius": 2.0,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": False,
+                "transitions": [],
+                "dist_info": [
+                    {
+                        "dist_title": "time_dist",
+                        "dist_type": None,
+                        "constant": None,
+                        "dist_name": None,
+                        "filename": None,
+                        "data": None,
+                        "kwargs": {}
+                    },
+                ]
             }
         ]
         dist_title_disease_groups = [
@@ -1747,6 +1821,261 @@ class TestAgentDisease:
 
         return fixture_tuple
 
+    @pytest.fixture()
+    def fixture_contagion(
+        self
+    ) -> tuple[NaturalHistory, DiseaseStates, SusceptibilityGroups, dict]:
+        def none_dist(dist_title: str) -> dict:
+            return {"dist_title": dist_title, "dist_type": None}
+
+        def constant_dist(dist_title: str, constant: float) -> dict:
+            return {
+                "dist_title": dist_title,
+                "dist_type": "constant",
+                "constant": constant
+            }
+
+        def history_item(
+            disease_group: str,
+            transition_by_contagion: bool,
+            transitions: list,
+            time_dist: dict
+        ) -> dict:
+            return {
+                "vulnerability_group": "not_vulnerable",
+                "disease_group": disease_group,
+                "avoidance_radius": 0.0,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": transition_by_contagion,
+                "transitions": [
+                    {
+                        "transition_name": transition_name,
+                        "probability": probability,
+                        "immunization_gain": 0.0,
+                        "dist_info": none_dist(
+                            "immunization_time_distribution"
+                        )
+                    }
+                    for transition_name, probability in transitions
+                ],
+                "dist_info": [
+                    time_dist,
+                    constant_dist("alertness_prob", 0.0)
+                ]
+            }
+
+        def disease_state(
+            name: str,
+            can_get_infected: bool,
+            is_infected: bool,
+            can_spread: bool,
+            is_dead: bool
+        ) -> dict:
+            return {
+                "name": name,
+                "can_get_infected": can_get_infected,
+                "is_infected": is_infected,
+                "can_spread": can_spread,
+                "spread_radius": 1.0 if can_spread else None,
+                "spread_radius_unit": "meters" if can_spread else None,
+                "spread_probability": 1.0 if can_spread else None,
+                "is_dead": is_dead,
+                "dist_info": [
+                    none_dist("diagnosis_prob"),
+                    none_dist("isolation_days"),
+                    none_dist("hospitalization_prob"),
+                    none_dist("ICU_prob")
+                ]
+            }
+
+        natural_history = NaturalHistory(
+            dist_title=["time_dist", "alertness_prob"],
+            group_info=[
+                history_item(
+                    "susceptible", True, [("latency", 1.0)],
+                    none_dist("time_dist")
+                ),
+                history_item(
+                    "latency", False, [("infectious", 1.0)],
+                    constant_dist("time_dist", 5.0)
+                ),
+                history_item(
+                    "infectious", False, [("dead", 1.0)],
+                    constant_dist("time_dist", 5.0)
+                ),
+                history_item(
+                    "dead", False, [("dead", 1.0)],
+                    none_dist("time_dist")
+                )
+            ]
+        )
+        disease_groups = DiseaseStates(
+            dist_title=[
+                "diagnosis_prob", "isolation_days",
+                "hospitalization_prob", "ICU_prob"
+            ],
+            group_info=[
+                disease_state("susceptible", True, False, False, False),
+                disease_state("latency", False, True, False, False),
+                disease_state("infectious", False, True, True, False),
+                disease_state("dead", False, False, False, True)
+            ]
+        )
+        susceptibility_groups = SusceptibilityGroups(
+            dist_title="susceptibility_dist",
+            group_info=[
+                {
+                    "name": "susceptibility_1",
+                    "dist_info": constant_dist("susceptibility_dist", 1.0)
+                }
+            ]
+        )
+        data_dict = {
+            "agent": [0, 1, 2, 3, 4],
+            "x": [0.0, 0.5, 10.0, 0.0, 1.0],
+            "y": [0.0, 0.0, 10.0, 0.5, 0.0],
+            "vulnerability_group": ["not_vulnerable"]*5,
+            "disease_state": [
+                "susceptible", "infectious", "susceptible",
+                "susceptible", "susceptible"
+            ],
+            "key": [
+                "not_vulnerable-susceptible",
+                "not_vulnerable-infectious",
+                "not_vulnerable-susceptible",
+                "not_vulnerable-susceptible",
+                "not_vulnerable-susceptible"
+            ],
+            "susceptibility_group": ["susceptibility_1"]*5,
+            "immunization_level": [0.0, 0.0, 0.0, 1.0, 0.0],
+            "immunization_slope": [nan]*5,
+            "immunization_time": [nan]*5,
+            "immunization_max_time": [nan]*5,
+            "times_infected": [0, 1, 0, 0, 0],
+            "disease_state_time": [nan, 1.0, nan, nan, nan],
+            "disease_state_max_time": [nan, 5.0, nan, nan, nan],
+            "reduction_factor": [1.0]*5,
+            "do_calculate_max_time": [False]*5,
+            "do_update_immunization_params": [False]*5
+        }
+
+        return (
+            natural_history, disease_groups, susceptibility_groups, data_dict
+            )
+
+    @pytest.fixture()
+    def fixture_contagion_kdtrees(
+        self,
+        fixture_contagion
+    ) -> tuple[dict, dict]:
+        df = DataFrame(fixture_contagion[3])
+        disease_groups = fixture_contagion[1]
+
+        kdtree_by_disease_state = {}
+        agents_labels_by_disease_state = {}
+        for disease_state in disease_groups.items.keys():
+            filtered_df = df[df["disease_state"] == disease_state]
+            if filtered_df.shape[0] != 0:
+                kdtree_by_disease_state[disease_state] = KDTree(
+                    filtered_df[["x", "y"]].to_numpy()
+                )
+                agents_labels_by_disease_state[disease_state] = \
+                    filtered_df["agent"].to_numpy()
+            else:
+                kdtree_by_disease_state[disease_state] = None
+                agents_labels_by_disease_state[disease_state] = None
+
+        return kdtree_by_disease_state, agents_labels_by_disease_state
+
+    @pytest.fixture()
+    def fixture_alertness(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ) -> tuple[NaturalHistory, DiseaseStates, DataFrame, dict, dict]:
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        df = DataFrame(fixture_contagion[3]).assign(is_dead=False)
+
+        # Susceptible agents avoid infectious agents closer than 1.0
+        natural_history.items["not_vulnerable-infectious"] \
+            .avoidance_radius = 1.0
+        natural_history.items["not_vulnerable-susceptible"] \
+            .dist["alertness_prob"] = Distribution(
+                dist_type="constant", constant=1.0
+                )
+
+        return (natural_history, disease_groups, df) \
+            + fixture_contagion_kdtrees
+
+    @pytest.fixture()
+    def fixture_update_immunization(self) -> tuple[NaturalHistory, dict]:
+        def history_item(
+            disease_group: str,
+            transition_name: str,
+            immunization_gain: float,
+            immunization_time_dist: dict
+        ) -> dict:
+            return {
+                "vulnerability_group": "not_vulnerable",
+                "disease_group": disease_group,
+                "avoidance_radius": 0.0,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": False,
+                "transitions": [
+                    {
+                        "transition_name": transition_name,
+                        "probability": 1.0,
+                        "immunization_gain": immunization_gain,
+                        "dist_info": immunization_time_dist
+                    }
+                ],
+                "dist_info": [
+                    {"dist_title": "time_dist", "dist_type": None}
+                ]
+            }
+
+        natural_history = NaturalHistory(
+            dist_title=["time_dist"],
+            group_info=[
+                history_item(
+                    "latency", "infectious", 0.5,
+                    {
+                        "dist_title": "immunization_time_distribution",
+                        "dist_type": "constant",
+                        "constant": 10.0
+                    }
+                ),
+                history_item(
+                    "infectious", "recovered", 0.8,
+                    {
+                        "dist_title": "immunization_time_distribution",
+                        "dist_type": None
+                    }
+                )
+            ]
+        )
+        data_dict = {
+            "key": [
+                "not_vulnerable-latency",
+                "not_vulnerable-latency",
+                "not_vulnerable-infectious",
+                "not_vulnerable-infectious",
+                "not_vulnerable-latency"
+            ],
+            "disease_state": [
+                "infectious", "infectious", "recovered",
+                "recovered", "latency"
+            ],
+            "immunization_level": [0.0, 0.6, 0.4, 0.0, 0.3],
+            "immunization_slope": [nan, -0.1, -0.1, nan, -0.1],
+            "immunization_time": [nan, 2.0, 1.0, nan, 1.0],
+            "immunization_max_time": [nan, 6.0, 4.0, nan, 3.0],
+            "do_update_immunization_params": [True, True, True, True, False]
+        }
+
+        return natural_history, data_dict
+
     # ========================================================================
     # Tests
     # ========================================================================
@@ -1791,6 +2120,27 @@ class TestAgentDisease:
         expected = [False, True, False]
         assert all(df["is_dead"].eq(expected))
 
+    def test_init_is_dead_vectorized(
+        self,
+        fixture_init_required_fields
+    ):
+        """
+            verifies whether init_is_dead assigns correctly values to
+            is_dead column when `ExecutionModes` is equals to vectorized.
+        """
+
+        df = DataFrame({"disease_state": ["susceptible", "dead", "immune"]})
+        disease_groups = fixture_init_required_fields[1]
+        df = AgentDisease.init_is_dead(
+            df,
+            disease_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+
+        expected = [False, True, False]
+        assert df["is_dead"].dtype == bool
+        assert all(df["is_dead"].eq(expected))
+
     def test_init_is_dead_raise_NotImplementedError(
         self,
         fixture_init_required_fields
@@ -1806,7 +2156,7 @@ class TestAgentDisease:
             AgentDisease.init_is_dead(
                 df,
                 disease_groups,
-                ExecutionModes.vectorized.value
+                ExecutionModes
             )
 
     def test_init_is_dead_raise_ValueError(
@@ -1874,6 +2224,39 @@ class TestAgentDisease:
 
         assert all(df["key"].eq(expected))
 
+    def test_generate_key_col_vectorized_categorical(
+        self,
+        fixture_init_required_fields
+    ):
+        """
+            Verifies whether the column `key` is created as a categorical
+            with integer codes `vulnerability_code * n_states + state_code`
+            when a natural history is provided in vectorized mode.
+        """
+        natural_history = fixture_init_required_fields[0]
+        df = DataFrame(
+            {
+                "vulnerability_group": [
+                    "vulnerable", "not_vulnerable", "vulnerable"
+                ],
+                "disease_state": ["susceptible"]*3
+            }
+        )
+
+        df = AgentDisease.generate_key_col(
+            df=df,
+            execmode=ExecutionModes.vectorized.value,
+            natural_history=natural_history
+            )
+
+        assert df["key"].dtype == "category"
+        assert df["key"].cat.codes.tolist() == [1, 0, 1]
+        assert df["key"].astype(str).tolist() == [
+            "vulnerable-susceptible",
+            "not_vulnerable-susceptible",
+            "vulnerable-susceptible"
+            ]
+
     def test_generate_key_col_raise_Exception_error(
         self,
         fixture_generate_key_col_iterative
@@ -1970,7 +2353,7 @@ class TestAgentDisease:
     ):
         """
             Verifies whether calculate_max_time_iterative
-            returns a Series with nan values when disease_state
+            returns a tuple with nan values when disease_state
             provided is `dead`.
         """
         natural_history = fixture_init_required_fields[1]
@@ -1994,7 +2377,7 @@ class TestAgentDisease:
     ):
         """
             Verifies whether calculate_max_time_iterative
-            returns a Series with nan values when disease_state
+            returns a tuple with nan values when disease_state
             provided is `dead`.
         """
         natural_history = fixture_init_required_fields[0]
@@ -2010,7 +2393,7 @@ class TestAgentDisease:
             natural_history=natural_history
         )
 
-        assert all(s.eq([0, 10]))
+        assert s == (0, 10)
 
     def test_calculate_max_time_iterative_calculate_False(
         self,
@@ -2018,7 +2401,7 @@ class TestAgentDisease:
     ):
         """
             Verifies whether calculate_max_time_iterative
-            returns a Series with nan values when disease_state
+            returns a tuple with nan values when disease_state
             provided is `dead`.
         """
         natural_history = fixture_init_required_fields[0]
@@ -2034,7 +2417,7 @@ class TestAgentDisease:
             natural_history=natural_history
         )
 
-        assert all(s.eq([5, 10]))
+        assert s == (5, 10)
 
     def test_determine_disease_state_max_time(
         self,
@@ -2074,6 +2457,53 @@ class TestAgentDisease:
         assert df["disease_state_max_time"][1] == 10
         assert all(df["do_calculate_max_time"].eq([False, False]))
 
+    def test_determine_disease_state_max_time_vectorized(
+        self,
+        fixture_init_required_fields
+    ):
+        """
+            Verifies whether determine_disease_state_max_time calculates
+            `disease_state_time` and `disease_state_max_time` only for the
+            agents with `do_calculate_max_time` set, with NaN for dead
+            agents, when `ExecutionModes` is equals to vectorized.
+        """
+        natural_history = fixture_init_required_fields[0]
+        disease_groups = fixture_init_required_fields[1]
+
+        df = DataFrame(
+            {
+                "key": [
+                    "not_vulnerable-susceptible",
+                    "vulnerable-susceptible",
+                    "vulnerable-susceptible"
+                ],
+                "disease_state": ["susceptible", "susceptible", "dead"],
+                "do_calculate_max_time": [False, True, True],
+                "disease_state_time": [3.0, None, 2.0],
+                "disease_state_max_time": [5.0, None, 4.0]
+            },
+            index=[4, 8, 9]
+        )
+
+        df = AgentDisease.determine_disease_state_max_time(
+            df=df,
+            disease_groups=disease_groups,
+            natural_history=natural_history,
+            execmode=ExecutionModes.vectorized.value
+        )
+
+        testing.assert_series_equal(
+            df["disease_state_time"],
+            Series([3.0, 0.0, nan], index=[4, 8, 9]),
+            check_names=False
+        )
+        testing.assert_series_equal(
+            df["disease_state_max_time"],
+            Series([5.0, 10.0, nan], index=[4, 8, 9]),
+            check_names=False
+        )
+        assert all(df["do_calculate_max_time"].eq([False, False, False]))
+
     def test_determine_disease_state_max_time_raise_NotImplementedError(
         self,
         fixture_init_required_fields
@@ -2104,7 +2534,7 @@ class TestAgentDisease:
                 df=df,
                 disease_groups=disease_groups,
                 natural_history=natural_history,
-                execmode=ExecutionModes.vectorized.value
+                execmode=ExecutionModes.swifter.value
             )
 
     def test_init_disease_state_max_time_iterative(
@@ -2144,6 +2574,46 @@ class TestAgentDisease:
         assert df["disease_state_max_time"][1] == 10
         assert all(df["do_calculate_max_time"].eq([False, False]))
 
+    @pytest.mark.parametrize(
+        "execmode",
+        [ExecutionModes.dask.value, ExecutionModes.vectorized.value]
+    )
+    def test_init_disease_state_max_time_execmodes(
+        self,
+        fixture_init_required_fields,
+        execmode
+    ):
+        """
+            Verifies whether init_disease_state_max_time gives the same
+            result as in iterative mode when `ExecutionModes` is equals to
+            dask or vectorized.
+        """
+        natural_history = fixture_init_required_fields[0]
+        disease_groups = fixture_init_required_fields[1]
+
+        df = DataFrame(
+            {
+                "key": [
+                    "not_vulnerable-susceptible",
+                    "vulnerable-susceptible"
+                ],
+                "disease_state": ["susceptible", "susceptible"]
+            }
+        )
+
+        df = AgentDisease.init_disease_state_max_time(
+            df=df,
+            disease_groups=disease_groups,
+            natural_history=natural_history,
+            execmode=execmode
+        )
+
+        assert isnan(df["disease_state_time"][0])
+        assert df["disease_state_time"][1] == 0
+        assert isnan(df["disease_state_max_time"][0])
+        assert df["disease_state_max_time"][1] == 10
+        assert all(df["do_calculate_max_time"].eq([False, False]))
+
     def test_init_disease_state_max_time_raise_Exception_error(
         self,
         fixture_init_required_fields
@@ -2272,40 +2742,151 @@ class TestAgentDisease:
         assert all(df[1].eq(expected_is_in_ICU))
         assert len(is_dead) == 3
 
-    def test_to_hospitalize_agents(
+    def test_hospitalization_numba_hospital_capacity(
         self,
         fixture_hospitalization_vectorized
     ):
         """
-            Verifies whether to_hospitalize_agents modyfies correctly
-            the respective columns values for each agent.
+           Agents beyond `hospital_capacity` must die when execmode is set
+           to numba, as in vectorized mode.
         """
-        data_dict = fixture_hospitalization_vectorized[0]
-        health_system = data_dict.pop("health_system")
-        alpha = data_dict.pop("alpha")
-        dead_disease_group = data_dict.pop("dead_disease_group")
-        disease_groups = data_dict.pop("disease_groups")
+        kwargs = fixture_hospitalization_vectorized[4]
 
-        df = DataFrame(data_dict)
-        df["disease_state"] = df["disease_states"]
-        df.pop("disease_states")
+        df = hospitalization_vectorized(
+            **kwargs,
+            execmode=ExecutionModes.numba.value
+            )
 
-        df = AgentDisease.to_hospitalize_agents(
-            df=df,
-            dead_disease_group=dead_disease_group,
-            alpha=alpha,
-            disease_groups=disease_groups,
-            health_system=health_system
-        )
-        expected_is_hospitalized = Series(
-            [False for agent in df["is_hospitalized"]]
-        )
-        expected_is_in_ICU = Series([False for value in df["is_in_ICU"]])
+        assert df[0].sum() == 2
+        assert all(df[1].eq(kwargs["is_in_ICU"]))
+        assert df[3].sum() == 3
 
-        assert all(df["is_hospitalized"].eq(expected_is_hospitalized))
-        assert all(df["is_in_ICU"].eq(expected_is_in_ICU))
-        assert all(df["disease_state"].eq(data_dict["disease_states"]))
-        assert all(df["is_dead"].eq(data_dict["is_dead"]))
+    def test_capacity_triage_numba(self):
+        """
+            Verifies whether capacity_triage_numba takes the agents of the
+            first pool before those of the second one, without repeating
+            agents.
+        """
+        is_admitted = array([True, True, True, True, True, False])
+        first_pool = array([False, True, False, True, False, False])
+        second_pool = array([True, False, True, False, False, False])
+
+        must_die = capacity_triage_numba(
+            is_admitted, first_pool, second_pool, 2
+            )
+
+        assert len(must_die) == 3
+        assert set(must_die[:2]) == {1, 3}
+        assert must_die[2] in [0, 2]
+        assert len(capacity_triage_numba(
+            is_admitted, first_pool, second_pool, 5
+            )) == 0
+
+    def test_capacity_triage_numba_follows_seed(self):
+        """
+            Verifies whether capacity_triage_numba chooses the same agents
+            once its generator is seeded again with seed_jit.
+        """
+        is_admitted = array([True]*100)
+        first_pool = array([True]*100)
+        second_pool = array([False]*100)
+
+        chosen = []
+        for kernel_seed in [1, 1, 2]:
+            seed_jit(kernel_seed)
+            chosen.append(capacity_triage_numba(
+                is_admitted, first_pool, second_pool, 50
+                ).tolist())
+
+        assert chosen[0] == chosen[1]
+        assert chosen[0] != chosen[2]
+
+    @pytest.mark.parametrize(
+        "triage",
+        [capacity_triage, capacity_triage_numba]
+    )
+    def test_capacity_triage_small_pools(self, triage):
+        """
+            Verifies whether capacity_triage and capacity_triage_numba take
+            every agent of both pools when they are smaller than the
+            overload.
+        """
+        is_admitted = array([True, True, True, True, True, False])
+        first_pool = array([False, True, False, False, False, False])
+        second_pool = array([True, False, False, False, False, False])
+
+        must_die = triage(is_admitted, first_pool, second_pool, 1)
+
+        assert sorted(must_die) == [0, 1]
+
+        must_die = triage(
+            is_admitted, first_pool, zeros(6, dtype=bool), 1
+            )
+
+        assert list(must_die) == [1]
+
+    def test_hospitalization_vectorized_keeps_index_and_dtypes(
+        self,
+        fixture_hospitalization_vectorized
+    ):
+        """
+            Verifies whether hospitalization_vectorized returns typed
+            columns aligned with the index of the inputs, even when it is
+            not a RangeIndex, and leaves the inputs untouched.
+        """
+        kwargs = fixture_hospitalization_vectorized[1]
+        index = [10, 12, 13, 17, 20]
+        for name in ["is_hospitalized", "is_in_ICU", "disease_states",
+                     "reduction_factor", "is_dead"]:
+            kwargs[name].index = index
+        former_reduction_factor = kwargs["reduction_factor"].copy()
+
+        df = hospitalization_vectorized(**kwargs)
+
+        assert df.index.tolist() == index
+        assert df[0].dtype == bool
+        assert df[1].dtype == bool
+        assert df[3].dtype == bool
+        assert df[4].dtype == float
+        assert df[4].tolist() == pytest.approx([0.8, 0.21, 0.18, 0.9, 0.06])
+        testing.assert_series_equal(
+            kwargs["reduction_factor"], former_reduction_factor
+            )
+
+    def test_to_hospitalize_agents(
+        self,
+        fixture_hospitalization_vectorized
+    ):
+        """
+            Verifies whether to_hospitalize_agents modyfies correctly
+            the respective columns values for each agent.
+        """
+        data_dict = fixture_hospitalization_vectorized[0]
+        health_system = data_dict.pop("health_system")
+        alpha = data_dict.pop("alpha")
+        dead_disease_group = data_dict.pop("dead_disease_group")
+        disease_groups = data_dict.pop("disease_groups")
+
+        df = DataFrame(data_dict)
+        df["disease_state"] = df["disease_states"]
+        df.pop("disease_states")
+
+        df = AgentDisease.to_hospitalize_agents(
+            df=df,
+            dead_disease_group=dead_disease_group,
+            alpha=alpha,
+            disease_groups=disease_groups,
+            health_system=health_system
+        )
+        expected_is_hospitalized = Series(
+            [False for agent in df["is_hospitalized"]]
+        )
+        expected_is_in_ICU = Series([False for value in df["is_in_ICU"]])
+
+        assert all(df["is_hospitalized"].eq(expected_is_hospitalized))
+        assert all(df["is_in_ICU"].eq(expected_is_in_ICU))
+        assert all(df["disease_state"].eq(data_dict["disease_states"]))
+        assert all(df["is_dead"].eq(data_dict["is_dead"]))
 
     def test_to_hospitalize_agents_raise_Exception_error(
         self,
@@ -2498,6 +3079,47 @@ class TestAgentDisease:
 
         assert all(df["is_diagnosed"].eq(expected))
 
+    def test_to_diagnose_agents_vectorized(
+            self,
+            fixture_diagnosis_function
+    ):
+        """
+            to_diagnose_agents modifies correctly the `is_diagnosed` column
+            of the input DataFrame. Setting `ExecutionModes` equals to
+            vectorized.
+        """
+        disease_groups = fixture_diagnosis_function[0]
+        data_dict = fixture_diagnosis_function[1]
+        df = DataFrame(data_dict)
+
+        df = AgentDisease.to_diagnose_agents(
+            df=df,
+            disease_groups=disease_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+        expected = [False, False, True, True]
+
+        assert all(df["is_diagnosed"].eq(expected))
+
+    def test_diagnosis_vectorized_dead_agents_are_not_diagnosed(
+            self,
+            fixture_diagnosis_function
+    ):
+        """
+            diagnosis_vectorized sets `is_diagnosed` to False for dead
+            agents even if they were diagnosed before.
+        """
+        disease_groups = fixture_diagnosis_function[0]
+
+        is_diagnosed = diagnosis_vectorized(
+            disease_state=Series(["dead", "hospital", "infectious"]),
+            is_dead=Series([True, True, False]),
+            is_diagnosed=Series([True, False, True]),
+            disease_groups=disease_groups
+        )
+
+        assert is_diagnosed.tolist() == [False, False, True]
+
     def test_isolation_function_isolation_prob_1(
         self,
         fixture_to_isolate_agents
@@ -2557,7 +3179,7 @@ class TestAgentDisease:
             kwargs["reduction_factor"]
         ])
 
-        assert all(s.eq(expected_s))
+        assert all(Series(s).eq(expected_s))
 
     def test_isolation_handler_isolation_time_greater_isolation_max_time(
         self,
@@ -2605,7 +3227,7 @@ class TestAgentDisease:
             kwargs["reduction_factor"]
         ])
 
-        assert all(s.eq(expected_s))
+        assert all(Series(s).eq(expected_s))
 
     def test_isolation_handler_isolation_adherence_groups_None(
         self,
@@ -2628,7 +3250,7 @@ class TestAgentDisease:
             kwargs["reduction_factor"]*kwargs["beta"]
         ])
 
-        assert all(s.eq(expected_s))
+        assert all(Series(s).eq(expected_s))
 
     def test_isolation_handler_adherence_prob_1(
         self,
@@ -2652,7 +3274,7 @@ class TestAgentDisease:
             kwargs["reduction_factor"]*kwargs["beta"]
         ])
 
-        assert all(s == expected_s)
+        assert all(Series(s) == expected_s)
 
     def test_isolation_handler_adherence_prob_0(
         self,
@@ -2675,7 +3297,7 @@ class TestAgentDisease:
             kwargs["reduction_factor"]
         ])
 
-        assert all(s.eq(expected_s))
+        assert all(Series(s).eq(expected_s))
 
     def test_to_isolate_agents_iterative(
         self,
@@ -2756,6 +3378,97 @@ class TestAgentDisease:
 
         assert all(df.eq(expected_df))
 
+    def test_to_isolate_agents_vectorized(
+        self,
+        fixture_to_isolate_agents
+    ):
+        """
+            Verifies whether to_isolate_agents isolates only the agents
+            that adhere to isolation when `ExecutionModes` is equals to
+            vectorized.
+        """
+        data_dict = fixture_to_isolate_agents[6]
+        beta = data_dict.pop("beta")
+        disease_groups = data_dict.pop("disease_groups")
+        isolation_adherence_groups = data_dict.pop(
+            "isolation_adherence_groups"
+        )
+        dt = data_dict.pop("dt")
+
+        df = DataFrame(data_dict)
+        df = AgentDisease.to_isolate_agents(
+            df=df,
+            dt=dt,
+            beta=beta,
+            disease_groups=disease_groups,
+            isolation_adherence_groups=isolation_adherence_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+        expected_df = DataFrame(
+            {
+                "is_diagnosed": [True, True],
+                "is_isolated": [False, True],
+                "isolation_time": [8.0 + dt, 0.0],
+                "isolation_max_time": [10.0, 10.0],
+                "adheres_to_isolation": [False, True],
+                "reduction_factor": [0.3, 0.3*beta]
+            }
+        )
+
+        testing.assert_frame_equal(
+            df[expected_df.columns], expected_df, check_dtype=False
+            )
+
+    def test_isolation_vectorized_isolation_ends(
+        self,
+        fixture_to_isolate_agents
+    ):
+        """
+            Verifies whether isolation_vectorized ends the isolation of
+            the agents whose `isolation_time` is greater than
+            `isolation_max_time` and keeps the index of the input.
+        """
+        kwargs = fixture_to_isolate_agents[1]
+        df = DataFrame(
+            {
+                "disease_state": ["immune", "immune"],
+                "isolation_adherence_group": ["adherence_1", "adherence_1"],
+                "is_diagnosed": [True, True],
+                "is_isolated": [True, True],
+                "isolation_time": [10.0, 8.0],
+                "isolation_max_time": [9.0, 10.0],
+                "adheres_to_isolation": [True, True],
+                "reduction_factor": [0.3, 0.3]
+            },
+            index=[3, 7]
+        )
+
+        output_df = isolation_vectorized(
+            df["disease_state"],
+            df["isolation_adherence_group"],
+            df["is_diagnosed"],
+            df["is_isolated"],
+            df["isolation_time"],
+            df["isolation_max_time"],
+            df["adheres_to_isolation"],
+            df["reduction_factor"],
+            kwargs["beta"],
+            kwargs["disease_groups"]
+            )
+        expected_df = DataFrame(
+            {
+                "is_diagnosed": [False, True],
+                "is_isolated": [False, True],
+                "isolation_time": [nan, 8.0],
+                "isolation_max_time": [nan, 10.0],
+                "adheres_to_isolation": [True, True],
+                "reduction_factor": [0.3/kwargs["beta"], 0.3]
+            },
+            index=[3, 7]
+        )
+
+        testing.assert_frame_equal(output_df, expected_df)
+
     def test_to_isolate_agents_raise_NotImplementedError(
         self,
         fixture_to_isolate_agents
@@ -2781,7 +3494,7 @@ class TestAgentDisease:
                 beta=beta,
                 disease_groups=disease_groups,
                 isolation_adherence_groups=isolation_adherence_groups,
-                execmode=ExecutionModes.vectorized.value
+                execmode=ExecutionModes.swifter.value
             )
 
     def test_to_isolate_agents_raise_Exception_error(
@@ -2871,6 +3584,38 @@ class TestAgentDisease:
 
         assert all(df["times_infected"].eq(times_infected_expected))
 
+    def test_init_times_infected_vectorized(
+            self,
+            fixture_init_times_infected
+    ):
+        """
+            Verifies whether init_times_infected assigns correct values
+            in vectorized mode.
+        """
+        disease_groups = fixture_init_times_infected
+
+        df = DataFrame(
+            {
+                "agent": [i + 1 for i in range(6)],
+                "disease_state": [
+                    "susceptible",
+                    "latency",
+                    "immune",
+                    "infectious",
+                    "hospital",
+                    "dead"
+                ]
+            }
+        )
+        df = AgentDisease.init_times_infected(
+            df,
+            disease_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+        times_infected_expected = [0, 1, 0, 1, 1, 0]
+
+        assert all(df["times_infected"].eq(times_infected_expected))
+
     def test_init_times_infected_NotImplementedError(
             self,
             fixture_init_times_infected
@@ -2899,7 +3644,7 @@ class TestAgentDisease:
             AgentDisease.init_times_infected(
                 df=df,
                 disease_groups=disease_groups,
-                execmode=ExecutionModes.vectorized.value
+                execmode=ExecutionModes
             )
 
     def test_init_times_infected_ValueError(
@@ -3000,7 +3745,7 @@ class TestAgentDisease:
         )
         expected_s = Series([0, 30.0, -1/30.0])
 
-        assert all(s.eq(expected_s))
+        assert all(Series(s).eq(expected_s))
 
     def test_init_immunization_params_iterative_None_dist(
         self,
@@ -3130,6 +3875,51 @@ class TestAgentDisease:
 
         assert all(df.eq(expected_df))
 
+    def test_init_immunization_vectorized(
+        self,
+        fixture_init_immunization
+    ):
+        """
+            Verifies whether init_immunization_level and
+            init_immunization_params assign correctly values when
+            `ExecutionModes` is equals to vectorized, keeping NaN params
+            for the agents that are not immunized.
+        """
+        immunization_groups = fixture_init_immunization
+
+        df = DataFrame(
+            {
+                "agent": [i + 1 for i in range(3)],
+                "immunization_group": [
+                    "immunized",
+                    "not_immunized",
+                    "immunized",
+                ]
+            },
+            index=[2, 5, 7]
+        )
+        df = AgentDisease.init_immunization_level(
+            df=df,
+            immunization_groups=immunization_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+        df = AgentDisease.init_immunization_params(
+            df=df,
+            immunization_groups=immunization_groups,
+            execmode=ExecutionModes.vectorized.value
+        )
+        expected_df = DataFrame(
+            {
+                "immunization_level": [1.0, 0.0, 1.0],
+                "immunization_time": [0.0, nan, 0.0],
+                "immunization_max_time": [30.0, nan, 30.0],
+                "immunization_slope": [-1/30.0, nan, -1/30.0]
+            },
+            index=[2, 5, 7]
+        )
+
+        testing.assert_frame_equal(df[expected_df.columns], expected_df)
+
     def test_init_immunization_params_NotImplementedError(
         self,
         fixture_init_immunization
@@ -3156,7 +3946,7 @@ class TestAgentDisease:
             AgentDisease.init_immunization_params(
                 df=df,
                 immunization_groups=immunization_groups,
-                execmode=ExecutionModes.vectorized.value
+                execmode=ExecutionModes.swifter.value
             )
 
     def test_init_immunization_params_Exception_immunization_level_column(
@@ -3354,6 +4144,34 @@ class TestAgentDisease:
             disease_state_max_time_expected
         )
 
+    def test_disease_state_transition_new_key_max_time(
+            self,
+            fixture_transition_function
+    ):
+        """
+            Verifies whether `disease_state_transition` draws the max time of
+            the agents that went through a transition from the time_dist of
+            their new disease state.
+        """
+        natural_history = fixture_transition_function[0]
+        disease_groups = fixture_transition_function[1]
+        data_dict = fixture_transition_function[2]
+
+        natural_history.items["vulnerable-immune"].dist["time_dist"] = \
+            Distribution(dist_type="constant", constant=7.0)
+
+        df = AgentDisease.disease_state_transition(
+            df=DataFrame(data_dict),
+            dt=2,
+            disease_groups=disease_groups,
+            natural_history=natural_history
+            )
+
+        assert df["disease_state"][1] == "immune"
+        assert df["key"][1] == "vulnerable-immune"
+        assert df["disease_state_max_time"][1] == 7.0
+        assert df["disease_state_time"][1] == 0.0
+
     def test_disease_state_transition_dask(
             self,
             fixture_transition_function
@@ -3402,6 +4220,205 @@ class TestAgentDisease:
             disease_state_max_time_expected
         )
 
+    def test_disease_state_transition_dask_keeps_partitions(
+            self,
+            fixture_transition_function
+    ):
+        """
+            Verifies whether `disease_state_transition` returns a lazy dask
+            DataFrame when it receives one, and whether computing it gives
+            the same result as passing a pandas DataFrame.
+        """
+        natural_history = fixture_transition_function[0]
+        disease_groups = fixture_transition_function[1]
+        data_dict = fixture_transition_function[2]
+
+        pandas_df = AgentDisease.disease_state_transition(
+            df=DataFrame(data_dict),
+            dt=2,
+            disease_groups=disease_groups,
+            natural_history=natural_history,
+            execmode=ExecutionModes.dask.value,
+            npartitions=2
+            )
+        dask_df = AgentDisease.disease_state_transition(
+            df=from_pandas(DataFrame(data_dict), npartitions=2),
+            dt=2,
+            disease_groups=disease_groups,
+            natural_history=natural_history,
+            execmode=ExecutionModes.dask.value
+            )
+
+        assert isinstance(dask_df, DaskDataFrame)
+        testing.assert_frame_equal(dask_df.compute(), pandas_df)
+
+    def test_disease_state_transition_multiprocessing(
+            self,
+            fixture_transition_function
+    ):
+        """
+            Verifies whether `disease_state_transition` gives the same
+            result as the iterative mode when execmode is set to
+            multiprocessing.
+        """
+        natural_history = fixture_transition_function[0]
+        disease_groups = fixture_transition_function[1]
+        data_dict = fixture_transition_function[2]
+
+        outputs = []
+        for execmode in [
+            ExecutionModes.iterative.value,
+            ExecutionModes.multiprocessing.value
+        ]:
+            df = AgentDisease.disease_state_transition(
+                df=DataFrame(data_dict),
+                dt=2,
+                disease_groups=disease_groups,
+                natural_history=natural_history,
+                execmode=execmode,
+                npartitions=2
+                )
+            outputs.append(df)
+
+        testing.assert_frame_equal(outputs[0], outputs[1])
+
+    def test_disease_state_transition_vectorized(
+            self,
+            fixture_transition_function
+    ):
+        """
+            Verifies whether `disease_state_transition` returns the same
+            disease states as the iterative mode when execmode is set to
+            vectorized, with and without a `TransitionScheduler`.
+        """
+        natural_history = fixture_transition_function[0]
+        disease_groups = fixture_transition_function[1]
+        data_dict = fixture_transition_function[2]
+
+        disease_state_expected = [
+            "latency",
+            "immune",
+            "susceptible",
+            "dead"
+        ]
+        is_dead_expected = [False, False, False, True]
+        disease_state_max_time_expected = Series(
+            [nan, nan, 5, nan],
+            name="disease_state_max_time"
+        )
+
+        df = DataFrame(data_dict)
+        df.insert(loc=0, column="agent", value=range(4))
+        scheduler = TransitionScheduler(dt=2)
+        scheduler.schedule(
+            df.index.to_numpy(),
+            df["disease_state_time"].to_numpy(),
+            df["disease_state_max_time"].to_numpy()
+            )
+
+        for stage_scheduler in [None, scheduler]:
+            output_df = AgentDisease.disease_state_transition(
+                df=df.copy(),
+                dt=2,
+                disease_groups=disease_groups,
+                natural_history=natural_history,
+                execmode=ExecutionModes.vectorized.value,
+                scheduler=stage_scheduler
+                )
+
+            if stage_scheduler is not None:
+                # Only due agents are written, the clock of the rest is
+                # kept by the scheduler
+                assert output_df.loc[2, "disease_state_time"] == 1
+                output_df = scheduler.materialize(output_df)
+
+            assert list(output_df["disease_state"]) == disease_state_expected
+            assert list(output_df["is_dead"]) == is_dead_expected
+            testing.assert_series_equal(
+                output_df["disease_state_time"],
+                Series([0, 0, 3, nan], name="disease_state_time")
+            )
+            testing.assert_series_equal(
+                output_df["disease_state_max_time"],
+                disease_state_max_time_expected
+            )
+
+        # Agent 2 reaches its max time in the next step
+        assert list(scheduler.buckets[2][0]) == [2]
+        assert list(scheduler.pop_due()) == [2]
+
+    def test_update_immunization_params_vectorized(
+        self,
+        fixture_update_immunization
+    ):
+        """
+            Verifies whether update_immunization_params returns the same
+            values in iterative and vectorized `ExecutionModes`, including
+            agents without immunization time distribution and agents that
+            must not be updated.
+        """
+        natural_history, data_dict = fixture_update_immunization
+        columns = [
+            "immunization_level", "immunization_slope",
+            "immunization_time", "immunization_max_time",
+            "do_update_immunization_params"
+            ]
+
+        outputs = [
+            AgentDisease.update_immunization_params(
+                df=DataFrame(data_dict),
+                natural_history=natural_history,
+                execmode=execmode
+            )
+            for execmode in [
+                ExecutionModes.iterative.value,
+                ExecutionModes.vectorized.value
+                ]
+            ]
+
+        testing.assert_frame_equal(
+            outputs[0][columns],
+            outputs[1][columns],
+            check_dtype=False
+        )
+        assert outputs[1]["immunization_max_time"].iloc[1] == 14.0
+        assert outputs[1]["immunization_level"].iloc[2] == 1.0
+
+    def test_update_immunization_level_vectorized(
+        self,
+        fixture_update_immunization
+    ):
+        """
+            Verifies whether update_immunization_level returns the same
+            values in iterative and vectorized `ExecutionModes`.
+        """
+        natural_history, data_dict = fixture_update_immunization
+        columns = [
+            "immunization_level", "immunization_slope",
+            "immunization_time", "immunization_max_time"
+            ]
+
+        outputs = [
+            AgentDisease.update_immunization_level(
+                df=DataFrame(data_dict),
+                dt=2.0,
+                natural_history=natural_history,
+                execmode=execmode
+            )
+            for execmode in [
+                ExecutionModes.iterative.value,
+                ExecutionModes.vectorized.value
+                ]
+            ]
+
+        testing.assert_frame_equal(
+            outputs[0][columns],
+            outputs[1][columns],
+            check_dtype=False
+        )
+        assert outputs[1]["immunization_level"].tolist() == \
+            pytest.approx([0.0, 0.4, 0.2, 0.0, 0.1])
+
     def test_disease_state_transition_ValueError(
             self,
             fixture_transition_function
@@ -3816,3 +4833,474 @@ class TestAgentDisease:
         assert output_tuple[0]["adheres_to_mr_isolation"].iloc[-1] == True
         assert output_tuple[0]["isolated_by_mr"].iloc[0] == True
         assert output_tuple[0]["adheres_to_mr_isolation"].iloc[0] == False
+
+    def test_apply_mobility_restrictions_MRAdherenceGroups_vectorized(
+        self,
+        fixture_apply_mobility_restrictions_cyclic
+    ):
+        """
+            Verifies the adherences of the agents when there are two
+            `mr_adherence_group`; one with a mr_adherence_prob of 1 and the
+            other of zero, and `ExecutionModes` is equals to vectorized.
+        """
+        cyclic_policies = fixture_apply_mobility_restrictions_cyclic[13]
+        input_df = DataFrame(fixture_apply_mobility_restrictions_cyclic[0])
+        global_cyclic_mr = fixture_apply_mobility_restrictions_cyclic[14]
+
+        mr_adherence = MRAdherenceGroups(
+            dist_title="mr_adherence_prob",
+            group_info=[{
+                "name": "mr_adherence_group_1",
+                "dist_info": {
+                    "dist_title": "mr_adherence_prob",
+                    "dist_type": "constant",
+                    "constant": 1
+                }
+            },
+                {
+                "name": "mr_adherence_group_2",
+                "dist_info": {
+                    "dist_title": "mr_adherence_prob",
+                    "dist_type": "constant",
+                    "constant": 0
+                }
+            }]
+        )
+        output_tuple = AgentDisease.apply_mobility_restrictions(
+            step=2,
+            df=input_df,
+            beta=5,
+            global_cyclic_mr=global_cyclic_mr,
+            cyclic_mr_policies={"mr_group_1": cyclic_policies},
+            cmr_policies_df=DataFrame({
+                "step": [1],
+                "global_mr": ["enabled"],
+                "mr_group_1": ["disabled"]
+                }),
+            grace_time_in_steps=0,
+            iteration_time=timedelta(days=1),
+            mr_adherence_groups=mr_adherence,
+            execmode=ExecutionModes.vectorized.value
+        )
+
+        assert output_tuple[2]["mr_group_1"].iloc[-1] == "enabled"
+        assert output_tuple[0]["isolated_by_mr"].tolist() == [True, True]
+        assert output_tuple[0]["adheres_to_mr_isolation"].tolist() == \
+            [False, True]
+
+    def test_apply_mobility_restrictions_tracing_vectorized(
+        self,
+        fixture_apply_mobility_restrictions_tracing
+    ):
+        """
+            Verifies whether apply_mobility_restrictions isolates the
+            same agents in iterative and vectorized `ExecutionModes` when
+            every agent adheres to isolation.
+        """
+        data_df = fixture_apply_mobility_restrictions_tracing[0]
+        mrt_policies = fixture_apply_mobility_restrictions_tracing[1]
+
+        outputs = [
+            AgentDisease.apply_mobility_restrictions(
+                step=2,
+                df=DataFrame(data_df),
+                beta=0.5,
+                mrt_policies={InterestVariables.dead: mrt_policies},
+                mrt_policies_df=DataFrame(
+                    {
+                        "step": 1,
+                        "dead_by_disease": "disabled"
+                    }, index=[0]
+                ),
+                iteration_time=timedelta(days=1),
+                execmode=execmode
+            )
+            for execmode in [
+                ExecutionModes.iterative.value,
+                ExecutionModes.vectorized.value
+                ]
+            ]
+        columns = [
+            "isolated_by_mr", "adheres_to_mr_isolation", "reduction_factor"
+            ]
+
+        testing.assert_frame_equal(
+            outputs[0][0][columns],
+            outputs[1][0][columns],
+            check_dtype=False
+        )
+        assert outputs[1][0]["isolated_by_mr"].tolist() == [True, False]
+        assert outputs[1][0]["reduction_factor"].tolist() == [0.4, 0.8]
+
+    def test_contagion_vectorized(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether contagion_vectorized infects only those
+            susceptible agents inside the spread radius of a spreader
+            and keeps track of who infected them.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        susceptibility_groups = fixture_contagion[2]
+        df = DataFrame(fixture_contagion[3])
+
+        contagion_df = contagion_vectorized(
+            df,
+            natural_history,
+            disease_groups,
+            susceptibility_groups,
+            *fixture_contagion_kdtrees
+        )
+
+        assert contagion_df["disease_state"].tolist() == [
+            "latency", "infectious", "susceptible", "susceptible", "latency"
+        ]
+        assert contagion_df["infected_by"].tolist() == [[1], [], [], [], [1]]
+        assert contagion_df["times_infected"].tolist() == [1, 1, 0, 0, 1]
+        assert contagion_df["disease_state_time"][0] == 0
+        assert contagion_df["disease_state_time"][1] == 1.0
+        assert all(contagion_df["do_calculate_max_time"].eq(
+            [True, False, False, False, True]
+        ))
+        assert all(contagion_df.index == df.index)
+
+    def test_disease_state_transition_by_contagion_vectorized(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether `disease_state_transition_by_contagion`
+            gives the same result in vectorized and iterative execmode.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        susceptibility_groups = fixture_contagion[2]
+
+        outputs = []
+        for execmode in [
+            ExecutionModes.iterative.value,
+            ExecutionModes.vectorized.value
+        ]:
+            df = DataFrame(fixture_contagion[3])
+            df = AgentDisease.disease_state_transition_by_contagion(
+                df=df,
+                kdtree_by_disease_state=fixture_contagion_kdtrees[0],
+                agents_labels_by_disease_state=fixture_contagion_kdtrees[1],
+                natural_history=natural_history,
+                disease_groups=disease_groups,
+                susceptibility_groups=susceptibility_groups,
+                execmode=execmode
+            )
+            outputs.append(df)
+
+        columns = ["disease_state", "key", "times_infected",
+                   "disease_state_time", "disease_state_max_time"]
+        testing.assert_frame_equal(
+            outputs[0][columns],
+            outputs[1][columns].astype({"key": str}),
+            check_dtype=False
+        )
+        assert outputs[1]["infected_by"].tolist() == [[1], [], [], [], [1]]
+
+    def test_disease_state_transition_by_contagion_multiprocessing(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether `disease_state_transition_by_contagion`
+            gives the same result in iterative and multiprocessing execmode.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        susceptibility_groups = fixture_contagion[2]
+
+        outputs = []
+        for execmode in [
+            ExecutionModes.iterative.value,
+            ExecutionModes.multiprocessing.value
+        ]:
+            df = AgentDisease.disease_state_transition_by_contagion(
+                df=DataFrame(fixture_contagion[3]),
+                kdtree_by_disease_state=fixture_contagion_kdtrees[0],
+                agents_labels_by_disease_state=fixture_contagion_kdtrees[1],
+                natural_history=natural_history,
+                disease_groups=disease_groups,
+                susceptibility_groups=susceptibility_groups,
+                execmode=execmode,
+                npartitions=2
+            )
+            outputs.append(df)
+
+        testing.assert_frame_equal(outputs[0], outputs[1])
+
+    def test_multi_exposure_infection(self):
+        """
+            Verifies whether multi_exposure_infection gives each contact
+            its own success probability and infects each agent with
+            probability 1 - (1 - p_1) * ... * (1 - p_n).
+        """
+        seed(0)
+        n_agents = 20000
+        susceptibles = repeat(range(n_agents), 3)
+        probabilities = tile([0.3, 0.5, 0.0], n_agents)
+
+        success = multi_exposure_infection(
+            susceptibles, probabilities
+            ).reshape(n_agents, 3)
+
+        assert success.any(axis=1).mean() == pytest.approx(0.65, abs=0.02)
+        assert success.mean(axis=0) == pytest.approx([0.3, 0.5, 0.0], abs=0.02)
+
+        # Certain contacts always succeed
+        success = multi_exposure_infection(
+            array([0, 0, 1]), array([1.0, 1.0, 0.0])
+            )
+        assert success.tolist() == [True, True, False]
+
+    def test_disease_state_transition_by_contagion_closed_form(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether `disease_state_transition_by_contagion` gives
+            the same result with the closed form kernel when contagion is
+            certain.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        susceptibility_groups = fixture_contagion[2]
+
+        df = AgentDisease.disease_state_transition_by_contagion(
+            df=DataFrame(fixture_contagion[3]),
+            kdtree_by_disease_state=fixture_contagion_kdtrees[0],
+            agents_labels_by_disease_state=fixture_contagion_kdtrees[1],
+            natural_history=natural_history,
+            disease_groups=disease_groups,
+            susceptibility_groups=susceptibility_groups,
+            execmode=ExecutionModes.vectorized.value,
+            closed_form=True
+        )
+
+        assert df["infected_by"].tolist() == [[1], [], [], [], [1]]
+        assert df["times_infected"].tolist() == [1, 1, 0, 0, 1]
+
+    def test_contagion_candidates(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether contagion_candidates keeps only the agents
+            that can get infected and have a spreader inside the spread
+            radius.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+
+        candidates = contagion_candidates(
+            DataFrame(fixture_contagion[3]),
+            natural_history,
+            disease_groups,
+            *fixture_contagion_kdtrees
+            )
+
+        assert candidates.tolist() == [0, 3, 4]
+
+    def test_disease_state_transition_by_contagion_dask(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether `disease_state_transition_by_contagion`
+            evaluates only the working set when execmode is set to dask,
+            leaving the rest of the agents untouched.
+        """
+        natural_history = fixture_contagion[0]
+        disease_groups = fixture_contagion[1]
+        susceptibility_groups = fixture_contagion[2]
+
+        df = AgentDisease.disease_state_transition_by_contagion(
+            df=DataFrame(fixture_contagion[3]),
+            kdtree_by_disease_state=fixture_contagion_kdtrees[0],
+            agents_labels_by_disease_state=fixture_contagion_kdtrees[1],
+            natural_history=natural_history,
+            disease_groups=disease_groups,
+            susceptibility_groups=susceptibility_groups,
+            execmode=ExecutionModes.dask.value,
+            npartitions=2
+        )
+
+        assert df["disease_state"].tolist() == [
+            "latency", "infectious", "susceptible", "susceptible", "latency"
+            ]
+        assert df["key"].tolist() == [
+            "not_vulnerable-latency",
+            "not_vulnerable-infectious",
+            "not_vulnerable-susceptible",
+            "not_vulnerable-susceptible",
+            "not_vulnerable-latency"
+            ]
+        assert df["times_infected"].tolist() == [1, 1, 0, 0, 1]
+        assert df["disease_state_time"].tolist()[:2] == [0.0, 1.0]
+        assert df["infected_by"].tolist() == [[1], [], [], [], [1]]
+        assert not df["do_calculate_max_time"].any()
+
+    def test_alertness_vectorized(
+        self,
+        fixture_alertness
+    ):
+        """
+            Verifies whether alertness_vectorized alerts only the agents
+            with an avoidable agent inside the avoidance radius and keeps
+            track of who alerted them.
+        """
+        natural_history, disease_groups, df, kdtrees, labels = \
+            fixture_alertness
+
+        alertness_df = alertness_vectorized(
+            df,
+            natural_history,
+            disease_groups,
+            kdtrees,
+            labels,
+            "dead"
+            )
+
+        assert alertness_df["is_alert"].tolist() == \
+            [True, False, False, True, True]
+        assert [
+            alerted_by.tolist() for alerted_by in alertness_df["alerted_by"]
+            ] == [[1], [], [], [1], [1]]
+
+    def test_update_alertness_state_vectorized(
+        self,
+        fixture_alertness
+    ):
+        """
+            Verifies whether update_alertness_state returns the same
+            values in iterative and vectorized `ExecutionModes`.
+        """
+        natural_history, disease_groups, df, kdtrees, labels = \
+            fixture_alertness
+
+        outputs = [
+            AgentDisease.update_alertness_state(
+                df=df.copy(),
+                kdtree_by_disease_state=kdtrees,
+                agents_labels_by_disease_state=labels,
+                natural_history=natural_history,
+                disease_groups=disease_groups,
+                dead_disease_group="dead",
+                execmode=execmode
+            )
+            for execmode in [
+                ExecutionModes.iterative.value,
+                ExecutionModes.vectorized.value
+                ]
+            ]
+
+        assert outputs[0]["is_alert"].tolist() == \
+            outputs[1]["is_alert"].tolist()
+        assert outputs[0]["alerted_by"].apply(list).tolist() == \
+            outputs[1]["alerted_by"].apply(list).tolist()
+
+    def test_update_alertness_state_alertness_trait(
+        self,
+        fixture_alertness
+    ):
+        """
+            Verifies whether update_alertness_state uses the alertness
+            trait of each agent instead of sampling `alertness_prob`, and
+            draws the missing traits of trait distributions.
+        """
+        natural_history, disease_groups, df, kdtrees, labels = \
+            fixture_alertness
+        df = df.assign(alertness_trait=[0.0, nan, nan, nan, nan])
+        natural_history.items["not_vulnerable-susceptible"] \
+            .dist["alertness_prob"].trait = True
+
+        for execmode in [
+            ExecutionModes.iterative.value,
+            ExecutionModes.vectorized.value
+        ]:
+            output = AgentDisease.update_alertness_state(
+                df=df.copy(),
+                kdtree_by_disease_state=kdtrees,
+                agents_labels_by_disease_state=labels,
+                natural_history=natural_history,
+                disease_groups=disease_groups,
+                dead_disease_group="dead",
+                execmode=execmode
+            )
+
+            assert output["is_alert"].tolist() == \
+                [False, False, False, True, True]
+            assert output["alertness_trait"].tolist()[0] == 0.0
+            assert output["alertness_trait"].tolist()[3:] == [1.0, 1.0]
+            assert isnan(output["alertness_trait"][1])
+
+    def test_init_traits(self, fixture_contagion):
+        """
+            Verifies whether init_traits draws the susceptibility trait
+            only for trait distributions.
+        """
+        susceptibility_groups = fixture_contagion[2]
+        df = DataFrame(fixture_contagion[3])
+
+        df = AgentDisease.init_traits(
+            df, susceptibility_groups, fixture_contagion[0]
+            )
+        assert df["susceptibility_trait"].isna().all()
+        assert df["alertness_trait"].isna().all()
+
+        susceptibility_groups.items["susceptibility_1"] \
+            .dist["susceptibility_dist"].trait = True
+
+        df = AgentDisease.init_traits(
+            df, susceptibility_groups, fixture_contagion[0]
+            )
+        assert df["susceptibility_trait"].tolist() == [1.0]*5
+        assert df["susceptibility_trait"].dtype == float
+
+    def test_disease_state_transition_by_contagion_susceptibility_trait(
+        self,
+        fixture_contagion,
+        fixture_contagion_kdtrees
+    ):
+        """
+            Verifies whether `disease_state_transition_by_contagion` uses
+            the susceptibility trait of each agent and drops the alertness
+            trait of the agents that got infected.
+        """
+        for execmode in [
+            ExecutionModes.iterative.value,
+            ExecutionModes.vectorized.value,
+            ExecutionModes.multiprocessing.value
+        ]:
+            df = DataFrame(fixture_contagion[3]).assign(
+                susceptibility_trait=[0.0, nan, nan, nan, nan],
+                alertness_trait=0.5
+                )
+            df = AgentDisease.disease_state_transition_by_contagion(
+                df=df,
+                kdtree_by_disease_state=fixture_contagion_kdtrees[0],
+                agents_labels_by_disease_state=fixture_contagion_kdtrees[1],
+                natural_history=fixture_contagion[0],
+                disease_groups=fixture_contagion[1],
+                susceptibility_groups=fixture_contagion[2],
+                execmode=execmode
+                )
+
+            assert df["disease_state"].tolist() == [
+                "susceptible", "infectious", "susceptible",
+                "susceptible", "latency"
+                ]
+            assert df["alertness_trait"].tolist()[:4] == [0.5]*4
+            assert isnan(df["alertness_trait"][4])
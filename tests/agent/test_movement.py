@@ -29,6 +29,7 @@ from abmodel.agent.movement import AgentMovement
 from abmodel.models.population import BoxSize
 from abmodel.utils.distributions import Distribution
 from abmodel.models.disease import MobilityGroups
+from abmodel.utils.execution_modes import ExecutionModes
 
 
 class TestCaseAgentMovement:
@@ -1472,6 +1473,50 @@ class TestCaseAgentMovement:
         assert round(abs(df.vx[0]), 12) == round(cos(expected_angle), 12)
         assert round(abs(df.vy[0]), 12) == round(sin(expected_angle), 12)
 
+    def test_avoid_agents_numba(
+        self,
+        fixture_avoid_agents_different_rel_angles
+    ):
+        """
+            Two agents avoid one agent with different relative angles when
+            execmode is set to numba.
+        """
+        df = DataFrame(pytest.data)
+        df_to_avoid = DataFrame(pytest.data_avoid)
+        df = AgentMovement.avoid_agents(
+            df,
+            df_to_avoid,
+            execmode=ExecutionModes.numba.value
+            )
+        expected_angles = [3*pi/2, 7*pi/4]
+
+        for i in range(len(expected_angles)):
+            assert round(df.vx[i], 12) == round(cos(expected_angles[i]), 12)
+            assert round(df.vy[i], 12) == round(sin(expected_angles[i]), 12)
+
+    def test_avoid_agents_numba_one_avoids_three(
+        self,
+        fixture_avoid_agents_one_agent_avoids_three
+    ):
+        """
+            One agent avoids three agents with different relative angles
+            when execmode is set to numba, and the rest keep their
+            velocities.
+        """
+        df = DataFrame(pytest.data)
+        df_to_avoid = DataFrame(pytest.data_avoid)
+        df = AgentMovement.avoid_agents(
+            df,
+            df_to_avoid,
+            execmode=ExecutionModes.numba.value
+            )
+        expected_angle = pi
+
+        assert round(df.vx[0], 12) == round(sqrt(2)*cos(expected_angle), 12)
+        assert round(df.vy[0], 12) == round(sqrt(2)*sin(expected_angle), 12)
+        assert df.vx[1:].tolist() == [0.0, 10, 20]
+        assert df.vy[1:].tolist() == [1, 10, 20]
+
     def test_avoid_agents_raise_error(self, fixture_avoid_agents_raise_error):
         """
         Raises an exception when the input DataFrame column `agent`
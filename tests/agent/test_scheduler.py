@@ -0,0 +1,133 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from numpy import array, nan
+from pandas import DataFrame
+
+from abmodel.agent.scheduler import TransitionScheduler
+
+
+class TestCaseTransitionScheduler:
+    """
+        Verifies the functionality of the TransitionScheduler class
+        from agent.
+    """
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    def test_schedule_buckets(self):
+        """
+            Agents are put in the bucket of the step in which their disease
+            state expires, and agents without max time are not scheduled.
+        """
+        scheduler = TransitionScheduler(dt=0.5)
+        scheduler.schedule(
+            array([0, 1, 2, 3]),
+            array([0.0, 0.0, 1.0, 0.0]),
+            array([1.0, 1.2, 1.0, nan])
+            )
+
+        assert sorted(scheduler.buckets.keys()) == [1, 2, 3]
+        assert list(scheduler.buckets[2][0]) == [0]
+        assert list(scheduler.buckets[3][0]) == [1]
+        assert list(scheduler.buckets[1][0]) == [2]
+
+    def test_pop_due(self):
+        """
+            Only due agents that still have a clock are returned as sorted
+            labels, and stale entries are dropped.
+        """
+        scheduler = TransitionScheduler(dt=1.0)
+        scheduler.schedule(
+            array([5, 7, 9]),
+            array([0.0, 0.0, 0.0]),
+            array([1.0, 1.0, 1.0])
+            )
+
+        # Agent 7 was rescheduled (e.g. by contagion) and agent 9 was
+        # removed from the population
+        scheduler.schedule(array([7]), array([0.0]), array([4.0]))
+        scheduler.discard(array([9]))
+
+        due = scheduler.pop_due()
+
+        assert list(due) == [5]
+        assert scheduler.step == 1
+        assert list(scheduler.buckets[4][0]) == [7]
+        assert len(scheduler.pop_due()) == 0
+
+    def test_pop_due_reschedules_early_agents(self):
+        """
+            Agents popped before reaching their max time are put back in
+            the bucket of the step in which they are due.
+        """
+        scheduler = TransitionScheduler(dt=1.0)
+        scheduler.schedule(array([3]), array([0.0]), array([2.0]))
+
+        # Bucket entry written as if the agent were due in the next step
+        scheduler.buckets[1] = [array([3])]
+        scheduler.clocks.loc[3, "due_step"] = 1.0
+
+        assert len(scheduler.pop_due()) == 0
+        assert list(scheduler.buckets[2][0]) == [3]
+        assert list(scheduler.pop_due()) == [3]
+
+    def test_upcoming(self):
+        """
+            Agents of the next bucket that still have a clock are returned.
+        """
+        scheduler = TransitionScheduler(dt=1.0)
+        scheduler.schedule(
+            array([1, 2, 3]),
+            array([0.0, 0.0, 0.0]),
+            array([1.0, 1.0, 2.0])
+            )
+        scheduler.discard(array([2]))
+
+        assert list(scheduler.upcoming()) == [1]
+
+    def test_times_and_materialize(self):
+        """
+            The disease state time of each agent is increased by dt for each
+            step elapsed since its clock was written.
+        """
+        scheduler = TransitionScheduler(dt=0.5)
+        scheduler.schedule(
+            array([10, 20]),
+            array([0.0, 1.0]),
+            array([5.0, nan])
+            )
+        scheduler.pop_due()
+        scheduler.pop_due()
+        scheduler.schedule(array([20]), array([0.0]), array([nan]))
+        scheduler.pop_due()
+
+        assert list(scheduler.times(array([10, 20]))) == [1.5, 0.5]
+
+        df = DataFrame({"disease_state_time": [0.0, 0.0]}, index=[10, 20])
+        df = scheduler.materialize(df.copy())
+        assert list(df["disease_state_time"]) == [1.5, 0.5]
+
+        df = DataFrame({"disease_state_time": [0.0, 0.0]}, index=[10, 20])
+        df = scheduler.materialize(df, array([20]))
+        assert list(df["disease_state_time"]) == [0.0, 0.5]
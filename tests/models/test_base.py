@@ -21,6 +21,8 @@
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
 import pytest
+from numpy import array, isnan
+from pandas import Categorical
 
 from abmodel.models import SimpleGroups, DistributionGroup
 from abmodel.models import SimpleDistGroups
@@ -247,3 +249,45 @@ class TestClassDisease:
         assert getattr(
             simple_dist_group.items["group_name_2"], "dist"
         )["group_name_2"].dist_type == "numpy"
+
+    def test_SimpleDistGroups_sample_by_group(self):
+        """
+            Verifies whether sample_by_group draws one sample for each label
+            from the distribution of its group, with nan for the groups
+            whose distribution is None.
+        """
+        group_info = [
+            {
+                "name": "group_name_1",
+                "dist_info": {
+                    "dist_title": "group_1",
+                    "dist_type": "constant",
+                    "constant": 2.9
+                }
+            },
+            {
+                "name": "group_name_2",
+                "dist_info": {
+                    "dist_title": "group_1",
+                    "dist_type": None
+                }
+            }
+        ]
+
+        simple_dist_groups = SimpleDistGroups("group_1", group_info)
+
+        labels = array(["group_name_2", "group_name_1", "group_name_1"])
+        samples = simple_dist_groups.sample_by_group(labels, "group_1")
+
+        assert isnan(samples[0])
+        assert samples[1:].tolist() == [2.9, 2.9]
+
+        categorical = Categorical(
+            labels, categories=["group_name_1", "group_name_2"]
+        )
+        assert simple_dist_groups.sample_by_group(
+            categorical, "group_1"
+        )[1:].tolist() == [2.9, 2.9]
+        assert simple_dist_groups.sample_by_group(
+            array([]), "group_1"
+        ).size == 0
@@ -21,6 +21,7 @@
 # Carolina Rojas Duque (https://github.com/carolinarojasd)
 
 import pytest
+from pandas import Series
 
 from abmodel.models import DistTitles, SusceptibilityGroups
 from abmodel.models import ImmunizationGroups, MobilityGroups
@@ -691,3 +692,54 @@ class TestClassDisease:
         )["time_dist"].dist_type == "numpy"
         with pytest.raises(AttributeError):
             natural_history.transitions
+
+    def test_NaturalHistory_key_categorical(self, fixture_NaturalHistory):
+        """
+            Verifies whether NaturalHistory builds the keys of the agents
+            as a categorical whose codes index `keys`, with missing values
+            for unknown groups.
+        """
+        dist_title = fixture_NaturalHistory[0]
+        group_info = fixture_NaturalHistory[1]
+
+        natural_history = NaturalHistory(
+            dist_title,
+            group_info
+        )
+
+        assert natural_history.vulnerability_groups == [
+            "not_vulnerable", "vulnerable"
+        ]
+        assert natural_history.disease_groups == ["suceptible"]
+        assert natural_history.keys == [
+            "not_vulnerable-suceptible", "vulnerable-suceptible"
+        ]
+
+        key = natural_history.key_categorical(
+            Series(["vulnerable", "not_vulnerable", "unknown"]),
+            Series(["suceptible", "suceptible", "suceptible"])
+        )
+
+        assert key.codes.tolist() == [1, 0, -1]
+        assert key[0] == "vulnerable-suceptible"
+
+    def test_NaturalHistory_transition_sampler(self, fixture_NaturalHistory):
+        """
+            Verifies whether NaturalHistory builds the transition sampler
+            of a key once and samples its transitions.
+        """
+        dist_title = fixture_NaturalHistory[0]
+        group_info = fixture_NaturalHistory[1]
+
+        natural_history = NaturalHistory(
+            dist_title,
+            group_info
+        )
+
+        sampler = natural_history.transition_sampler("vulnerable-suceptible")
+
+        assert sampler is natural_history.transition_sampler(
+            "vulnerable-suceptible"
+        )
+        assert sampler.sample() == "transition_1"
+        assert all(sampler.sample(3) == "transition_1")
@@ -0,0 +1,149 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+import pytest
+from numpy import array
+from pandas.core.frame import DataFrame
+
+from abmodel.population.active_sets import ActiveSets, has_probability
+from abmodel.models.disease import DiseaseStates
+from abmodel.utils.distributions import Distribution
+
+
+class TestActiveSets:
+    """Unitary tests for ActiveSets class from active_sets module"""
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    # ========================================================================
+    # Fixtures
+    # ========================================================================
+
+    @pytest.fixture
+    def fixture_active_sets(self) -> tuple[ActiveSets, DataFrame]:
+        def dist_info(dist_title, constant=None):
+            return {
+                "dist_title": dist_title,
+                "dist_type": None if constant is None else "constant",
+                "constant": constant,
+                "dist_name": None,
+                "filename": None,
+                "data": None,
+                "kwargs": {}
+                }
+
+        def disease_state(name, is_infected, hospitalization_prob, is_dead):
+            return {
+                "name": name,
+                "can_get_infected": name == "susceptible",
+                "is_infected": is_infected,
+                "can_spread": is_infected,
+                "spread_radius": None,
+                "spread_radius_unit": None,
+                "spread_probability": None,
+                "is_dead": is_dead,
+                "dist_info": [
+                    dist_info("hospitalization_prob", hospitalization_prob),
+                    dist_info("ICU_prob", 0.0)
+                    ]
+                }
+
+        disease_groups = DiseaseStates(
+            dist_title=["hospitalization_prob", "ICU_prob"],
+            group_info=[
+                disease_state("susceptible", False, None, False),
+                disease_state("mild", True, 0.0, False),
+                disease_state("severe", True, 0.5, False),
+                disease_state("dead", False, None, True)
+                ]
+            )
+        df = DataFrame(
+            {
+                "disease_state": ["susceptible", "mild", "severe", "mild"],
+                "is_dead": [False, False, False, False],
+                "is_diagnosed": [False, True, False, True],
+                "is_isolated": [False, True, False, False],
+                "is_hospitalized": [False, False, True, False]
+            },
+            index=[3, 5, 8, 9]
+            )
+        return ActiveSets(disease_groups), df
+
+    # ========================================================================
+    # Tests
+    # ========================================================================
+
+    def test_has_probability(self):
+        """
+        Verifies that missing, untyped and zero constant distributions have
+        no probability.
+        """
+        assert not has_probability(None)
+        assert not has_probability(Distribution(dist_type=None))
+        assert not has_probability(
+            Distribution(dist_type="constant", constant=0.0)
+            )
+        assert has_probability(
+            Distribution(dist_type="constant", constant=0.1)
+            )
+
+    def test_update(self, fixture_active_sets):
+        """
+        Verifies that `update` only checks again the given agents and that
+        `labels` joins the categories.
+        """
+        active_sets, df = fixture_active_sets
+        active_sets.update(df)
+
+        assert active_sets.hospitalizable_states == ["severe"]
+        assert all(
+            active_sets.labels("infected", "diagnosed") == array([5, 8, 9])
+            )
+        assert all(
+            active_sets.labels("isolated", "hospitalized") == array([5, 8])
+            )
+
+        df.loc[3, "disease_state"] = "severe"
+        df.loc[9, "is_diagnosed"] = False
+        active_sets.update(df.loc[[3, 9]])
+
+        assert all(
+            active_sets.labels("hospitalizable") == array([3, 8])
+            )
+        assert all(active_sets.labels("diagnosed") == array([5]))
+        active_sets.verify(df)
+
+        active_sets.discard(array([5]))
+        assert active_sets.labels("isolated").size == 0
+
+    def test_verify_raise_error(self, fixture_active_sets):
+        """
+        Raises a ValueError when the sets are outdated.
+        """
+        active_sets, df = fixture_active_sets
+        active_sets.update(df)
+
+        df.loc[8, "is_hospitalized"] = False
+
+        with pytest.raises(ValueError, match="hospitalized"):
+            active_sets.verify(df)
@@ -0,0 +1,199 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+import pytest
+from numpy import array
+from pandas.core.frame import DataFrame
+
+from abmodel.population.hospital import Hospital
+from abmodel.utils import ExecutionModes
+from abmodel.models import HealthSystem
+from abmodel.models.disease import DiseaseStates
+
+
+class TestHospital:
+    """Unitary tests for Hospital class from hospital module"""
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    # ========================================================================
+    # Fixtures
+    # ========================================================================
+
+    @pytest.fixture
+    def fixture_hospital(self) -> Hospital:
+        def dist_info(dist_title, constant=None):
+            return {
+                "dist_title": dist_title,
+                "dist_type": None if constant is None else "constant",
+                "constant": constant,
+                "dist_name": None,
+                "filename": None,
+                "data": None,
+                "kwargs": {}
+                }
+
+        def disease_state(name, probability, is_dead):
+            return {
+                "name": name,
+                "can_get_infected": False,
+                "is_infected": not is_dead,
+                "can_spread": False,
+                "spread_radius": None,
+                "spread_radius_unit": None,
+                "spread_probability": None,
+                "is_dead": is_dead,
+                "dist_info": [
+                    dist_info("hospitalization_prob", probability),
+                    dist_info("ICU_prob", probability)
+                    ]
+                }
+
+        disease_groups = DiseaseStates(
+            dist_title=["hospitalization_prob", "ICU_prob"],
+            group_info=[
+                disease_state("mild", 0.0, False),
+                disease_state("critical", 1.0, False),
+                disease_state("dead", None, True)
+                ]
+            )
+
+        return Hospital(
+            HealthSystem(hospital_capacity=2, ICU_capacity=1),
+            disease_groups,
+            "dead",
+            0.5
+            )
+
+    # ========================================================================
+    # Tests
+    # ========================================================================
+
+    def test_evolve_overload(self, fixture_hospital):
+        """
+            Verifies whether the agents that do not fit in ICU die and the
+            occupancy counters are updated.
+        """
+        df = DataFrame(
+            {
+                "is_hospitalized": False,
+                "is_in_ICU": False,
+                "disease_state": ["critical", "critical", "critical", "mild"],
+                "is_dead": False,
+                "reduction_factor": 1.0
+            },
+            index=[3, 5, 8, 9]
+            )
+
+        changed_df = fixture_hospital.evolve(df)
+
+        assert changed_df.index.tolist() == [3, 5, 8]
+        assert changed_df["is_dead"].sum() == 2
+        assert changed_df["disease_state"].tolist().count("dead") == 2
+        assert changed_df["is_in_ICU"].sum() == 1
+        assert changed_df["is_hospitalized"].tolist() == \
+            changed_df["is_in_ICU"].tolist()
+        assert changed_df["reduction_factor"].sum() == 2.5
+        assert fixture_hospital.occupancy == 1
+        assert fixture_hospital.ICU_occupancy == 1
+
+    def test_evolve_overload_numba(self, fixture_hospital):
+        """
+            Verifies whether the agents that do not fit in ICU die when the
+            triage is done by the compiled kernel.
+        """
+        fixture_hospital.execmode = ExecutionModes.numba.value
+        df = DataFrame(
+            {
+                "is_hospitalized": False,
+                "is_in_ICU": False,
+                "disease_state": ["critical", "critical", "critical", "mild"],
+                "is_dead": False,
+                "reduction_factor": 1.0
+            },
+            index=[3, 5, 8, 9]
+            )
+
+        changed_df = fixture_hospital.evolve(df)
+
+        assert changed_df.index.tolist() == [3, 5, 8]
+        assert changed_df["is_dead"].sum() == 2
+        assert changed_df["is_in_ICU"].sum() == 1
+        assert fixture_hospital.occupancy == 1
+        assert fixture_hospital.ICU_occupancy == 1
+
+    def test_evolve_keeps_places_of_patients_outside_df(
+        self,
+        fixture_hospital
+    ):
+        """
+            Verifies whether the patients that are not in the evolved rows
+            keep their places, so the new critical agents do not fit in ICU.
+        """
+        fixture_hospital.patients.add(0)
+        fixture_hospital.ICU_patients.add(0)
+        df = DataFrame(
+            {
+                "is_hospitalized": False,
+                "is_in_ICU": False,
+                "disease_state": ["critical", "critical"],
+                "is_dead": False,
+                "reduction_factor": 1.0
+            },
+            index=[1, 2]
+            )
+
+        changed_df = fixture_hospital.evolve(df)
+
+        assert changed_df["is_dead"].all()
+        assert not changed_df["is_in_ICU"].any()
+        assert fixture_hospital.patients == {0}
+        assert fixture_hospital.ICU_patients == {0}
+
+    def test_evolve_discharge(self, fixture_hospital):
+        """
+            Verifies whether only the discharged patient is returned and
+            whether it is discharged from the occupancy counters.
+        """
+        df = DataFrame(
+            {
+                "is_hospitalized": [True, False, True],
+                "is_in_ICU": [False, False, True],
+                "disease_state": ["mild", "mild", "critical"],
+                "is_dead": False,
+                "reduction_factor": [0.5, 1.0, 0.5]
+            },
+            index=[0, 1, 2]
+            )
+        fixture_hospital.admit(df)
+
+        changed_df = fixture_hospital.evolve(df)
+
+        assert changed_df.index.tolist() == [0]
+        assert not changed_df.loc[0, "is_hospitalized"]
+        assert changed_df.loc[0, "reduction_factor"] == 1.0
+        assert fixture_hospital.patients == {2}
+        assert fixture_hospital.ICU_patients == {2}
+
+        fixture_hospital.discard(array([2]))
+
+        assert fixture_hospital.occupancy == 0
@@ -0,0 +1,109 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+import pytest
+from math import nan
+from numpy import allclose, array
+from pandas.core.frame import DataFrame
+
+from abmodel.agent.disease import update_immunization_level_vectorized
+from abmodel.population.lazy_timers import ImmunizationTimer
+
+
+class TestImmunizationTimer:
+    """Unitary tests for ImmunizationTimer class from lazy_timers module"""
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    # ========================================================================
+    # Fixtures
+    # ========================================================================
+
+    @pytest.fixture
+    def fixture_immunization_df(self) -> DataFrame:
+        return DataFrame(
+            {
+                "immunization_level": [0.6, 0.9, 0.0, 0.5],
+                "immunization_slope": [-0.2, -0.3, nan, nan],
+                "immunization_time": [0.0, 1.0, nan, 0.0],
+                "immunization_max_time": [3.0, 3.0, nan, nan]
+            },
+            index=[0, 2, 5, 7]
+            )
+
+    # ========================================================================
+    # Tests
+    # ========================================================================
+
+    def test_values(self, fixture_immunization_df):
+        """
+            Verifies whether the immunization columns computed by the timer
+            match those updated in every step by
+            `update_immunization_level_vectorized`.
+        """
+        dt = 0.5
+        timer = ImmunizationTimer(dt)
+        timer.absorb(fixture_immunization_df)
+
+        df = fixture_immunization_df
+        for step in range(8):
+            assert allclose(
+                timer.values(df.index.to_numpy()).to_numpy(),
+                df.to_numpy(),
+                equal_nan=True
+                )
+
+            timer.tick()
+            df = update_immunization_level_vectorized(
+                dt,
+                df["immunization_level"],
+                df["immunization_slope"],
+                df["immunization_time"],
+                df["immunization_max_time"]
+                )
+
+    def test_materialize_and_absorb(self, fixture_immunization_df):
+        """
+            Verifies whether the timer only writes the requested agents and
+            keeps counting from the values it absorbs.
+        """
+        timer = ImmunizationTimer(1.0)
+        timer.absorb(fixture_immunization_df)
+        timer.tick()
+
+        df = timer.materialize(fixture_immunization_df.copy(), array([2]))
+
+        assert allclose(
+            df.loc[2].to_numpy(), [0.6, -0.3, 2.0, 3.0], equal_nan=True
+            )
+        assert df.loc[0, "immunization_time"] == 0.0
+
+        # Restart the immunization of agent 2
+        df.loc[2, ["immunization_level", "immunization_time"]] = [1.0, 0.0]
+        timer.absorb(df.loc[[2]])
+        timer.tick()
+        timer.discard(array([5, 7]))
+
+        df = timer.materialize(df.loc[[0, 2]].copy())
+
+        assert df["immunization_level"].tolist() == pytest.approx([0.2, 0.7])
+        assert df["immunization_time"].tolist() == [2.0, 1.0]
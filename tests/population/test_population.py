@@ -0,0 +1,401 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+from numpy.random import seed
+
+from abmodel.population.population import Population
+from abmodel.models import Configutarion
+from abmodel.models import HealthSystem
+from abmodel.models.population import BoxSize
+from abmodel.models.base import SimpleGroups
+from abmodel.models.disease import DiseaseStates, NaturalHistory
+from abmodel.models.disease import MobilityGroups, SusceptibilityGroups
+from abmodel.models.mobility_restrictions import InterestVariables
+from abmodel.models.mobility_restrictions import MRTimeUnits, MRTStopModes
+from abmodel.models.mobility_restrictions import MRTracingPolicies
+from abmodel.utils.execution_modes import ExecutionModes
+
+
+def dist_info(
+    dist_title: str,
+    constant: Optional[float] = None
+) -> dict:
+    return {
+        "dist_title": dist_title,
+        "dist_type": None if constant is None else "constant",
+        "constant": constant,
+        "dist_name": None,
+        "filename": None,
+        "data": None,
+        "kwargs": {}
+        }
+
+
+class TestPopulation:
+    """Unitary tests for Population class from population module"""
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    # ========================================================================
+    # Fixtures
+    # ========================================================================
+
+    @pytest.fixture
+    def fixture_population(self):
+        def disease_state(name, is_infected, diagnosis_prob, is_dead=False):
+            return {
+                "name": name,
+                "can_get_infected": name == "susceptible",
+                "is_infected": is_infected,
+                "can_spread": is_infected,
+                "spread_radius": 2.0 if is_infected else None,
+                "spread_radius_unit": "meters",
+                "spread_probability": 0.5 if is_infected else None,
+                "is_dead": is_dead,
+                "dist_info": [
+                    dist_info("diagnosis_prob", diagnosis_prob),
+                    dist_info("isolation_days", 5.0),
+                    dist_info("hospitalization_prob", 0.0),
+                    dist_info("ICU_prob", 0.0)
+                    ]
+                }
+
+        def natural_history_item(disease_group, transitions, radius, time):
+            return {
+                "vulnerability_group": "not_vulnerable",
+                "disease_group": disease_group,
+                "avoidance_radius": radius,
+                "avoidance_radius_unit": "meters",
+                "transition_by_contagion": disease_group == "susceptible",
+                "transitions": [
+                    {
+                        "transition_name": transition_name,
+                        "probability": probability,
+                        "immunization_gain": 0.0,
+                        "dist_info": dist_info(
+                            "immunization_time_distribution"
+                            )
+                    }
+                    for transition_name, probability in transitions
+                    ],
+                "dist_info": [
+                    dist_info("time_dist", time),
+                    dist_info("alertness_prob", 1.0)
+                    ]
+                }
+
+        def build(
+            diagnosis_prob,
+            avoidance_radius,
+            execmode=ExecutionModes.iterative.value,
+            **kwargs
+        ):
+            disease_groups = DiseaseStates(
+                dist_title=["diagnosis_prob", "isolation_days",
+                            "hospitalization_prob", "ICU_prob"],
+                group_info=[
+                    disease_state("susceptible", False, None),
+                    disease_state("infected", True, diagnosis_prob),
+                    disease_state("recovered", False, None),
+                    disease_state("dead", False, None, is_dead=True)
+                    ]
+                )
+            natural_history = NaturalHistory(
+                dist_title=["time_dist", "alertness_prob"],
+                group_info=[
+                    natural_history_item(
+                        "susceptible", [("infected", 1.0)],
+                        avoidance_radius, None
+                        ),
+                    natural_history_item(
+                        "infected", [("recovered", 0.9), ("dead", 0.1)],
+                        avoidance_radius, 3.0
+                        ),
+                    natural_history_item(
+                        "recovered", [], avoidance_radius, None
+                        ),
+                    natural_history_item(
+                        "dead", [], avoidance_radius, None
+                        )
+                    ]
+                )
+            return Population(
+                configuration=Configutarion(
+                    population_number=50,
+                    initial_date=datetime(2020, 1, 1),
+                    iteration_time=timedelta(days=1),
+                    box_size=BoxSize(-10, 10, -10, 10),
+                    alpha=0.5,
+                    beta=0.5
+                    ),
+                health_system=HealthSystem(
+                    hospital_capacity=10,
+                    ICU_capacity=2
+                    ),
+                age_groups=SimpleGroups(names=["adult"]),
+                vulnerability_groups=SimpleGroups(names=["not_vulnerable"]),
+                mr_groups=SimpleGroups(names=["MR_1"]),
+                susceptibility_groups=SusceptibilityGroups(
+                    dist_title="susceptibility_dist",
+                    group_info=[{
+                        "name": "SG_1",
+                        "dist_info": dist_info("susceptibility_dist", 1.0)
+                        }]
+                    ),
+                mobility_groups=MobilityGroups(
+                    dist_title="mobility_profile",
+                    group_info=[{
+                        "name": "MG_1",
+                        "angle_variance": 0.1,
+                        "dist_info": dist_info("mobility_profile", 1.0)
+                        }]
+                    ),
+                disease_groups=disease_groups,
+                natural_history=natural_history,
+                initial_population_setup_list=[{
+                    "core_var": "disease_state",
+                    "nested_vars": [],
+                    "settings": {"susceptible": 0.8, "infected": 0.2}
+                    }],
+                execmode=execmode,
+                debug=True,
+                **kwargs
+                )
+
+        return build
+
+    # ========================================================================
+    # Tests
+    # ========================================================================
+
+    def test_plan_step_skips_inert_stages(self, fixture_population, caplog):
+        """
+        Verifies that a population without avoidance, mobility restrictions,
+        diagnosis nor immunization skips the corresponding stages, logs them
+        and still evolves.
+        """
+        with caplog.at_level(logging.INFO):
+            population = fixture_population(0.0, 0.0)
+
+        expected_stages = [
+            "update_alertness_state", "avoid_agents",
+            "apply_mobility_restrictions", "to_diagnose_agents",
+            "to_isolate_agents", "update_immunization_level"
+            ]
+        assert list(population.skipped_stages.keys()) == expected_stages
+        for stage in expected_stages:
+            assert f"`{stage}`" in caplog.text
+
+        # Long enough for infected agents to recover (time_dist is 3 days)
+        population.evolve(10)
+        df = population.get_population_df()
+        assert not df["is_alert"].any()
+        assert not df["is_diagnosed"].any()
+        assert not df["isolated_by_mr"].any()
+
+    def test_plan_step_keeps_active_stages(self, fixture_population):
+        """
+        Verifies that the stages of alertness, avoidance, diagnosis and
+        isolation are not skipped when there are avoidance radius and
+        diagnosis probabilities.
+        """
+        population = fixture_population(0.5, 1.0)
+
+        assert list(population.skipped_stages.keys()) == [
+            "apply_mobility_restrictions", "update_immunization_level"
+            ]
+
+        # Long enough for infected agents to recover (time_dist is 3 days)
+        population.evolve(10)
+        df = population.get_population_df()
+        assert df.shape[0] <= 50
+        assert (df.loc[
+            df["disease_state"] == "infected", "disease_state_max_time"
+            ] == 3.0).all()
+        assert df.loc[
+            df["disease_state"] == "recovered", "disease_state_max_time"
+            ].isna().all()
+
+    def test_evolve_vectorized(self, fixture_population):
+        """
+        Verifies that a population built in vectorized mode evolves several
+        steps through the transition scheduler and keeps the disease state
+        clocks consistent.
+        """
+        population = fixture_population(
+            0.5, 1.0, ExecutionModes.vectorized.value
+            )
+        df = population.get_population_df()
+        initially_infected = df.index[df["disease_state"] == "infected"]
+
+        population.evolve(10)
+        df = population.get_population_df()
+
+        assert set(df["disease_state"]) <= {
+            "susceptible", "infected", "recovered", "dead"
+            }
+        assert df["is_dead"].eq(df["disease_state"] == "dead").all()
+        infected = df[df["disease_state"] == "infected"]
+        assert (infected["disease_state_max_time"] == 3.0).all()
+        assert (infected["disease_state_time"] >= 0.0).all()
+        assert (infected["disease_state_time"] < 3.0).all()
+        assert df.loc[
+            df["disease_state"] == "recovered", "disease_state_max_time"
+            ].isna().all()
+        assert (df["times_infected"] >= 1).eq(
+            df["disease_state"] != "susceptible"
+            ).all()
+
+        # Agents infected at the beginning left that state after 3 days
+        still_alive = initially_infected.intersection(df.index)
+        assert df.loc[still_alive, "disease_state"].isin(
+            ["recovered", "dead"]
+            ).all()
+
+    def test_evolve_vectorized_mobility_restrictions(self, fixture_population):
+        """
+        Verifies that a population built in vectorized mode with a tracing
+        policy isolates and stops the agents of the target groups.
+        """
+        mr_groups = SimpleGroups(names=["MR_1"])
+        policy = MRTracingPolicies(
+            variable=InterestVariables.diagnosed,
+            mr_start_level=0,
+            mr_stop_mode=MRTStopModes.length,
+            mr_groups=mr_groups,
+            target_groups=["MR_1"],
+            mr_length=30,
+            mr_length_units=MRTimeUnits.days
+            )
+        population = fixture_population(
+            0.5, 1.0, ExecutionModes.vectorized.value,
+            mrt_policies={InterestVariables.diagnosed: policy}
+            )
+
+        assert "apply_mobility_restrictions" not in population.skipped_stages
+
+        population.evolve(1)
+        positions = population.get_population_df()[["x", "y"]].copy()
+
+        population.evolve(4)
+        df = population.get_population_df()
+
+        assert df["isolated_by_mr"].all()
+        assert df["adheres_to_mr_isolation"].all()
+        assert (df["vx"] == 0.0).all() and (df["vy"] == 0.0).all()
+        assert df[["x", "y"]].equals(positions.loc[df.index])
+
+    def test_init_disease_state_max_time_vectorized(self, fixture_population):
+        """
+        Verifies that a population built in vectorized mode draws the max
+        time of the initial disease states as the iterative mode does, and
+        that infected agents leave their state once it expires.
+        """
+        columns = [
+            "disease_state", "disease_state_time", "disease_state_max_time",
+            "do_calculate_max_time"
+            ]
+        populations = [
+            fixture_population(0.0, 0.0, execmode)
+            for execmode in [
+                ExecutionModes.iterative.value,
+                ExecutionModes.vectorized.value
+                ]
+            ]
+        dfs = [
+            population.get_population_df()[columns]
+            for population in populations
+            ]
+
+        for df in dfs:
+            infected = df["disease_state"] == "infected"
+            assert infected.any()
+            assert (df.loc[infected, "disease_state_time"] == 0.0).all()
+            assert (df.loc[infected, "disease_state_max_time"] == 3.0).all()
+            # Susceptible agents have no time_dist
+            assert df.loc[~infected, "disease_state_time"].isna().all()
+            assert df.loc[~infected, "disease_state_max_time"].isna().all()
+            assert not df["do_calculate_max_time"].any()
+
+        assert dfs[0].dtypes.equals(dfs[1].dtypes)
+
+        # The max time is 3 days and each step is 1 day
+        population = populations[1]
+        initially_infected = dfs[1].index[infected]
+
+        population.evolve(2)
+        df = population.get_population_df().loc[initially_infected]
+        assert (df["disease_state"] == "infected").all()
+        assert (df["disease_state_time"] == 2.0).all()
+
+        # Dead agents are removed at the beginning of the next step
+        population.evolve(1)
+        df = population.get_population_df()
+        assert df.loc[initially_infected, "disease_state"].isin(
+            ["recovered", "dead"]
+            ).all()
+
+    def test_evolve_numba(self, fixture_population):
+        """
+        Verifies that a population built in numba mode, whose stages
+        without a compiled kernel fall back to the vectorized ones, evolves
+        several steps.
+        """
+        population = fixture_population(0.5, 1.0, ExecutionModes.numba.value)
+        df = population.get_population_df()
+        assert (df["times_infected"] == 1).eq(
+            df["disease_state"] == "infected"
+            ).all()
+
+        population.evolve(5)
+        df = population.get_population_df()
+
+        assert set(df["disease_state"]) <= {
+            "susceptible", "infected", "recovered", "dead"
+            }
+        assert df["is_dead"].eq(df["disease_state"] == "dead").all()
+        infected = df[df["disease_state"] == "infected"]
+        assert (infected["disease_state_max_time"] == 3.0).all()
+        assert (infected["disease_state_time"] < 3.0).all()
+
+    def test_evolve_numba_follows_seed(self, fixture_population):
+        """
+        Verifies that numpy.random.seed also reproduces a population
+        evolved in numba mode, whose compiled kernels have their own
+        generator.
+        """
+        dfs = []
+        for _ in range(2):
+            seed(11)
+            population = fixture_population(
+                0.5, 1.0, ExecutionModes.numba.value
+                )
+            population.evolve(3)
+            dfs.append(population.get_population_df())
+
+        assert dfs[0].equals(dfs[1])
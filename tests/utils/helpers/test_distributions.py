@@ -82,6 +82,42 @@ class TestDistribution:
 
         assert constant_dist.dist_type == "constant"
         assert constant_dist.constant == 2.9
+        assert not constant_dist.trait
+
+    def test_trait_distribution(self, fixture_constant_distribution):
+        """
+            verifies whether the `trait` key marks the distribution as a per
+            agent trait.
+        """
+        dist_dict = dict(fixture_constant_distribution, trait=True)
+
+        constant_dist = init_distribution(dist_dict)
+
+        assert constant_dist.trait
+
+    def test_pooled_distribution(self, fixture_numpy_distribution):
+        """
+            verifies whether the `pool_size` key enables the pool of
+            pre-drawn samples.
+        """
+        dist_dict = dict(fixture_numpy_distribution, pool_size=100)
+
+        numpy_dist = init_distribution(dist_dict)
+
+        assert numpy_dist.pool_size == 100
+
+    def test_pooled_constant_distribution(
+        self,
+        fixture_constant_distribution
+    ):
+        """
+            verifies whether the `pool_size` key is rejected for a constant
+            type distribution.
+        """
+        dist_dict = dict(fixture_constant_distribution, pool_size=100)
+
+        with pytest.raises(SystemError, match="pool_size"):
+            init_distribution(dist_dict)
 
     def test_empirical_distribution(self, fixture_empirical_distribution):
         """
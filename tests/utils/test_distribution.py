@@ -24,10 +24,11 @@
 
 import pytest
 from numpy import random, ones, abs, array, histogram, genfromtxt, full
+from numpy import interp
 from time import time
 from sklearn.neighbors import KernelDensity
 
-from abmodel.utils.distributions import Distribution
+from abmodel.utils.distributions import Distribution, AliasTable
 
 
 class TestDistribution:
@@ -375,12 +376,11 @@ class TestDistribution:
 
         sample = empirical_dist.sample(5)
 
-        expected_sample = KernelDensity(
-            kernel="gaussian",
-            bandwidth=0.1
-            ).fit(pytest.data_1D.reshape(-1, 1)).sample(
-                n_samples=5, random_state=int(time())
-                ).flatten()
+        expected_sample = interp(
+            random.default_rng(empirical_dist.seed).random(5),
+            empirical_dist.cdf_table,
+            empirical_dist.x_table
+            )
 
         assert all(sample == expected_sample)
 
@@ -398,12 +398,11 @@ class TestDistribution:
 
         sample = empirical_dist.sample(5)
 
-        expected_sample = KernelDensity(
-            kernel="gaussian",
-            bandwidth=0.1
-            ).fit(pytest.data_1D.reshape(-1, 1)).sample(
-                n_samples=5, random_state=int(time())
-                ).flatten()
+        expected_sample = interp(
+            random.default_rng(empirical_dist.seed).random(5),
+            empirical_dist.cdf_table,
+            empirical_dist.x_table
+            )
 
         assert all(sample == expected_sample)
 
@@ -418,11 +417,11 @@ class TestDistribution:
             )
 
         sample = weights_dist.sample(5)
-        expected_sample = random.default_rng(int(time())).choice(
-            a=pytest.data_2D[:, 0],
-            p=pytest.data_2D[:, 1],
-            size=5
-            )
+        expected_sample = AliasTable(
+            pytest.data_2D[:, 0],
+            pytest.data_2D[:, 1],
+            random.default_rng(weights_dist.seed)
+            ).sample(5)
 
         assert all(sample == expected_sample)
 
@@ -439,6 +438,110 @@ class TestDistribution:
 
         assert all(sample == expected)
 
+    def test_sample_pooled_numpy_distribution(self):
+        """Returns the same numpy samples with and without the pool."""
+        numpy_dist = Distribution(
+            dist_type="numpy",
+            dist_name="beta",
+            pool_size=4,
+            a=1, b=1
+            )
+
+        sample = [numpy_dist.sample() for i in range(3)]
+        sample.extend(numpy_dist.sample(6))
+        sample.append(numpy_dist.sample())
+        expected = random.default_rng(seed=numpy_dist.seed).beta(1, 1, 10)
+
+        assert all(array(sample) == expected)
+
+    def test_sample_pooled_weights_distribution(
+        self,
+        fixture_weights_distribution
+    ):
+        """Returns the same weights samples with and without the pool."""
+        weights_dist = Distribution(
+            dist_type="weights",
+            data=pytest.data_2D,
+            pool_size=3
+            )
+
+        sample = [weights_dist.sample() for i in range(7)]
+        expected = AliasTable(
+            pytest.data_2D[:, 0],
+            pytest.data_2D[:, 1],
+            random.default_rng(weights_dist.seed)
+            ).sample(7)
+
+        assert all(array(sample) == expected)
+
+    def test_sample_pooled_empirical_distribution(
+        self,
+        fixture_empirical_distribution
+    ):
+        """Returns the same empirical samples with and without the pool."""
+        empirical_dist = Distribution(
+            dist_type="empirical",
+            data=pytest.data_1D,
+            pool_size=4,
+            kernel="gaussian",
+            bandwidth=0.1
+            )
+
+        sample = empirical_dist.sample(6)
+        expected = interp(
+            random.default_rng(empirical_dist.seed).random(6),
+            empirical_dist.cdf_table,
+            empirical_dist.x_table
+            )
+
+        assert all(sample == expected)
+        assert empirical_dist.pool_cursor == 6
+
+    def test_empirical_distribution_icdf_table(
+        self,
+        fixture_empirical_distribution
+    ):
+        """
+        Samples an empirical distribution with the moments of the fitted
+        KDE and fresh values on each call.
+        """
+        data = random.default_rng(0).normal(2.0, 0.5, 500)
+        empirical_dist = Distribution(
+            dist_type="empirical",
+            data=data,
+            kernel="gaussian",
+            bandwidth=0.1
+            )
+
+        sample = empirical_dist.sample(100000)
+
+        assert empirical_dist.cdf_table[0] == 0.0
+        assert empirical_dist.cdf_table[-1] == 1.0
+        assert abs(sample.mean() - data.mean()) < 0.01
+        assert abs(sample.std() - (data.var() + 0.1**2)**0.5) < 0.01
+        assert empirical_dist.sample() != empirical_dist.sample()
+
+    def test_pool_size_ValueError(self):
+        """Raises an error when `pool_size` is not positive."""
+        with pytest.raises(SystemError):
+            Distribution(
+                dist_type="numpy",
+                dist_name="beta",
+                pool_size=0,
+                a=1, b=1
+                )
+
+    def test_pool_size_not_poolable_ValueError(self):
+        """
+            Raises an error when `pool_size` is given for a 'constant' or
+            None distribution.
+        """
+        with pytest.raises(SystemError, match="pool_size"):
+            Distribution(dist_type="constant", constant=1, pool_size=4)
+
+        with pytest.raises(SystemError, match="pool_size"):
+            Distribution(dist_type=None, pool_size=4)
+
     def test_sample_positive_constant_distribution(self):
         """Returns a constant positive sample distribution."""
         constant_dist = Distribution(dist_type="constant", constant=1)
@@ -462,13 +565,12 @@ class TestDistribution:
         sample = empirical_dist.sample_positive(5)
 
         expected_sample = abs(
-            KernelDensity(
-                kernel="gaussian",
-                bandwidth=0.1
-                ).fit(pytest.data_1D.reshape(-1, 1)).sample(
-                    n_samples=5, random_state=int(time())
-                    ).flatten()
+            interp(
+                random.default_rng(empirical_dist.seed).random(5),
+                empirical_dist.cdf_table,
+                empirical_dist.x_table
                 )
+            )
 
         assert all(sample == expected_sample)
 
@@ -487,12 +589,11 @@ class TestDistribution:
         sample = empirical_dist.sample_positive(5)
 
         expected_sample = abs(
-            KernelDensity(
-                kernel="gaussian",
-                bandwidth=0.1
-                ).fit(pytest.data_file.reshape(-1, 1)).sample(
-                n_samples=5, random_state=int(time())
-                ).flatten()
+            interp(
+                random.default_rng(empirical_dist.seed).random(5),
+                empirical_dist.cdf_table,
+                empirical_dist.x_table
+                )
             )
 
         assert all(sample == expected_sample)
@@ -509,9 +610,11 @@ class TestDistribution:
 
         sample = weights_dist.sample_positive(5)
         expected_sample = abs(
-            random.default_rng(int(time())).choice(
-                a=pytest.data_2D[:, 0], p=pytest.data_2D[:, 1], size=5
-                )
+            AliasTable(
+                pytest.data_2D[:, 0],
+                pytest.data_2D[:, 1],
+                random.default_rng(weights_dist.seed)
+                ).sample(5)
             )
 
         assert all(sample == expected_sample)
@@ -528,11 +631,11 @@ class TestDistribution:
 
         sample = weights_dist.sample_positive(5)
         expected_sample = abs(
-            random.default_rng(int(time())).choice(
-                a=pytest.data_file[:, 0],
-                p=pytest.data_file[:, 1],
-                size=5
-                )
+            AliasTable(
+                pytest.data_file[:, 0],
+                pytest.data_file[:, 1],
+                random.default_rng(weights_dist.seed)
+                ).sample(5)
             )
 
         assert all(sample == expected_sample)
@@ -553,3 +656,52 @@ class TestDistribution:
             )
 
         assert sample == expected
+
+
+class TestAliasTable:
+    """Checks the functionality of the AliasTable sampler."""
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    def test_sample_frequencies(self):
+        """Samples each value with its probability."""
+        probabilities = array([0.1, 0.2, 0.3, 0.4])
+        alias_table = AliasTable(
+            array(["a", "b", "c", "d"]),
+            probabilities,
+            random.default_rng(0)
+            )
+
+        sample = alias_table.sample(200000)
+        frequencies = array(
+            [(sample == value).mean() for value in ["a", "b", "c", "d"]]
+            )
+
+        assert all(abs(frequencies - probabilities) < 0.01)
+
+    def test_sample_scalar(self):
+        """Returns the same stream for scalar and batch samples."""
+        values = array([1.0, 2.0, 3.0])
+        probabilities = array([0.5, 0.25, 0.25])
+
+        scalar_table = AliasTable(values, probabilities, random.default_rng(3))
+        batch_table = AliasTable(values, probabilities, random.default_rng(3))
+
+        sample = [scalar_table.sample() for i in range(10)]
+
+        assert all(array(sample) == batch_table.sample(10))
+
+    def test_sample_null_probability(self):
+        """Never samples values with null probability."""
+        alias_table = AliasTable(
+            array([1, 2, 3]),
+            array([0.0, 1.0, 0.0])
+            )
+
+        assert all(alias_table.sample(1000) == 2)
+
+    def test_wrong_probabilities(self):
+        """Raises a ValueError when probabilities do not sum to 1."""
+        with pytest.raises(ValueError):
+            AliasTable(array([1, 2]), array([0.5, 0.6]))
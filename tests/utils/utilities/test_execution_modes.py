@@ -35,8 +35,11 @@ class TestExecutionModes:
         (getattr(getattr(ExecutionModes, "iterative"), 'value'), "iterative"),
         (getattr(getattr(ExecutionModes, "vectorized"), 'value'), "vectorized"),
         (getattr(getattr(ExecutionModes, "dask"), 'value'), "dask"),
+        (getattr(getattr(ExecutionModes, "numba"), 'value'), "numba"),
+        (getattr(getattr(ExecutionModes, "multiprocessing"), 'value'),
+         "multiprocessing"),
         ],
-        ids=["iterative", "vectorized", "dask"]
+        ids=["iterative", "vectorized", "dask", "numba", "multiprocessing"]
     )
     def test_execution_modes(self, ExecutionModes, expected):
         """Verifies the correct enumerates of the different execution modes."""
@@ -0,0 +1,148 @@
+# Copyright (C) 2021, Camilo Hincapié Gutiérrez
+# This file is part of CDSLIB.
+#
+# CDSLIB is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# CDSLIB is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+#
+# This package is authored by:
+# Camilo Hincapié (https://www.linkedin.com/in/camilo-hincapie-gutierrez/) (main author)
+# Ian Mejía (https://github.com/IanMejia)
+# Emil Rueda (https://www.linkedin.com/in/emil-rueda-424012207/)
+# Nicole Rivera (https://github.com/nicolerivera1)
+# Carolina Rojas Duque (https://github.com/carolinarojasd)
+
+from functools import partial
+from time import sleep
+
+from numpy import random
+from pandas import DataFrame
+
+from abmodel.utils.process_pool import ProcessPool
+from abmodel.utils.utilities import std_str_join_cols
+
+
+def scaled_sum(x: float, y: float, factor: float) -> float:
+    """Row kernel used to check ProcessPool.apply."""
+    return (x + y) * factor
+
+
+def sum_and_sign(x: float, y: float) -> tuple[float, bool]:
+    """Row kernel returning a tuple used to check ProcessPool.apply."""
+    return x + y, x > y
+
+
+def throw_dice(x: float) -> float:
+    """
+        Random row kernel used to check the seeds of the chunks. It sleeps
+        so that the pool forks a new worker for each chunk.
+    """
+    sleep(0.05)
+    return random.random_sample()
+
+
+class TestProcessPool:
+    """
+        Checks the functionality of the ProcessPool class from
+        process_pool module.
+    """
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    def teardown_class(cls):
+        """Stops the worker processes."""
+        ProcessPool.shutdown()
+
+    def test_apply_keeps_order_and_index(self):
+        """
+            ProcessPool.apply gives the same result as a row by row apply,
+            with the index of the input dataframe.
+        """
+        df = DataFrame(
+            {"x": range(10), "y": range(10, 20), "z": ["a"]*10},
+            index=range(100, 110)
+            )
+
+        result = ProcessPool.apply(
+            df,
+            partial(scaled_sum, factor=2.0),
+            ["x", "y"],
+            npartitions=3
+            )
+
+        assert result.index.tolist() == list(range(100, 110))
+        assert result.tolist() == [(x + x + 10) * 2.0 for x in range(10)]
+
+    def test_apply_reuses_executor(self):
+        """
+            The pool is started once and reused by later calls.
+        """
+        df = DataFrame({"a": ["x", "y"], "b": ["z", "w"]})
+
+        ProcessPool.apply(df, std_str_join_cols, ["a", "b"], npartitions=2)
+        executor = ProcessPool.get_executor()
+        result = ProcessPool.apply(
+            df, std_str_join_cols, ["a", "b"], npartitions=2
+            )
+
+        assert ProcessPool.get_executor() is executor
+        assert result.tolist() == ["x-z", "y-w"]
+
+    def test_apply_with_dtypes(self):
+        """
+            With `dtypes`, ProcessPool.apply gives one typed column per
+            value returned by the kernel.
+        """
+        df = DataFrame({"x": [3.0, 1.0, 5.0], "y": [2.0, 4.0, 0.0]})
+
+        result = ProcessPool.apply(
+            df,
+            sum_and_sign,
+            ["x", "y"],
+            npartitions=2,
+            dtypes={0: "float64", 1: "bool"}
+            )
+
+        assert result[0].tolist() == [5.0, 5.0, 5.0]
+        assert result[1].dtype == bool
+        assert result[1].tolist() == [True, False, True]
+
+    def test_apply_chunks_do_not_repeat_dice(self):
+        """
+            Each chunk throws its own dice, even though the workers are
+            forked with the random state of the parent process.
+        """
+        ProcessPool.get_executor(max_workers=4)
+        df = DataFrame({"x": range(8)})
+
+        random.seed(0)
+        result = ProcessPool.apply(df, throw_dice, ["x"], npartitions=4)
+
+        assert result.nunique() == 8
+
+    def test_apply_dice_follow_parent_seed(self):
+        """
+            Seeding the global numpy random generator of the parent process
+            reproduces the dice thrown by the workers.
+        """
+        ProcessPool.get_executor(max_workers=4)
+        df = DataFrame({"x": range(8)})
+
+        random.seed(1)
+        first = ProcessPool.apply(df, throw_dice, ["x"], npartitions=4)
+        random.seed(1)
+        second = ProcessPool.apply(df, throw_dice, ["x"], npartitions=4)
+        random.seed(2)
+        third = ProcessPool.apply(df, throw_dice, ["x"], npartitions=4)
+
+        assert first.tolist() == second.tolist()
+        assert first.tolist() != third.tolist()
@@ -21,11 +21,12 @@
 # Carolina Rojas Duque (https://github.com/carolinarojasd)import pytest
 
 import pytest
-from numpy import nan, all
-from pandas import DataFrame, Series
+from numpy import nan, all, array
+from pandas import DataFrame, Series, Categorical
 
 from abmodel.utils.utilities import check_field_errors
 from abmodel.utils.utilities import check_field_existance, std_str_join_cols
+from abmodel.utils.utilities import apply_rows, group_codes
 
 
 class TestCaseFieldExistenceAndErrors:
@@ -176,3 +177,87 @@ class TestCaseFieldExistenceAndErrors:
             match=fixture_std_str_join_cols[2]
         ):
             assert std_str_join_cols(S1, "immune")
+
+
+def split_label(label: str, weight: float) -> tuple[str, float, list]:
+    """Row kernel used to check apply_rows."""
+    group, state = label.split("-")
+    return state, 2*weight, [group]*int(weight)
+
+
+class TestCaseApplyRows:
+    """
+        Verifies the functionality of the method apply_rows from utilities.
+    """
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    def test_apply_rows(self):
+        """
+        Verifies whether apply_rows gives one typed column per value
+        returned by the kernel, with the index of the input dataframe.
+        """
+        df = DataFrame(
+            {"weight": [1.0, 2.0], "label": ["a-x", "b-y"]},
+            index=[4, 7]
+            )
+
+        output = apply_rows(
+            df,
+            split_label,
+            ["label", "weight"],
+            {0: "object", 1: "float64", 2: "object"}
+            )
+
+        assert output.index.tolist() == [4, 7]
+        assert output[0].tolist() == ["x", "y"]
+        assert output[1].dtype == "float64"
+        assert output[1].tolist() == [2.0, 4.0]
+        assert output[2].tolist() == [["a"], ["b", "b"]]
+
+    def test_apply_rows_empty(self):
+        """
+        Verifies whether apply_rows keeps the dtypes when the input
+        dataframe is empty.
+        """
+        df = DataFrame({"weight": [], "label": []})
+
+        output = apply_rows(
+            df, split_label, ["label", "weight"],
+            {0: "object", 1: "float64", 2: "object"}
+            )
+
+        assert output.shape == (0, 3)
+        assert output.dtypes.tolist() == ["object", "float64", "object"]
+
+
+class TestCaseGroupCodes:
+    """
+        Verifies the functionality of the method group_codes from utilities.
+    """
+    def setup_method(self, method):
+        """Allows to see a brief description of the test in the report."""
+        print('\u21B4' + '\n' + '\u273C' + method.__doc__.strip())
+
+    def test_group_codes(self):
+        """
+        Verifies whether group_codes finds the distinct labels and the
+        position of each element in them.
+        """
+        labels, inverse = group_codes(array(["b", "a", "b", "c"]))
+
+        assert labels.tolist() == ["a", "b", "c"]
+        assert inverse.tolist() == [1, 0, 1, 2]
+
+    def test_group_codes_categorical(self):
+        """
+        Verifies whether group_codes only returns the categories used by a
+        categorical.
+        """
+        labels, inverse = group_codes(
+            Categorical(["c", "a", "c"], categories=["a", "b", "c"])
+            )
+
+        assert labels.tolist() == ["a", "c"]
+        assert inverse.tolist() == [1, 0, 1]